@@ -2,9 +2,8 @@ import os
 import base64
 import json
 import io
-from io import StringIO
 import dash
-from dash import dcc, html, Input, Output, State, callback, ALL
+from dash import dcc, html, Input, Output, State, callback, ALL, ClientsideFunction
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
 from dash_iconify import DashIconify
@@ -14,6 +13,7 @@ import plotly.graph_objects as go
 from dotenv import load_dotenv
 import numpy as np
 import time
+import uuid
 from dash.exceptions import PreventUpdate
 from datetime import datetime
 
@@ -73,21 +73,149 @@ try:
         create_data_quality_tab,
         create_chatbot_component,
         process_chat_message,
+        stream_chat_message,
+        create_streaming_bot_message,
         create_knowledge_manager_component
     )
-    from utils import analyze_privacy_risks, analyze_data_quality, generate_report
+    from utils import analyze_privacy_risks, analyze_data_quality, generate_report, dataset_registry, build_column_profiles
+    from utils.streaming_analyzer import analyze_csv_stream, read_csv_columns, DatasetSummary
+    from utils.chunked_upload import upload_manager, create_upload_blueprint
+    from utils.chat_stream import create_chat_stream_blueprint
+    from utils.analysis_executor import AnalysisProgress, analysis_executor
+    from utils.data_quality_analyzer import (
+        QUALITY_TABLE_PAGE_SIZE, calculate_quality_dimensions, column_quality_page, create_near_duplicates_summary
+    )
+    from utils.dataset_lineage import lineage_store
+    from utils.row_hashes import RowHashIndex
+    from utils.privacy_analyzer import privacy_metric_figure, render_technical_privacy_view
 except ImportError as e:
     print(f"Error importing components or utils: {e}")
     # Fallback to direct imports
     from components.upload_component import create_upload_component
     from components.privacy_assessment import create_privacy_assessment_tab
     from components.data_quality import create_data_quality_tab
-    from components.chatbot_component import create_chatbot_component, process_chat_message
+    from components.chatbot_component import (
+        create_chatbot_component, create_streaming_bot_message, process_chat_message, stream_chat_message
+    )
     from components.navbar import create_navbar
     from components.knowledge_manager import create_knowledge_manager_component
-    from utils.privacy_analyzer import analyze_privacy_risks
-    from utils.data_quality_analyzer import analyze_data_quality
+    from utils.privacy_analyzer import analyze_privacy_risks, privacy_metric_figure, render_technical_privacy_view
+    from utils.data_quality_analyzer import (
+        QUALITY_TABLE_PAGE_SIZE, analyze_data_quality, calculate_quality_dimensions, column_quality_page,
+        create_near_duplicates_summary
+    )
     from utils.report_generator import generate_report
+    from utils.dataset_store import dataset_registry
+    from utils.column_profile import build_column_profiles
+    from utils.streaming_analyzer import analyze_csv_stream, read_csv_columns, DatasetSummary
+    from utils.chunked_upload import upload_manager, create_upload_blueprint
+    from utils.chat_stream import create_chat_stream_blueprint
+    from utils.analysis_executor import AnalysisProgress, analysis_executor
+    from utils.dataset_lineage import lineage_store
+    from utils.row_hashes import RowHashIndex
+
+# Chunked, resumable uploads stream files straight to UPLOAD_FOLDER (see assets/chunked-upload.js)
+server.register_blueprint(create_upload_blueprint(upload_manager))
+
+# Chat replies are streamed to the browser as server-sent events (see assets/chat-stream.js);
+# with CHAT_STREAMING=false the chat callback waits for the whole reply instead
+CHAT_STREAMING = os.getenv("CHAT_STREAMING", "true").lower() in ("1", "true", "yes")
+server.register_blueprint(create_chat_stream_blueprint(stream_chat_message))
+
+# Outlier engine of the accuracy dimension: "isolation_forest", the faster robust statistics "iqr" / "mad",
+# or "multivariate" (one model over all numeric columns, also flagging outlier rows)
+ACCURACY_ENGINE = os.getenv("ACCURACY_ENGINE", "isolation_forest")
+
+# CSV uploads above this size are analyzed chunk by chunk instead of being parsed into memory
+STREAMING_THRESHOLD_BYTES = int(float(os.getenv("STREAMING_THRESHOLD_MB", "100")) * 1024 * 1024)
+
+# Incremental mode: every CSV upload is analyzed in chunks, and a file that extends an earlier upload
+# (daily appended batches) only has its new rows folded into the persisted state of that lineage
+INCREMENTAL_ANALYSIS = os.getenv("INCREMENTAL_ANALYSIS", "false").lower() in ("1", "true", "yes")
+
+# The privacy and quality analyses run as background callbacks in job processes managed through a
+# disk cache, so they report progress, can be cancelled and do not hold a web worker for their duration
+BACKGROUND_CALLBACKS = os.getenv("BACKGROUND_CALLBACKS", "true").lower() in ("1", "true", "yes")
+background_callback_manager = None
+if BACKGROUND_CALLBACKS:
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+        background_callback_manager = DiskcacheManager(
+            diskcache.Cache(os.path.join(os.getenv("UPLOAD_FOLDER", "./uploads"), "background-jobs"))
+        )
+    except ImportError as e:
+        print(f"Background callbacks disabled, analyses run inside the request: {e}")
+
+def analysis_callback(*dependencies, progress, cancel, running):
+    """
+    Register a long analysis callback. The decorated function receives set_progress first.
+    
+    With a background callback manager it runs in a job process that reports progress and is
+    cancelled by the cancel inputs; otherwise it runs inside the request and progress is dropped.
+    """
+    if background_callback_manager is None:
+        def register(func):
+            def run_in_request(*args):
+                return func(lambda value: None, *args)
+            run_in_request.__name__ = func.__name__
+            return app.callback(*dependencies, prevent_initial_call=True)(run_in_request)
+        return register
+    return app.callback(
+        *dependencies,
+        background=True,
+        manager=background_callback_manager,
+        progress=progress,
+        progress_default=[0, False, ""],
+        cancel=cancel,
+        running=running,
+        prevent_initial_call=True,
+    )
+
+def analysis_progress(set_progress):
+    """Return an AnalysisProgress that drives a progress bar through a background callback's set_progress."""
+    def report(fraction, message):
+        # Without a known number of steps (e.g. streaming a file) the bar is shown full and animated
+        if fraction is None:
+            set_progress([100, True, message])
+        else:
+            set_progress([round(fraction * 100), False, message])
+    return AnalysisProgress(report)
+
+def load_dataset_profiles(dataset_handle, df):
+    """Return the column profiles of a registered dataset, shared by the privacy and quality analyses.
+    
+    The profiles are persisted next to the dataset, so background jobs (each in a fresh process) load
+    them instead of profiling every column again.
+    """
+    return dataset_registry.get_artifact(dataset_handle, "column_profiles", lambda: build_column_profiles(df), persist=True)
+
+def load_dataset_row_hashes(dataset_handle, df, profiles):
+    """Return the row hashes of a registered dataset, from which duplicate and near-duplicate rows are counted."""
+    return dataset_registry.get_artifact(dataset_handle, "row_hashes", lambda: RowHashIndex(df, profiles))
+
+def load_shared_path(dataset_handle):
+    """Return the Arrow copy of a dataset that worker processes read columns from, or None with a thread pool."""
+    if analysis_executor.kind != "process":
+        return None
+    return dataset_registry.shared_path(dataset_handle)
+
+def load_stream_analysis(dataset_handle, progress=None):
+    """Return the streaming analysis of a dataset registered as a source, shared by the privacy and quality analyses."""
+    source_path = dataset_registry.source_path(dataset_handle)
+    if INCREMENTAL_ANALYSIS:
+        return dataset_registry.get_artifact(dataset_handle, "stream_analysis",
+                                             lambda: lineage_store.analyze(source_path, dataset_handle, progress=progress),
+                                             persist=True)
+    return dataset_registry.get_artifact(dataset_handle, "stream_analysis",
+                                         lambda: analyze_csv_stream(source_path, progress=progress), persist=True)
+
+def load_report_dataset(dataset_handle):
+    """Return the dataset for a report: the frame, or the shape of a streamed dataset."""
+    if dataset_registry.source_path(dataset_handle):
+        analysis = load_stream_analysis(dataset_handle)
+        return DatasetSummary(analysis.column_names, analysis.row_count)
+    return dataset_registry.load(dataset_handle)
 
 # Create the app layout
 app.layout = html.Div(
@@ -96,8 +224,11 @@ app.layout = html.Div(
         dcc.Store(id="privacy-scores-store", storage_type="memory"),
         dcc.Store(id="data-quality-scores-store", storage_type="memory"),
         dcc.Store(id="chat-history-store", data=[], storage_type="memory"),
+        dcc.Store(id="chat-stream-request", storage_type="memory"),
+        dcc.Store(id="chat-stream-result", storage_type="memory"),
         dcc.Store(id="column-names-store", storage_type="memory"),
         dcc.Store(id="constraints-store", data=None, storage_type="memory"),
+        dcc.Store(id="chunked-upload-store", storage_type="memory"),
         
         create_navbar(),
         
@@ -504,28 +635,57 @@ app.layout = html.Div(
     Output("column-names-store", "data"),
     Output("analysis-content", "style"),  # Add output for the analysis content visibility
     Input("upload-data", "contents"),
+    Input("chunked-upload-store", "data"),
     State("upload-data", "filename"),
     State("upload-data", "last_modified"),
     prevent_initial_call=True
 )
-def update_output(contents, filename, last_modified):
+def update_output(contents, chunked_upload, filename, last_modified):
     print("=== UPLOAD CALLBACK TRIGGERED ===")
     print(f"Contents type: {type(contents)}")
     print(f"Filename: {filename}")
-    if contents is None:
-        raise PreventUpdate
     
     try:
-        content_type, content_string = contents.split(",")
-        decoded = base64.b64decode(content_string)
+        if dash.callback_context.triggered_id == "chunked-upload-store":
+            # The file was streamed to disk by the chunked upload route and hashed on arrival
+            if not chunked_upload:
+                raise PreventUpdate
+            filename = chunked_upload["filename"]
+            upload_handle = chunked_upload["handle"]
+            upload_path = upload_manager.completed_path(upload_handle, filename)
+            if upload_path is None:
+                return None, dbc.Alert("The uploaded file could not be found, please upload it again.", color="danger"), None, [], {"display": "none"}
+            decoded = None
+            file_size = os.path.getsize(upload_path)
+        else:
+            if contents is None:
+                raise PreventUpdate
+            content_type, content_string = contents.split(",")
+            decoded = base64.b64decode(content_string)
+            upload_handle = upload_path = None
+            file_size = len(decoded)
         
-        if filename.endswith(".csv"):
-            df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+        if filename.endswith(".csv") and INCREMENTAL_ANALYSIS:
+            # Keep the raw file: the analysis continues the lineage of an earlier upload it extends
+            df = None
+            columns = read_csv_columns(upload_path or decoded)
+            size_label = f"• {file_size / (1024 * 1024):.1f} MB, analyzed incrementally"
+        elif filename.endswith(".csv") and file_size > STREAMING_THRESHOLD_BYTES:
+            # Too large to parse in memory: keep the raw file and analyze it chunk by chunk
+            df = None
+            columns = read_csv_columns(upload_path or decoded)
+            size_label = f"• {file_size / (1024 * 1024):.0f} MB, analyzed in chunks"
+        elif filename.endswith(".csv"):
+            df = pd.read_csv(upload_path or io.StringIO(decoded.decode("utf-8")))
         elif filename.endswith((".xls", ".xlsx")):
-            df = pd.read_excel(io.BytesIO(decoded))
+            df = pd.read_excel(upload_path or io.BytesIO(decoded))
         else:
             return None, dbc.Alert("Only CSV and Excel files are supported.", color="danger"), None, [], {"display": "none"}
         
+        if df is not None:
+            columns = df.columns.tolist()
+            size_label = f"• {df.shape[0]} rows"
+        
         # Enhanced data info with custom green theme that complements purple
         file_info = html.Div([
             html.Div(
@@ -554,8 +714,8 @@ def update_output(contents, filename, last_modified):
                     html.Div(
                         [
                             html.Span(f"{filename}", className="me-2 small", style={"fontWeight": "500", "color": "#065f46"}),
-                            html.Span(f"• {df.shape[0]} rows", className="me-2 small", style={"color": "#047857"}),
-                            html.Span(f"• {df.shape[1]} columns", className="small", style={"color": "#047857"}),
+                            html.Span(size_label, className="me-2 small", style={"color": "#047857"}),
+                            html.Span(f"• {len(columns)} columns", className="small", style={"color": "#047857"}),
                         ],
                         className="d-flex align-items-center mt-1"
                     ),
@@ -589,13 +749,25 @@ def update_output(contents, filename, last_modified):
             )
         ])
         
-        # Return the dataframe as JSON, update UI, and show analysis panels
-        return df.to_json(date_format='iso', orient='split'), \
+        # Keep the parsed frame (or the raw file) server-side and only hand its handle to the browser
+        if df is None and upload_path:
+            dataset_handle = dataset_registry.register_source_file(upload_path, upload_handle)
+        elif df is None:
+            dataset_handle = dataset_registry.register_source(decoded)
+        else:
+            dataset_handle = dataset_registry.register(df, decoded, handle=upload_handle)
+            if upload_path:
+                os.remove(upload_path)
+        
+        # Return the dataset handle, update UI, and show analysis panels
+        return dataset_handle, \
                None, \
                file_info, \
-               df.columns.tolist(), \
+               columns, \
                {"display": "block"}  # Make analysis panels visible
     
+    except PreventUpdate:
+        raise
     except Exception as e:
         print(f"Error processing file: {e}")
         return None, dbc.Alert(f"Error processing file: {str(e)}", color="danger"), None, [], {"display": "none"}
@@ -618,9 +790,9 @@ def update_quality_column_names(column_names):
     Output("guidance-container", "style"),
     Input("dataset-store", "data"),
 )
-def toggle_guidance_message(dataset_json):
+def toggle_guidance_message(dataset_handle):
     """Hide guidance message when dataset is loaded."""
-    if dataset_json is None:
+    if dataset_handle is None:
         # Show guidance when no dataset
         return {"display": "block"}
     else:
@@ -680,9 +852,9 @@ def update_journey_progress(dataset, privacy_scores, quality_scores, chat_messag
     Input("dataset-store", "data"),
     prevent_initial_call=True
 )
-def auto_trigger_analyses(dataset_json):
+def auto_trigger_analyses(dataset_handle):
     """Automatically trigger both analyses when a dataset is uploaded."""
-    if dataset_json is None:
+    if dataset_handle is None:
         raise PreventUpdate
     # Return non-zero values to simulate button clicks
     return 1, 1
@@ -704,63 +876,100 @@ def manage_report_buttons(privacy_data, quality_data):
     return not both_analyses_complete, not both_analyses_complete
 
 # Run privacy analysis when a dataset is loaded
-@app.callback(
+@analysis_callback(
     Output("privacy-scores-store", "data"),
-    Output("privacy-results-container", "children"),
+    Output("simple-privacy-container", "children"),
     Input("dataset-store", "data"),
     Input("run-privacy-analysis-btn", "n_clicks"),
-    prevent_initial_call=True,
+    progress=[Output("privacy-progress-bar", "value"),
+              Output("privacy-progress-bar", "animated"),
+              Output("privacy-progress-message", "children")],
+    cancel=[Input("cancel-privacy-analysis-btn", "n_clicks")],
+    running=[(Output("privacy-progress-container", "style"), {"display": "block"}, {"display": "none"})],
 )
-def run_privacy_analysis(json_data, n_clicks):
+def run_privacy_analysis(set_progress, dataset_handle, n_clicks):
     print("=== PRIVACY ANALYSIS CALLBACK TRIGGERED ===")
     ctx = dash.callback_context
     if not ctx.triggered:
         raise PreventUpdate
-    if json_data is None:
+    if dataset_handle is None:
         raise PreventUpdate
     
-    # Parse the JSON data back to a dataframe
-    from io import StringIO
-    df = pd.read_json(StringIO(json_data), orient='split')
-    
-    # Run the privacy analysis
-    privacy_results, visualizations = analyze_privacy_risks(df)
+    progress = analysis_progress(set_progress)
+    if dataset_registry.source_path(dataset_handle):
+        # Large file: results come from the chunked pass shared with the quality analysis
+        privacy_results, visualizations = load_stream_analysis(dataset_handle, progress).analyze_privacy_risks()
+    else:
+        # Load the parsed dataframe from the server-side registry
+        df = dataset_registry.load(dataset_handle)
+        profiles = load_dataset_profiles(dataset_handle, df)
+        
+        # Run the privacy analysis
+        privacy_results, visualizations = analyze_privacy_risks(df, profiles=profiles,
+                                                                shared_path=load_shared_path(dataset_handle),
+                                                                progress=progress)
     
     # Return the results
     return json.dumps(privacy_results), visualizations
 
 # Run data quality analysis when a dataset is loaded
-@app.callback(
+@analysis_callback(
     Output("data-quality-scores-store", "data"),
     Output("quality-results-container", "children"),
     Input("dataset-store", "data"),
     Input("run-quality-analysis-btn", "n_clicks"),
     State("constraints-store", "data"),
-    prevent_initial_call=True,
+    State("reference-dataset-store", "data"),
+    progress=[Output("quality-progress-bar", "value"),
+              Output("quality-progress-bar", "animated"),
+              Output("quality-progress-message", "children")],
+    cancel=[Input("cancel-quality-analysis-btn", "n_clicks")],
+    running=[(Output("quality-progress-container", "style"), {"display": "block"}, {"display": "none"})],
 )
-def run_data_quality_analysis(json_data, n_clicks, constraints_data=None):
+def run_data_quality_analysis(set_progress, dataset_handle, n_clicks, constraints_data=None, reference_handle=None):
     print("=== DATA QUALITY ANALYSIS CALLBACK TRIGGERED ===")
     print(f"n_clicks: {n_clicks}")
-    print(f"json_data is None: {json_data is None}")
+    print(f"dataset_handle: {dataset_handle}")
     print(f"constraints_data: {constraints_data}")
     
     ctx = dash.callback_context
     if not ctx.triggered:
         raise PreventUpdate
-    if json_data is None:
+    if dataset_handle is None:
         print("Preventing update due to None inputs")
         raise PreventUpdate
     
+    progress = analysis_progress(set_progress)
     try:
-        # Parse the JSON data back to a dataframe
-        from io import StringIO
-        df = pd.read_json(StringIO(json_data), orient='split')
-        print(f"DataFrame shape: {df.shape}")
-        
-        # Run the data quality analysis with custom constraints
-        print("Running data quality analysis...")
-        quality_results, visualizations = analyze_data_quality(df, constraints_data)
-        print("Analysis complete!")
+        if dataset_registry.source_path(dataset_handle):
+            # Large file: results come from the chunked pass shared with the privacy analysis
+            print("Running streaming data quality analysis...")
+            quality_results, visualizations = load_stream_analysis(dataset_handle, progress).analyze_data_quality(constraints_data, ACCURACY_ENGINE)
+            print("Analysis complete!")
+        else:
+            # Load the parsed dataframe from the server-side registry
+            df = dataset_registry.load(dataset_handle)
+            profiles = load_dataset_profiles(dataset_handle, df)
+            print(f"DataFrame shape: {df.shape}")
+            
+            # Reference table for foreign key constraints, if one was uploaded
+            reference_df = dataset_registry.load(reference_handle) if reference_handle else None
+            
+            # The dimensions do not depend on the constraints: compute them once per dataset,
+            # on disk so later background jobs reuse them
+            dimensions = dataset_registry.get_artifact(
+                dataset_handle, f"quality_dimensions:{ACCURACY_ENGINE}",
+                lambda: calculate_quality_dimensions(df, profiles, dataset_handle, ACCURACY_ENGINE, load_shared_path(dataset_handle),
+                                                     load_dataset_row_hashes(dataset_handle, df, profiles), progress),
+                persist=True)
+            
+            # Run the data quality analysis with custom constraints; unchanged constraints come from the cache
+            print("Running data quality analysis...")
+            quality_results, visualizations = analyze_data_quality(df, constraints_data, profiles=profiles, dataset_key=dataset_handle,
+                                                                 accuracy_engine=ACCURACY_ENGINE,
+                                                                 reference_df=reference_df, reference_key=reference_handle,
+                                                                 dimensions=dimensions, progress=progress)
+            print("Analysis complete!")
         
         # Return the results
         return json.dumps(quality_results), visualizations
@@ -788,7 +997,7 @@ def generate_privacy_report_callback(n_clicks, report_format, privacy_data, qual
     # Parse the data
     privacy_results = json.loads(privacy_data)
     quality_results = json.loads(quality_data)
-    df = pd.read_json(StringIO(dataset_data), orient='split')
+    df = load_report_dataset(dataset_data)
     
     # Generate the report
     return generate_report(df, privacy_results, quality_results, report_format)
@@ -810,7 +1019,7 @@ def generate_quality_report_callback(n_clicks, report_format, privacy_data, qual
     # Parse the data
     privacy_results = json.loads(privacy_data)
     quality_results = json.loads(quality_data)
-    df = pd.read_json(StringIO(dataset_data), orient='split')
+    df = load_report_dataset(dataset_data)
     
     # Generate the report
     return generate_report(df, privacy_results, quality_results, report_format)
@@ -820,6 +1029,7 @@ def generate_quality_report_callback(n_clicks, report_format, privacy_data, qual
     Output("chat-messages", "children"),
     Output("chat-history-store", "data"),
     Output("user-input", "value", allow_duplicate="initial_duplicate"),  # Clear the input field after sending
+    Output("chat-stream-request", "data"),
     [Input("send-button", "n_clicks"), Input("user-input", "n_submit")],  # Trigger on button click or Enter key
     State("user-input", "value"),
     State("chat-messages", "children"),
@@ -874,6 +1084,13 @@ def process_message(n_clicks, n_submit, user_input, current_messages, chat_histo
     # Add user message to display
     updated_messages = current_messages + [user_message_component]
     
+    if CHAT_STREAMING:
+        # The reply is streamed into a placeholder by assets/chat-stream.js and rendered by finish_streamed_message
+        stream_id = uuid.uuid4().hex
+        new_history = chat_history + [{"role": "user", "content": user_input}]
+        return (updated_messages + [create_streaming_bot_message(stream_id)], new_history, "",
+                {"id": stream_id, "input": user_input})
+    
     # Add improved typing indicator with animation
     typing_indicator = html.Div(
         [
@@ -921,7 +1138,44 @@ def process_message(n_clicks, n_submit, user_input, current_messages, chat_histo
     updated_messages = updated_messages[:-1] + [bot_message_component]
     
     # Return empty string as third value to clear the input field
-    return updated_messages, new_history, ""
+    return updated_messages, new_history, "", dash.no_update
+
+
+# Stream the queued reply from /chat/stream into its placeholder
+app.clientside_callback(
+    ClientsideFunction(namespace="chat", function_name="stream"),
+    Output("chat-stream-result", "data"),
+    Input("chat-stream-request", "data"),
+    State("chat-history-store", "data"),
+    State("privacy-scores-store", "data"),
+    State("data-quality-scores-store", "data"),
+    prevent_initial_call=True,
+)
+
+
+@app.callback(
+    Output("chat-messages", "children", allow_duplicate=True),
+    Output("chat-history-store", "data", allow_duplicate=True),
+    Input("chat-stream-result", "data"),
+    State("chat-messages", "children"),
+    State("chat-history-store", "data"),
+    prevent_initial_call=True,
+)
+def finish_streamed_message(bot_response_data, current_messages, chat_history):
+    """Replace the placeholder of a streamed reply with the finished message and its citations."""
+    if not bot_response_data:
+        raise PreventUpdate
+    
+    placeholder_id = f"chat-stream-{bot_response_data.get('stream_id')}"
+    from components.chatbot_component import create_bot_message
+    bot_message_component = create_bot_message(bot_response_data)
+    updated_messages = [
+        bot_message_component if isinstance(message, dict) and message.get("props", {}).get("id") == placeholder_id else message
+        for message in current_messages
+    ]
+    
+    new_history = chat_history + [{"role": "assistant", "content": bot_response_data["content"]}]
+    return updated_messages, new_history
 
 # Tab switching callback
 @app.callback(
@@ -1024,6 +1278,35 @@ def manage_constraints_callback(add_clicks, remove_clicks, column_names, current
     
     return current_rows, updated_constraints
 
+# Register the reference table used by foreign key constraints
+@app.callback(
+    Output("reference-dataset-store", "data"),
+    Output("reference-upload-status", "children"),
+    Input("reference-upload", "contents"),
+    State("reference-upload", "filename"),
+    prevent_initial_call=True
+)
+def update_reference_table(contents, filename):
+    """Parse the uploaded reference table and keep it server-side."""
+    if contents is None:
+        raise PreventUpdate
+    
+    try:
+        content_type, content_string = contents.split(",")
+        decoded = base64.b64decode(content_string)
+        if filename.endswith(".csv"):
+            reference_df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+        elif filename.endswith((".xls", ".xlsx")):
+            reference_df = pd.read_excel(io.BytesIO(decoded))
+        else:
+            return None, "Only CSV and Excel files are supported."
+        
+        reference_handle = dataset_registry.register(reference_df, decoded)
+        return reference_handle, f"Reference table: {filename} ({reference_df.shape[0]} rows, {reference_df.shape[1]} columns)"
+    except Exception as e:
+        print(f"Error processing reference table: {e}")
+        return None, f"Error processing reference table: {str(e)}"
+
 
 @app.callback(
     Output("column-collapse-content", "is_open"),
@@ -1038,6 +1321,45 @@ def toggle_column_collapse(n_clicks, is_open):
     return is_open
 
 
+@app.callback(
+    Output("near-duplicates-output", "children"),
+    Input("near-duplicates-btn", "n_clicks"),
+    State("dataset-store", "data"),
+    prevent_initial_call=True
+)
+def find_near_duplicates(n_clicks, dataset_handle):
+    """Search the near-duplicate rows of the dataset when the user asks for them.
+    
+    The search sorts the row hashes once per column, so it is kept out of the quality analysis.
+    """
+    if not n_clicks or dataset_handle is None:
+        raise PreventUpdate
+    if dataset_registry.source_path(dataset_handle):
+        return html.P("Near-duplicate rows are only searched for datasets analyzed in memory.", className="small text-muted")
+    
+    df = dataset_registry.load(dataset_handle)
+    row_hashes = load_dataset_row_hashes(dataset_handle, df, load_dataset_profiles(dataset_handle, df))
+    return create_near_duplicates_summary(row_hashes.near_duplicates())
+
+
+@app.callback(
+    Output("column-quality-table", "data"),
+    [Input("column-quality-table", "page_current"),
+     Input("column-quality-table", "page_size")],
+    [State("data-quality-scores-store", "data")],
+    prevent_initial_call=True
+)
+def page_column_quality_table(page_current, page_size, quality_data):
+    """Serve the requested page of the column-level quality table."""
+    if not quality_data:
+        raise PreventUpdate
+    try:
+        return column_quality_page(quality_data, page_current or 0, page_size or QUALITY_TABLE_PAGE_SIZE)
+    except KeyError:
+        # Results without column details (e.g. a failed analysis)
+        raise PreventUpdate
+
+
 @app.callback(
     Output("constraints-collapse-content", "is_open"),
     [Input("constraints-collapse-button", "n_clicks")],
@@ -1089,6 +1411,7 @@ def toggle_entropy_section(n_clicks, is_open):
         Output("technical-view-btn", "outline"),
         Output("simple-view-btn", "style"),
         Output("technical-view-btn", "style"),
+        Output("technical-privacy-container", "children"),
     ],
     [
         Input("privacy-scores-store", "data"),
@@ -1102,7 +1425,11 @@ def toggle_entropy_section(n_clicks, is_open):
     ]
 )
 def toggle_privacy_views(privacy_data, simple_clicks, tech_clicks, simple_active, simple_style, tech_style):
-    """Toggle between simple and technical views of privacy analysis."""
+    """Toggle between simple and technical views of privacy analysis.
+    
+    The technical view is rendered when it is first switched to (and then served from the render
+    cache), so its figures are not built or sent for users who stay on the simple view.
+    """
     ctx = dash.callback_context
     toggle_visible = {"display": "block"}
     toggle_hidden = {"display": "none"}
@@ -1135,148 +1462,21 @@ def toggle_privacy_views(privacy_data, simple_clicks, tech_clicks, simple_active
     
     # If no privacy data, hide everything
     if not privacy_data:
-        return toggle_hidden, toggle_hidden, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style
+        return toggle_hidden, toggle_hidden, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style, []
     
     # Show toggle container when there's privacy data
     triggered_id = ctx.triggered[0]["prop_id"].split(".")[0] if ctx.triggered else None
     
-    # Default to simple view
+    # Default to simple view; new results drop the technical view rendered for the previous ones
     if triggered_id != "technical-view-btn" and triggered_id != "simple-view-btn":
-        return toggle_visible, toggle_visible, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style
+        return toggle_visible, toggle_visible, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style, []
     
     # Handle button clicks to switch views
     if triggered_id == "technical-view-btn":
-        return toggle_visible, toggle_hidden, toggle_visible, False, True, True, False, inactive_simple_style, active_tech_style
+        technical_view = render_technical_privacy_view(privacy_data)
+        return toggle_visible, toggle_hidden, toggle_visible, False, True, True, False, inactive_simple_style, active_tech_style, technical_view
     else:  # simple-view-btn clicked
-        return toggle_visible, toggle_visible, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style
-
-# Privacy visualization helper functions
-def get_privacy_factors_chart(column_names, privacy_factors):
-    """Create a privacy factors bar chart with the application's design theme."""
-    # Sort data for better visualization
-    sorted_data = sorted(zip(column_names, privacy_factors), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_privacy_factors = zip(*sorted_data) if sorted_data else ([], [])
-    
-    # Create the chart with the application's purple color theme
-    fig = px.bar(
-        x=sorted_column_names, 
-        y=sorted_privacy_factors,
-        labels={
-            "x": "", 
-            "y": "Privacy Factor",
-        },
-        color_discrete_sequence=["#4361ee"],
-        text=[f"{s:.2f}" for s in sorted_privacy_factors] if sorted_privacy_factors else [],
-    )
-    
-    # Apply clean, minimal styling
-    fig.update_layout(
-        xaxis_tickangle=-30,
-        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
-        plot_bgcolor="#f8f9fa",
-        paper_bgcolor="rgba(255,255,255,0)",
-        font=dict(family="Roboto", size=11, color="#555b6e"),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor="#f3f4f6",
-            range=[0, max(sorted_privacy_factors) * 1.1 if sorted_privacy_factors else 1],
-        ),
-    )
-    
-    # Improve text positioning and hover info
-    fig.update_traces(
-        marker=dict(line=dict(width=0)),
-        textposition="outside",
-        textfont=dict(size=10, color="#4b5563"),
-        hovertemplate="<b>%{x}</b><br>Privacy Factor: <b>%{y:.2f}</b><extra></extra>"
-    )
-    
-    return fig
-
-def get_shannon_entropy_chart(column_names, shannon_entropy):
-    """Create a shannon entropy bar chart with the application's design theme."""
-    # Sort data for better visualization
-    sorted_data = sorted(zip(column_names, shannon_entropy), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_entropy = zip(*sorted_data) if sorted_data else ([], [])
-    
-    # Create the chart with the application's green color theme
-    fig = px.bar(
-        x=sorted_column_names, 
-        y=sorted_entropy,
-        labels={
-            "x": "", 
-            "y": "Shannon Entropy (bits)", 
-        },
-        color_discrete_sequence=["#10b981"],  # Green from the theme
-        text=[f"{s:.2f}" for s in sorted_entropy] if sorted_entropy else [],
-    )
-    
-    # Apply clean, minimal styling
-    fig.update_layout(
-        xaxis_tickangle=-30,
-        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
-        plot_bgcolor="#f8f9fa",
-        paper_bgcolor="rgba(255,255,255,0)",
-        font=dict(family="Roboto", size=11, color="#555b6e"),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor="#f3f4f6",
-        ),
-    )
-    
-    # Improve text positioning and hover info
-    fig.update_traces(
-        marker=dict(line=dict(width=0)),
-        textposition="outside",
-        textfont=dict(size=10, color="#4b5563"),
-        hovertemplate="<b>%{x}</b><br>Shannon Entropy: <b>%{y:.2f}</b> bits<extra></extra>"
-    )
-    
-    return fig
-
-def get_hartley_measure_chart(column_names, hartley_measure):
-    """Create a hartley measure bar chart with the application's design theme."""
-    # Sort data for better visualization
-    sorted_data = sorted(zip(column_names, hartley_measure), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_hartley = zip(*sorted_data) if sorted_data else ([], [])
-    
-    # Create the chart with the application's purple color theme (darker shade)
-    fig = px.bar(
-        x=sorted_column_names, 
-        y=sorted_hartley,
-        labels={
-            "x": "", 
-            "y": "Hartley Measure (dits)", 
-        },
-        color_discrete_sequence=["#3a0ca3"],  # Darker purple from the theme
-        text=[f"{s:.2f}" for s in sorted_hartley] if sorted_hartley else [],
-    )
-    
-    # Apply clean, minimal styling
-    fig.update_layout(
-        xaxis_tickangle=-30,
-        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
-        plot_bgcolor="#f8f9fa",
-        paper_bgcolor="rgba(255,255,255,0)",
-        font=dict(family="Roboto", size=11, color="#555b6e"),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor="#f3f4f6",
-        ),
-    )
-    
-    # Improve text positioning and hover info
-    fig.update_traces(
-        marker=dict(line=dict(width=0)),
-        textposition="outside",
-        textfont=dict(size=10, color="#4b5563"),
-        hovertemplate="<b>%{x}</b><br>Hartley Measure: <b>%{y:.2f}</b> dits<extra></extra>"
-    )
-    
-    return fig
+        return toggle_visible, toggle_visible, toggle_hidden, True, False, False, True, active_simple_style, inactive_tech_style, dash.no_update
 
 # Handle tab content in the privacy metrics tabs
 @app.callback(
@@ -1291,24 +1491,11 @@ def render_privacy_tab_content(active_tab, privacy_data):
     
     # Handle data safely with proper error management
     try:
-        # Check if data is properly structured
-        if isinstance(privacy_data, str):
-            import json
-            privacy_data = json.loads(privacy_data)
-            
-        # Get data from the store - safely with error handling
-        if "column_scores" not in privacy_data:
-            # Fallback if data structure is different
-            return html.Div("No privacy metrics data available", className="text-muted my-3")
-            
-        column_scores = privacy_data["column_scores"]
-        column_names = list(column_scores.keys())
-        
+        # Charts are cached per result, so the store is only parsed to build a new one
         if active_tab == "tab-privacy-factors":
-            privacy_factors = [scores.get("privacy_factor", 0) for scores in column_scores.values()]
             return [
                 dcc.Graph(
-                    figure=get_privacy_factors_chart(column_names, privacy_factors),
+                    figure=privacy_metric_figure(privacy_data, "privacy_factor"),
                     config={"displayModeBar": False},
                     style={"height": "250px"}
                 ),
@@ -1320,10 +1507,9 @@ def render_privacy_tab_content(active_tab, privacy_data):
             ]
         
         elif active_tab == "tab-shannon":
-            shannon_entropy = [scores.get("shannon_entropy", 0) for scores in column_scores.values()]
             return [
                 dcc.Graph(
-                    figure=get_shannon_entropy_chart(column_names, shannon_entropy),
+                    figure=privacy_metric_figure(privacy_data, "shannon_entropy"),
                     config={"displayModeBar": False},
                     style={"height": "250px"}
                 ),
@@ -1335,10 +1521,9 @@ def render_privacy_tab_content(active_tab, privacy_data):
             ]
         
         elif active_tab == "tab-hartley":
-            hartley_measure = [scores.get("hartley_measure", 0) for scores in column_scores.values()]
             return [
                 dcc.Graph(
-                    figure=get_hartley_measure_chart(column_names, hartley_measure),
+                    figure=privacy_metric_figure(privacy_data, "hartley_measure"),
                     config={"displayModeBar": False},
                     style={"height": "250px"}
                 ),
@@ -1350,6 +1535,9 @@ def render_privacy_tab_content(active_tab, privacy_data):
             ]
             
         return []
+    except KeyError:
+        # Fallback if data structure is different
+        return html.Div("No privacy metrics data available", className="text-muted my-3")
     except Exception as e:
         # Provide a user-friendly error message
         return html.Div([
@@ -0,0 +1,95 @@
+// Streamed chat replies
+//
+// When process_message queues a reply in chat-stream-request, the message is
+// posted to /chat/stream and the server-sent events are read as they arrive.
+// Tokens are appended to the placeholder bubble; the finished message (with
+// its citations) resolves the clientside callback into chat-stream-result,
+// from which Dash renders the final bot message.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    chat: {
+        stream: async function(streamRequest, chatHistory, privacyData, qualityData) {
+            const STREAM_URL = '/chat/stream';
+            if (!streamRequest) {
+                return window.dash_clientside.no_update;
+            }
+
+            function failed(message) {
+                return {
+                    stream_id: streamRequest.id,
+                    content: "I'm sorry, I encountered an error while processing your request: " + message,
+                    feedback: null,
+                    citations: []
+                };
+            }
+
+            // One "event: name\ndata: json" block of the stream
+            function parseEvent(block) {
+                let name = 'message';
+                const data = [];
+                block.split('\n').forEach(function(line) {
+                    if (line.startsWith('event:')) {
+                        name = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        data.push(line.slice(5).trim());
+                    }
+                });
+                return {name: name, data: data.length ? JSON.parse(data.join('\n')) : null};
+            }
+
+            let response;
+            try {
+                response = await fetch(STREAM_URL, {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json', 'Accept': 'text/event-stream'},
+                    body: JSON.stringify({
+                        input: streamRequest.input,
+                        history: chatHistory || [],
+                        privacy_context: privacyData,
+                        quality_context: qualityData
+                    })
+                });
+            } catch (error) {
+                return failed(error.message);
+            }
+            if (!response.ok || !response.body) {
+                return failed(response.statusText || 'the reply could not be streamed');
+            }
+
+            const output = document.getElementById('chat-stream-text-' + streamRequest.id);
+            const typing = document.getElementById('chat-stream-typing-' + streamRequest.id);
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let text = '';
+
+            while (true) {
+                const {value, done} = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += decoder.decode(value, {stream: true});
+
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+                    const event = parseEvent(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+
+                    if (event.name === 'token') {
+                        text += event.data.text;
+                        if (output) {
+                            output.textContent = text;
+                        }
+                        if (typing) {
+                            typing.style.display = 'none';
+                        }
+                    } else if (event.name === 'done') {
+                        reader.cancel();
+                        return Object.assign({stream_id: streamRequest.id}, event.data);
+                    }
+                }
+            }
+            return failed('the reply ended unexpectedly');
+        }
+    }
+});
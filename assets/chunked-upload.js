@@ -0,0 +1,127 @@
+// Chunked, resumable uploads for the dataset upload area
+//
+// Files dropped on or selected in #upload-data are sent in chunks to the
+// /uploads/chunked routes instead of being base64-encoded into the
+// dcc.Upload callback. When the server has hashed the complete file, the
+// dataset handle is handed to the Dash layout through chunked-upload-store.
+
+(function() {
+    const UPLOAD_URL = '/uploads/chunked';
+    const MAX_RETRIES = 5;
+
+    function setProps(id, props) {
+        if (window.dash_clientside && window.dash_clientside.set_props) {
+            window.dash_clientside.set_props(id, props);
+        }
+    }
+
+    function showStatus(message) {
+        setProps('upload-status', {children: message});
+    }
+
+    // Uploads are remembered per file so a reload or dropped connection resumes instead of restarting
+    function resumeKey(file) {
+        return 'chunked-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+    }
+
+    async function requestJson(url, options) {
+        const response = await fetch(url, options);
+        const body = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            const error = new Error(body.error || response.statusText);
+            error.status = response.status;
+            error.received = body.received;
+            throw error;
+        }
+        return body;
+    }
+
+    async function startOrResume(file) {
+        const savedId = window.localStorage.getItem(resumeKey(file));
+        if (savedId) {
+            try {
+                const status = await requestJson(UPLOAD_URL + '/' + savedId);
+                if (status.size === file.size) {
+                    return status;
+                }
+            } catch (error) {
+                // The upload expired or never existed on this server; start over
+            }
+        }
+        const upload = await requestJson(UPLOAD_URL, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size})
+        });
+        window.localStorage.setItem(resumeKey(file), upload.upload_id);
+        return upload;
+    }
+
+    async function uploadFile(file) {
+        let upload = await startOrResume(file);
+        const uploadId = upload.upload_id;
+        const chunkSize = upload.chunk_size || 8 * 1024 * 1024;
+        let received = upload.received;
+        let retries = 0;
+
+        while (received < file.size) {
+            showStatus('Uploading ' + file.name + '… ' + Math.floor(100 * received / file.size) + '%');
+            const chunk = file.slice(received, Math.min(received + chunkSize, file.size));
+            try {
+                const result = await requestJson(UPLOAD_URL + '/' + uploadId + '?offset=' + received, {
+                    method: 'PUT',
+                    headers: {'Content-Type': 'application/octet-stream'},
+                    body: chunk
+                });
+                received = result.received;
+                retries = 0;
+            } catch (error) {
+                if (error.status === 404 || retries >= MAX_RETRIES) {
+                    throw error;
+                }
+                retries += 1;
+                await new Promise(resolve => setTimeout(resolve, 500 * Math.pow(2, retries)));
+                // Ask the server where to continue; the failed chunk may or may not have landed
+                const status = await requestJson(UPLOAD_URL + '/' + uploadId).catch(() => null);
+                if (status) {
+                    received = status.received;
+                }
+            }
+        }
+
+        const completed = await requestJson(UPLOAD_URL + '/' + uploadId + '/complete', {method: 'POST'});
+        window.localStorage.removeItem(resumeKey(file));
+        showStatus('Processing ' + file.name + '…');
+        setProps('chunked-upload-store', {data: completed});
+    }
+
+    function handleFiles(files) {
+        if (!files || !files.length) {
+            return;
+        }
+        uploadFile(files[0]).catch(error => {
+            showStatus('Upload failed: ' + error.message);
+        });
+    }
+
+    function insideUploadArea(target) {
+        return target && target.closest && target.closest('#upload-data');
+    }
+
+    // Capture-phase listeners run before dcc.Upload's own handlers, which never see the file
+    window.addEventListener('change', function(event) {
+        if (event.target.type === 'file' && insideUploadArea(event.target)) {
+            event.stopPropagation();
+            handleFiles(event.target.files);
+            event.target.value = '';
+        }
+    }, true);
+
+    window.addEventListener('drop', function(event) {
+        if (insideUploadArea(event.target)) {
+            event.preventDefault();
+            event.stopPropagation();
+            handleFiles(event.dataTransfer.files);
+        }
+    }, true);
+})();
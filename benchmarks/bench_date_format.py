@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the date_format custom constraint.
+
+Compares the original per-value pd.to_datetime loop with
+count_date_format_matches(), which parses each distinct value once in a
+single vectorized call, on a column of date strings with a share of
+malformed values.
+
+Usage:
+    python benchmarks/bench_date_format.py --rows 1000000 --distinct 20000
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constraint_plan import count_date_format_matches
+
+
+def legacy_date_format_matches(series, date_format):
+    """Original implementation: one pd.to_datetime call per non-null value."""
+    valid_count = 0
+    for val in series.dropna():
+        try:
+            pd.to_datetime(val, format=date_format)
+            valid_count += 1
+        except Exception:
+            pass
+    return valid_count
+
+
+def timed(func, *args):
+    """Return the wall-clock time of a single run and its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the date_format constraint")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows")
+    parser.add_argument("--distinct", type=int, default=20_000, help="Number of distinct dates")
+    parser.add_argument("--invalid", type=float, default=0.05, help="Share of malformed values")
+    parser.add_argument("--format", default="%d/%m/%Y", help="strptime format of the constraint")
+    parser.add_argument("--skip-legacy", action="store_true", help="Do not time the original implementation")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    dates = pd.Timestamp("1940-01-01") + pd.to_timedelta(rng.integers(0, 30_000, args.distinct), unit="D")
+    pool = np.asarray(dates.strftime(args.format), dtype=object)
+    values = pool[rng.integers(0, len(pool), args.rows)]
+    malformed = rng.random(args.rows) < args.invalid
+    values[malformed] = np.asarray(dates[:1].strftime("%Y.%m.%d"), dtype=object)[0]
+    values[rng.random(args.rows) < 0.02] = None
+    series = pd.Series(values, dtype=object)
+
+    print(f"rows={args.rows:,} distinct={args.distinct:,} format={args.format}")
+    print(f"{'implementation':<12} {'time (s)':>9} {'matches':>10}")
+
+    vectorized_time, vectorized_count = timed(count_date_format_matches, series, args.format)
+    print(f"{'vectorized':<12} {vectorized_time:>9.2f} {vectorized_count:>10,}")
+
+    if not args.skip_legacy:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            legacy_time, legacy_count = timed(legacy_date_format_matches, series, args.format)
+        assert legacy_count == vectorized_count, (legacy_count, vectorized_count)
+        print(f"{'legacy':<12} {legacy_time:>9.2f} {legacy_count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
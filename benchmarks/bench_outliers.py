@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the outlier engines of the accuracy dimension.
+
+Compares the original per-column IsolationForest fit_predict with the cached
+detector's engines: the IsolationForest (one scoring pass over the distinct
+values), the vectorized robust statistics "iqr" and "mad", and the single
+"multivariate" forest over all columns.
+
+Usage:
+    python benchmarks/bench_outliers.py --rows 1000000 --columns 10
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.outlier_detection import ACCURACY_ENGINES, OutlierDetector
+
+
+def legacy_outlier_counts(df):
+    """Original implementation: one IsolationForest fit_predict per numeric column."""
+    counts = {}
+    for col in df.columns:
+        clf = IsolationForest(contamination=0.1, random_state=42)
+        column_data = df[col].fillna(df[col].median()).values.reshape(-1, 1)
+        counts[col] = int((clf.fit_predict(column_data) == -1).sum())
+    return counts
+
+
+def timed(func, *args):
+    """Return the wall-clock time of a single run and its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the outlier engines")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=10, help="Number of numeric columns")
+    parser.add_argument("--skip-legacy", action="store_true", help="Do not time the original implementation")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    data = {}
+    for i in range(args.columns):
+        if i % 2:
+            data[f"int_{i}"] = rng.integers(18, 90, args.rows).astype(float)
+        else:
+            data[f"float_{i}"] = rng.standard_t(3, args.rows)
+    df = pd.DataFrame(data)
+    columns = list(df.columns)
+
+    print(f"rows={args.rows:,} columns={args.columns}")
+    print(f"{'engine':<18} {'time (s)':>9} {'outliers':>10}")
+
+    if not args.skip_legacy:
+        legacy_time, legacy_counts = timed(legacy_outlier_counts, df)
+        print(f"{'legacy':<18} {legacy_time:>9.2f} {sum(legacy_counts.values()):>10,}")
+
+    for engine in ACCURACY_ENGINES:
+        detector = OutlierDetector()
+        engine_time, counts = timed(detector.outlier_counts, df, columns, "bench", engine)
+        cached_time, _ = timed(detector.outlier_counts, df, columns, "bench", engine)
+        if engine == "isolation_forest" and not args.skip_legacy:
+            assert counts == legacy_counts, (counts, legacy_counts)
+        print(f"{engine:<18} {engine_time:>9.2f} {sum(counts.values()):>10,}   (cached re-run {cached_time:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vectorized privacy metric kernels.
+
+Compares the original per-value Python loops of calculate_privacy_factor and
+calculate_shannon_entropy (string cast + value_counts) with the NumPy kernels
+that run over the factorized count vector of a ColumnProfile.
+
+Usage:
+    python benchmarks/bench_privacy_metrics.py --rows 2000000 --distinct 1000000
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.column_profile import ColumnProfile
+from utils.privacy_metrics import calculate_privacy_factor, calculate_shannon_entropy
+
+
+def legacy_privacy_factor(column):
+    """Original implementation: string cast, value_counts and a Python loop."""
+    if column.empty or column.isna().all():
+        return 1.0
+    if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_dtype(column):
+        column = column.astype(str)
+    privacy_factors = [1 - 1 / frequency for frequency in column.value_counts()]
+    return sum(privacy_factors) / len(privacy_factors) if privacy_factors else 1.0
+
+
+def legacy_shannon_entropy(column):
+    """Original implementation: string cast, value_counts and a Python loop."""
+    if column.empty or column.isna().all():
+        return 0.0
+    if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_dtype(column):
+        column = column.astype(str)
+    total_values = len(column)
+    entropy = 0
+    for frequency in column.value_counts():
+        probability = frequency / total_values
+        if probability > 0:
+            entropy -= probability * math.log2(probability)
+    return entropy
+
+
+def timed(func, *args, repeat=3):
+    """Return the best wall-clock time of several runs and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the privacy metric kernels")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Number of rows per column")
+    parser.add_argument("--distinct", type=int, default=1_000_000, help="Number of distinct values per column")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    columns = {
+        "integer id": pd.Series(rng.integers(0, args.distinct, args.rows)),
+        "float": pd.Series(rng.integers(0, args.distinct, args.rows) / 10.0),
+        "datetime": pd.Series(pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, args.distinct, args.rows), unit="s")),
+        "string": pd.Series(rng.integers(0, args.distinct, args.rows).astype(str)).astype(object),
+    }
+
+    print(f"rows={args.rows:,} distinct<={args.distinct:,}")
+    print(f"{'column':<12} {'metric':<16} {'legacy (s)':>11} {'profile (s)':>12} {'kernel (s)':>11} {'speedup':>8}")
+
+    for name, column in columns.items():
+        profile_time, profile = timed(ColumnProfile, column, repeat=args.repeat)
+        for metric, legacy, current in (
+            ("privacy_factor", legacy_privacy_factor, calculate_privacy_factor),
+            ("shannon_entropy", legacy_shannon_entropy, calculate_shannon_entropy),
+        ):
+            legacy_time, legacy_value = timed(legacy, column, repeat=args.repeat)
+            kernel_time, kernel_value = timed(current, profile, repeat=args.repeat)
+            assert math.isclose(legacy_value, kernel_value, rel_tol=1e-9), (name, metric, legacy_value, kernel_value)
+            speedup = legacy_time / (profile_time + kernel_time)
+            print(f"{name:<12} {metric:<16} {legacy_time:>11.3f} {profile_time:>12.3f} {kernel_time:>11.4f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
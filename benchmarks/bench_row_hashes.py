@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for duplicate-row detection.
+
+Times the one-off row-hash index that the app caches per dataset, duplicate
+counting and flagging from it, and the near-duplicate search, against
+DataFrame.duplicated() over the same frame.
+
+Usage:
+    python benchmarks/bench_row_hashes.py --rows 10000000 --columns 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.column_profile import build_column_profiles
+from utils.row_hashes import RowHashIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark duplicate-row detection")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Number of rows")
+    parser.add_argument("--columns", type=int, default=5, help="Number of columns")
+    parser.add_argument("--skip-near", action="store_true", help="Do not time the near-duplicate search")
+    parser.add_argument("--skip-pandas", action="store_true", help="Do not time the DataFrame.duplicated baseline")
+    args = parser.parse_args()
+
+    # Mix of integer, float and text columns of growing cardinality
+    rng = np.random.default_rng(42)
+    labels = np.array([f"label_{i}" for i in range(10_000)], dtype=object)
+    columns = {}
+    for i in range(args.columns):
+        cardinality = 10 ** (1 + i % 4)
+        if i % 3 == 0:
+            columns[f"col_{i}"] = rng.integers(0, cardinality, args.rows)
+        elif i % 3 == 1:
+            columns[f"col_{i}"] = rng.integers(0, cardinality, args.rows) / 4
+        else:
+            columns[f"col_{i}"] = labels[rng.integers(0, min(cardinality, len(labels)), args.rows)]
+    df = pd.DataFrame(columns)
+
+    print(f"rows={args.rows:,} columns={args.columns}")
+
+    start = time.perf_counter()
+    profiles = build_column_profiles(df)
+    print(f"column profiling:    {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    index = RowHashIndex(df, profiles)
+    print(f"row-hash index:      {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    duplicate_count = index.duplicate_count
+    mask = index.duplicate_mask()
+    detection_time = time.perf_counter() - start
+    print(f"duplicate rows:      {detection_time:8.3f}s  ({duplicate_count:,} duplicates)")
+
+    if not args.skip_near:
+        start = time.perf_counter()
+        near_duplicates = index.near_duplicates()
+        print(f"near duplicates:     {time.perf_counter() - start:8.3f}s  "
+              f"({near_duplicates['near_duplicate_rows']:,} distinct rows)")
+
+    if not args.skip_pandas:
+        start = time.perf_counter()
+        expected = df.duplicated()
+        pandas_time = time.perf_counter() - start
+        assert int(expected.sum()) == duplicate_count and (expected.to_numpy() == mask).all()
+        print(f"DataFrame.duplicated:{pandas_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for merging column sketches.
+
+Sketches a column in chunks of very different cardinality, merges the chunk
+sketches in both orders, as the streaming analysis does across processes, and
+checks that the merged distinct sample matches a single pass over the column.
+
+Usage:
+    python benchmarks/bench_sketch_merge.py --rows 1000000 --distinct 50000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.privacy_sketches import ColumnSketch, DistinctSample
+
+
+def merged(sketches):
+    """Merge serialized chunk sketches into a fresh one."""
+    result = ColumnSketch.from_dict(sketches[0])
+    for sketch in sketches[1:]:
+        result.merge(ColumnSketch.from_dict(sketch))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark merging column sketches")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows")
+    parser.add_argument("--distinct", type=int, default=50_000, help="Distinct values of the large chunk")
+    args = parser.parse_args()
+
+    # Unsaturated samples merged into saturated ones, and the other way round
+    small, large = DistinctSample(4), DistinctSample(4)
+    small.add_counts(np.array([3], dtype=np.uint64), np.array([1]))
+    large.add_counts(np.arange(5, 10, dtype=np.uint64), np.ones(5, dtype=np.int64))
+    for first, second in ((small, large), (large, small)):
+        sample = DistinctSample.from_dict(first.to_dict()).merge(DistinctSample.from_dict(second.to_dict()))
+        assert sample.hashes.tolist() == [3, 5, 6, 7] and sample.saturated, sample.hashes.tolist()
+
+    # One chunk with a single value next to a chunk of high cardinality
+    rng = np.random.default_rng(42)
+    column = pd.Series(np.concatenate([np.zeros(args.rows // 2),
+                                       rng.integers(1, args.distinct + 1, args.rows - args.rows // 2)]))
+    chunks = [column.iloc[:args.rows // 2], column.iloc[args.rows // 2:]]
+
+    print(f"rows={args.rows:,} distinct={args.distinct:,}")
+
+    start = time.perf_counter()
+    single = ColumnSketch().update(column)
+    print(f"single pass:         {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    chunk_sketches = [ColumnSketch().update(chunk).to_dict() for chunk in chunks]
+    print(f"chunk sketches:      {time.perf_counter() - start:8.3f}s")
+
+    for name, order in (("merge forward", chunk_sketches), ("merge backward", chunk_sketches[::-1])):
+        start = time.perf_counter()
+        result = merged(order)
+        elapsed = time.perf_counter() - start
+        assert (result.sample.hashes == single.sample.hashes).all(), name
+        assert (result.sample.counts == single.sample.counts).all(), name
+        assert result.privacy_factor() == single.privacy_factor(), (name, result.privacy_factor(), single.privacy_factor())
+        print(f"{name + ':':21}{elapsed:8.3f}s  (privacy factor {result.privacy_factor()['value']:.6f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -288,47 +288,115 @@ def get_provider_name() -> str:
 
 # This section was cleaned up since loading animation is now handled in app.py
 
-def process_chat_message(user_input, chat_history, privacy_context, quality_context):
-    """Process a user message and return the chatbot's response, enhanced with RAG."""
-    if llm is None:
+def _unavailable_response():
+    """Response given when no chat model could be initialized."""
+    return {
+        "content": "Sorry, I'm having trouble connecting to my knowledge base. Please check your OpenAI API key.",
+        "id": str(uuid.uuid4()),
+        "timestamp": datetime.now().isoformat(),
+        "feedback": None
+    }
+
+def _error_response(error):
+    """Response given when the model could not answer."""
+    provider_name = get_provider_name()
+    if isinstance(error, ValueError):
+        # Handle API key issues
+        error_message = str(error)
+        env_var = "ANTHROPIC_API_KEY" if provider_name == "Anthropic Claude" else "OPENAI_API_KEY"
+        logger.error(f"{provider_name} API key error: {error_message}")
         return {
-            "content": "Sorry, I'm having trouble connecting to my knowledge base. Please check your OpenAI API key.",
+            "content": f"Error: {error_message}. Please set your {env_var} environment variable with a valid API key.",
             "id": str(uuid.uuid4()),
             "timestamp": datetime.now().isoformat(),
-            "feedback": None
+            "feedback": None,
+            "citations": [],
+            "provider": provider_name
         }
     
-    # Format the dataset context information
-    privacy_context_str = json.dumps(privacy_context, indent=2) if privacy_context else "No privacy analysis results available."
-    quality_context_str = json.dumps(quality_context, indent=2) if quality_context else "No data quality analysis results available."
+    # Handle other errors
+    logger.error(f"Error getting response from {provider_name}: {error}")
+    return {
+        "content": f"I'm sorry, I encountered an error while processing your request: {str(error)}. Please check your API key and network connection.",
+        "id": str(uuid.uuid4()),
+        "provider": provider_name,
+        "timestamp": datetime.now().isoformat(),
+        "feedback": None,
+        "citations": []
+    }
+
+def retrieve_chat_context(user_input):
+    """Get the knowledge base context and citations relevant to a user message."""
+    if rag_processor is None:
+        return {
+            "context": "Knowledge base not initialized.",
+            "citations": []
+        }
     
-    # Get relevant context from RAG if available
-    rag_context_data = {"context": "", "citations": []}
-    if rag_processor is not None:
-        try:
-            # Get relevant documents from the knowledge base
-            logger.info(f"Retrieving context for query: {user_input}")
-            rag_context_data = rag_processor.get_relevant_context(user_input, top_k=2)
-            
-            if not rag_context_data["context"]:
-                logger.info("No relevant context found in knowledge base")
-                rag_context_data = {
-                    "context": "No specific Singapore policy information found for this query.",
-                    "citations": []
-                }
-            else:
-                logger.info(f"Retrieved relevant context with {len(rag_context_data['citations'])} citations")
-        except Exception as e:
-            logger.error(f"Error retrieving RAG context: {e}")
-            rag_context_data = {
-                "context": "Error retrieving policy information.",
+    try:
+        # Get relevant documents from the knowledge base
+        logger.info(f"Retrieving context for query: {user_input}")
+        rag_context_data = rag_processor.get_relevant_context(user_input, top_k=2)
+        
+        if not rag_context_data["context"]:
+            logger.info("No relevant context found in knowledge base")
+            return {
+                "context": "No specific Singapore policy information found for this query.",
                 "citations": []
             }
-    else:
-        rag_context_data = {
-            "context": "Knowledge base not initialized.",
+        logger.info(f"Retrieved relevant context with {len(rag_context_data['citations'])} citations")
+        return rag_context_data
+    except Exception as e:
+        logger.error(f"Error retrieving RAG context: {e}")
+        return {
+            "context": "Error retrieving policy information.",
             "citations": []
         }
+
+def format_chat_messages(user_input, privacy_context, quality_context, rag_context):
+    """Format the prompt messages sent to the model for a user message."""
+    # Format the dataset context information
+    privacy_context_str = json.dumps(privacy_context, indent=2) if privacy_context else "No privacy analysis results available."
+    quality_context_str = json.dumps(quality_context, indent=2) if quality_context else "No data quality analysis results available."
+    
+    # Format the variables for the prompt
+    formatted_variables = {
+        "input": user_input,
+        "privacy_context": privacy_context_str,
+        "quality_context": quality_context_str,
+        "rag_context": rag_context
+    }
+    
+    # Get the appropriate prompt template and format it with the variables
+    rag_chat_prompt = get_prompt_template()
+    return rag_chat_prompt.format_messages(**formatted_variables)
+
+def finalize_chat_response(content, citations):
+    """Add citation markers and references to a complete answer and wrap it as a chat message."""
+    # Add citation references to response if there are citations
+    if citations:
+        content = _add_citation_markers(content, citations)
+        reference_section = _generate_reference_section(citations)
+        if reference_section:
+            content = f"{content}\n\n{reference_section}"
+    
+    # Return response with metadata
+    return {
+        "content": content,
+        "id": str(uuid.uuid4()),  # Generate a unique ID for the message
+        "timestamp": datetime.now().isoformat(),
+        "feedback": None,  # Initialize with no feedback
+        "citations": citations,  # Include citation information
+        "provider": get_provider_name()  # Add provider information
+    }
+
+def process_chat_message(user_input, chat_history, privacy_context, quality_context):
+    """Process a user message and return the chatbot's response, enhanced with RAG."""
+    if llm is None:
+        return _unavailable_response()
+    
+    # Get relevant context from RAG if available
+    rag_context_data = retrieve_chat_context(user_input)
     
     # Store citations with the message for later reference
     citations = rag_context_data["citations"]
@@ -339,17 +407,7 @@ def process_chat_message(user_input, chat_history, privacy_context, quality_cont
             provider_name = get_provider_name()
             raise ValueError(f"{provider_name} client is not initialized. Please check your API key.")
         
-        # Format the variables for the prompt
-        formatted_variables = {
-            "input": user_input,
-            "privacy_context": privacy_context_str,
-            "quality_context": quality_context_str,
-            "rag_context": rag_context_data["context"]
-        }
-        
-        # Get the appropriate prompt template and format it with the variables
-        rag_chat_prompt = get_prompt_template()
-        formatted_messages = rag_chat_prompt.format_messages(**formatted_variables)
+        formatted_messages = format_chat_messages(user_input, privacy_context, quality_context, rag_context_data["context"])
             
         provider_name = get_provider_name()
         logger.info(f"Sending request to {provider_name} API...")
@@ -387,49 +445,44 @@ def process_chat_message(user_input, chat_history, privacy_context, quality_cont
             # Re-raise the exception to be caught by the outer try/except
             raise
         
-        # Add citation references to response if there are citations
-        reference_section = ""
-        if citations:
-            content = _add_citation_markers(content, citations)
-            reference_section = _generate_reference_section(citations)
-            if reference_section:
-                content = f"{content}\n\n{reference_section}"
+        return finalize_chat_response(content, citations)
+    except Exception as e:
+        return _error_response(e)
+
+def stream_chat_message(user_input, chat_history, privacy_context, quality_context, model=None):
+    """Stream the chatbot's response to a user message, enhanced with RAG.
+    
+    Yields ("token", text) for every chunk of the answer as the model produces it, then
+    ("done", message) with the message dict process_chat_message would return; citation
+    markers and references are added once the whole answer is known. model defaults to
+    the configured chat model; any LangChain chat model can be passed, e.g. a fake one.
+    """
+    model = model if model is not None else llm
+    if model is None:
+        yield "done", _unavailable_response()
+        return
+    
+    # Get relevant context from RAG if available
+    rag_context_data = retrieve_chat_context(user_input)
+    citations = rag_context_data["citations"]
+    
+    try:
+        formatted_messages = format_chat_messages(user_input, privacy_context, quality_context, rag_context_data["context"])
         
-        # Return response with metadata
-        return {
-            "content": content,
-            "id": str(uuid.uuid4()),  # Generate a unique ID for the message
-            "timestamp": datetime.now().isoformat(),
-            "feedback": None,  # Initialize with no feedback
-            "citations": citations,  # Include citation information
-            "provider": get_provider_name()  # Add provider information
-        }
-    except ValueError as e:
-        # Handle API key issues
-        error_message = str(e)
         provider_name = get_provider_name()
-        env_var = "ANTHROPIC_API_KEY" if provider_name == "Anthropic Claude" else "OPENAI_API_KEY"
-        logger.error(f"{provider_name} API key error: {error_message}")
-        return {
-            "content": f"Error: {error_message}. Please set your {env_var} environment variable with a valid API key.",
-            "id": str(uuid.uuid4()),
-            "timestamp": datetime.now().isoformat(),
-            "feedback": None,
-            "citations": [],
-            "provider": provider_name
-        }
+        logger.info(f"Streaming response from {provider_name} API...")
+        
+        parts = []
+        for chunk in model.stream(formatted_messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield "token", chunk.content
+        logger.info(f"Successfully streamed response from {provider_name} API")
+        
+        yield "done", finalize_chat_response("".join(parts), citations)
     except Exception as e:
-        # Handle other errors
-        provider_name = get_provider_name()
-        logger.error(f"Error getting response from {provider_name}: {e}")
-        return {
-            "content": f"I'm sorry, I encountered an error while processing your request: {str(e)}. Please check your API key and network connection.",
-            "id": str(uuid.uuid4()),
-            "provider": provider_name,
-            "timestamp": datetime.now().isoformat(),
-            "feedback": None,
-            "citations": []
-        }
+        logger.error(f"Error during streamed API call: {e}")
+        yield "done", _error_response(e)
 
 def create_bot_message(message_data):
     """Create a bot message component with feedback buttons and citations."""
@@ -608,6 +661,62 @@ def create_bot_message(message_data):
         id={"type": "bot-message", "index": message_id}
     )
 
+def create_streaming_bot_message(stream_id):
+    """Create the bot message placeholder a streamed reply is written into as it arrives.
+    
+    assets/chat-stream.js appends the tokens to the chat-stream-text-<stream_id> element; the
+    finished message replaces the whole chat-stream-<stream_id> placeholder.
+    """
+    return html.Div(
+        [
+            dbc.Row(
+                [
+                    # Avatar column
+                    dbc.Col(
+                        html.Img(
+                            src="/assets/logo.png",
+                            className="bot-avatar",
+                            style={
+                                "width": "32px",
+                                "height": "32px",
+                                "borderRadius": "50%",
+                                "objectFit": "cover",
+                                "boxShadow": "0 2px 4px rgba(67, 97, 238, 0.2)"
+                            }
+                        ),
+                        width="auto",
+                        className="pe-2 d-flex align-items-start pt-1"
+                    ),
+                    # Message content column, with the typing indicator until the first token
+                    dbc.Col(
+                        html.Div(
+                            [
+                                html.Div(
+                                    [
+                                        html.Div(className="typing-dot"),
+                                        html.Div(className="typing-dot"),
+                                        html.Div(className="typing-dot"),
+                                    ],
+                                    id=f"chat-stream-typing-{stream_id}",
+                                    className="typing-indicator"
+                                ),
+                                html.Div(
+                                    id=f"chat-stream-text-{stream_id}",
+                                    className="bot-message-text-content",
+                                    style={"whiteSpace": "pre-wrap"}
+                                ),
+                            ],
+                            className="bot-message-text"
+                        )
+                    )
+                ],
+                className="g-0"
+            )
+        ],
+        className="bot-message mb-3",
+        id=f"chat-stream-{stream_id}"
+    )
+
 # API diagnostic button has been removed
 
 def create_chatbot_component():
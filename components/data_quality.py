@@ -380,9 +380,35 @@ def create_data_quality_tab():
                                         ),
                                     ])
                                 ]),
-                                # Store for constraints and column names
+                                # Reference table for foreign key constraints
+                                dcc.Upload(
+                                    id="reference-upload",
+                                    children=html.Div(
+                                        [
+                                            DashIconify(
+                                                icon="mdi:table-key",
+                                                width=16,
+                                                height=16,
+                                                className="me-1"
+                                            ),
+                                            "Drop or select a reference table for foreign key constraints"
+                                        ],
+                                        className="small d-flex align-items-center justify-content-center",
+                                    ),
+                                    className="mt-3 p-2",
+                                    style={
+                                        "border": "1px dashed #c7d2fe",
+                                        "borderRadius": "0.375rem",
+                                        "color": "#4361ee",
+                                        "cursor": "pointer",
+                                    },
+                                    multiple=False,
+                                ),
+                                html.Div(id="reference-upload-status", className="small text-muted mt-1"),
+                                # Store for constraints, column names and the reference table handle
                                 dcc.Store(id="constraints-store", data=[]),
-                                dcc.Store(id="quality-column-names-store", data=[])
+                                dcc.Store(id="quality-column-names-store", data=[]),
+                                dcc.Store(id="reference-dataset-store", data=None)
                             ]),
                             id="custom-constraints-content",
                         ),
@@ -401,6 +427,30 @@ def create_data_quality_tab():
                 className="mb-4",
             ),
             
+            # Progress of a running analysis; shown by the background callback while it runs
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Span("Running data quality analysis...", className="small fw-semibold"),
+                            dbc.Button(
+                                "Cancel",
+                                id="cancel-quality-analysis-btn",
+                                color="secondary",
+                                outline=True,
+                                size="sm",
+                            ),
+                        ],
+                        className="d-flex justify-content-between align-items-center mb-2"
+                    ),
+                    dbc.Progress(id="quality-progress-bar", value=0, striped=True, className="mb-1"),
+                    html.Div(id="quality-progress-message", className="small text-muted"),
+                ],
+                id="quality-progress-container",
+                className="bg-light p-3 rounded mb-3",
+                style={"display": "none"}
+            ),
+            
             # Results container with loading state
             dbc.Spinner(
                 html.Div(id="quality-results-container", className="mb-4"),
@@ -511,6 +561,10 @@ def create_constraint_row(index, columns=None):
                                             {"label": "Regex Pattern", "value": "regex"},
                                             {"label": "Value In List", "value": "value_in_list"},
                                             {"label": "Date Format", "value": "date_format"},
+                                            {"label": "Compare To Column", "value": "column_comparison"},
+                                            {"label": "Not Null If", "value": "conditional_not_null"},
+                                            {"label": "Unique Together With", "value": "composite_unique"},
+                                            {"label": "Foreign Key", "value": "foreign_key"},
                                         ],
                                         value="not_null",
                                         style={"borderColor": "#e5e7eb", "borderRadius": "0.375rem"}
@@ -528,7 +582,7 @@ def create_constraint_row(index, columns=None):
                                     dbc.Input(
                                         id={"type": "constraint-value", "index": index},
                                         type="text",
-                                        placeholder="Enter constraint value if needed",
+                                        placeholder="Value if needed, e.g. '< end_date' or 'id'",
                                         style={"borderColor": "#e5e7eb", "borderRadius": "0.375rem"}
                                     ),
                                 ],
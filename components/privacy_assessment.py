@@ -65,6 +65,30 @@ def create_privacy_assessment_tab():
                 className="mb-2",
             ),
             
+            # Progress of a running analysis; shown by the background callback while it runs
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Span("Running privacy analysis...", className="small fw-semibold"),
+                            dbc.Button(
+                                "Cancel",
+                                id="cancel-privacy-analysis-btn",
+                                color="secondary",
+                                outline=True,
+                                size="sm",
+                            ),
+                        ],
+                        className="d-flex justify-content-between align-items-center mb-2"
+                    ),
+                    dbc.Progress(id="privacy-progress-bar", value=0, striped=True, className="mb-1"),
+                    html.Div(id="privacy-progress-message", className="small text-muted"),
+                ],
+                id="privacy-progress-container",
+                className="bg-light p-3 rounded mb-3",
+                style={"display": "none"}
+            ),
+            
             # Results Container with segmented views
             html.Div(
                 [
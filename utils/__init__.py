@@ -2,3 +2,13 @@
 from .privacy_analyzer import analyze_privacy_risks
 from .data_quality_analyzer import analyze_data_quality
 from .report_generator import generate_report
+from .dataset_store import dataset_registry
+from .column_profile import ColumnProfile, build_column_profiles
+from .privacy_sketches import ColumnSketch, sketch_columns, merge_column_sketches
+from .streaming_analyzer import StreamingDatasetAnalyzer, analyze_csv_stream
+from .outlier_detection import OutlierDetector, outlier_detector, ACCURACY_ENGINES
+from .analysis_executor import AnalysisExecutor, AnalysisProgress, analysis_executor
+from .constraint_plan import ConstraintPlan, ConstraintResultCache, compile_constraints, constraint_cache
+from .dataset_lineage import LineageStore, lineage_store
+from .row_hashes import RowHashIndex, hash_rows
+from .render_cache import FigureCache, RenderCache, figure_cache, render_cache, result_fingerprint
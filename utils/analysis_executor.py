@@ -0,0 +1,237 @@
+"""
+Parallel execution of the analysis steps for the Data Privacy Assist application.
+Runs independent dimensions in a thread pool and fans per-column work out to threads or,
+for registered datasets, to worker processes that memory-map the frame's Arrow copy
+instead of receiving a pickled frame. Completed tasks and columns can be reported to an
+AnalysisProgress, e.g. the progress bar of a Dash background callback.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# "serial" runs everything inline, "thread" uses a thread pool, "process" additionally
+# sends per-column work of registered datasets to worker processes
+POOL_KINDS = ("serial", "thread", "process")
+
+
+def read_shared_column(path: str, column: Hashable) -> pd.Series:
+    """
+    Read one column of a frame stored as an Arrow IPC file, without copying its buffers.
+
+    Args:
+        path: Path of the Arrow IPC file written by DatasetRegistry.shared_path()
+        column: Name of the column
+
+    Returns:
+        pd.Series: The column, backed by the memory-mapped file where pandas allows it
+    """
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    frame = table.select([str(column)]).to_pandas()
+    series = frame.iloc[:, 0]
+    series.name = column
+    return series
+
+
+class AnalysisProgress:
+    """
+    Progress of one analysis, reported to a sink such as a background callback's set_progress.
+
+    Steps (dimensions, columns, chunks) are announced with expect() as the
+    analysis discovers them and completed with advance(), from any thread.
+    The sink receives the completed fraction, or None while no step has been
+    announced (e.g. streaming a file of unknown length), and a short message.
+    Steps announced late would make the fraction drop; it is held instead.
+    """
+
+    def __init__(self, report: Callable[[Optional[float], str], None]):
+        """
+        Initialize the progress of an analysis.
+
+        Args:
+            report: Called with (fraction or None, message) after every step
+        """
+        self.report = report
+        self.total = 0
+        self.completed = 0
+        self.fraction = 0.0
+        self._lock = threading.Lock()
+
+    def expect(self, steps: int) -> None:
+        """Announce steps still to be completed."""
+        with self._lock:
+            self.total += steps
+
+    def advance(self, message: str, steps: int = 1) -> None:
+        """Mark steps as completed and report the new progress."""
+        with self._lock:
+            self.completed += steps
+            if not self.total:
+                self.report(None, message)
+                return
+            self.fraction = max(self.fraction, min(self.completed / self.total, 1.0))
+            # Reported under the lock so reports from several threads arrive in order
+            self.report(self.fraction, message)
+
+
+def _advance(progress: Optional[AnalysisProgress], message: str) -> None:
+    if progress is not None:
+        progress.advance(message)
+
+
+def _apply_to_shared_column(func: Callable[[pd.Series], Any], path: str, column: Hashable) -> Any:
+    """Worker entry point: load a column from the shared Arrow file and apply func to it."""
+    return func(read_shared_column(path, column))
+
+
+class AnalysisExecutor:
+    """
+    Runs independent analysis steps concurrently.
+
+    Pools are created on first use and shared by every analysis. Results are
+    returned in the same structures as a serial run, keyed by task name or
+    column, so callers do not depend on completion order.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            kind: One of POOL_KINDS
+            max_workers: Maximum number of threads or processes; one worker runs serially
+        """
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unsupported analysis pool: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self) -> bool:
+        """Whether tasks actually run concurrently."""
+        return self.kind != "serial" and self.max_workers > 1
+
+    def _threads(self) -> Executor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis")
+            return self._thread_pool
+
+    def _processes(self) -> Executor:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool
+
+    def run(self, tasks: Dict[str, Callable[[], Any]], progress: Optional[AnalysisProgress] = None) -> Dict[str, Any]:
+        """
+        Run independent zero-argument tasks and collect their results.
+
+        Tasks run in the thread pool: they usually close over the shared frame
+        and profiles, which worker processes could not receive without copying.
+        Running from inside a pool thread falls back to serial execution so
+        nested calls cannot exhaust the pool.
+
+        Args:
+            tasks: Mapping of task name to callable
+            progress: Progress advanced by one step per completed task
+
+        Returns:
+            dict: Mapping of task name to result; the first exception raised by a task is re-raised
+        """
+        if progress is not None:
+            progress.expect(len(tasks))
+
+        if not self.parallel or len(tasks) < 2 or threading.current_thread().name.startswith("analysis"):
+            results = {}
+            for name, task in tasks.items():
+                results[name] = task()
+                _advance(progress, f"Finished {name.replace('_', ' ')}")
+            return results
+
+        futures = {self._threads().submit(task): name for name, task in tasks.items()}
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            _advance(progress, f"Finished {futures[future].replace('_', ' ')}")
+        return {name: results[name] for name in tasks}
+
+    def map_columns(self, func: Callable[[pd.Series], Any], df: pd.DataFrame, columns: Sequence,
+                    shared_path: Optional[str] = None, progress: Optional[AnalysisProgress] = None,
+                    step: str = "Analyzed") -> Dict[Hashable, Any]:
+        """
+        Apply a function to several columns of a frame.
+
+        With a process pool and the path of the frame's shared Arrow copy, each
+        worker memory-maps its column from that file; func must then be a
+        module-level function so it can be sent to the worker. Otherwise the
+        columns are processed in the thread pool (or inline).
+
+        Args:
+            func: Function applied to each column
+            df: The pandas DataFrame holding the columns
+            columns: Columns to process
+            shared_path: Path of the frame's Arrow IPC copy, see DatasetRegistry.shared_path()
+            progress: Progress advanced by one step per completed column
+            step: Verb of the progress message, followed by the column name
+
+        Returns:
+            dict: Mapping of column to func's result; the first exception raised is re-raised
+        """
+        columns = list(columns)
+        if progress is not None:
+            progress.expect(len(columns))
+
+        def run_inline():
+            results = {}
+            for col in columns:
+                results[col] = func(df[col])
+                _advance(progress, f"{step} column {col}")
+            return results
+
+        if not self.parallel or len(columns) < 2:
+            return run_inline()
+
+        if self.kind == "process" and shared_path:
+            pool = self._processes()
+            futures = {pool.submit(_apply_to_shared_column, func, shared_path, col): col for col in columns}
+        elif threading.current_thread().name.startswith("analysis"):
+            # Already inside a pool thread: waiting on the same pool could deadlock it
+            return run_inline()
+        else:
+            pool = self._threads()
+            futures = {pool.submit(func, df[col]): col for col in columns}
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            _advance(progress, f"{step} column {futures[future]}")
+        return {col: results[col] for col in columns}
+
+    def shutdown(self) -> None:
+        """Shut the pools down; they are recreated on next use."""
+        with self._lock:
+            for pool in (self._thread_pool, self._process_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+            self._process_pool = None
+
+
+# Shared executor used by the privacy and quality analyses
+analysis_executor = AnalysisExecutor(
+    kind=os.getenv("ANALYSIS_POOL", "thread"),
+    max_workers=int(os.environ["ANALYSIS_WORKERS"]) if os.getenv("ANALYSIS_WORKERS") else None,
+)
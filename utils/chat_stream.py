@@ -0,0 +1,93 @@
+"""
+Server-sent events endpoint for the chat assistant of the Data Privacy Assist application.
+The browser posts a chat message and reads the reply as a text/event-stream: one "token"
+event per chunk produced by the model, then a single "done" event carrying the finished
+message with its citations, which the Dash layout renders in place of the streamed text.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Events of a streamed reply: ("token", text) pieces followed by ("done", message)
+ChatEvents = Iterator[Tuple[str, Any]]
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        str: The event in text/event-stream framing
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _parse_context(value: Any) -> Optional[Dict[str, Any]]:
+    """Parse analysis results posted as the JSON string kept in their dcc.Store."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def create_chat_stream_blueprint(stream_events: Callable[[str, List[Dict[str, Any]], Optional[Dict[str, Any]],
+                                                          Optional[Dict[str, Any]]], ChatEvents]) -> Blueprint:
+    """
+    Create the Flask route streaming chat replies.
+
+    POST   /chat/stream   {"input", "history", "privacy_context", "quality_context"}
+
+    The response is a text/event-stream of "token" events ({"text": ...}) and
+    a final "done" event with the message dict.
+
+    Args:
+        stream_events: Callable taking (user_input, chat_history, privacy_context,
+            quality_context) and yielding the events of the reply, e.g.
+            components.chatbot_component.stream_chat_message
+
+    Returns:
+        Blueprint: Blueprint to register on the Dash app's Flask server
+    """
+    blueprint = Blueprint("chat_stream", __name__, url_prefix="/chat")
+
+    @blueprint.route("/stream", methods=["POST"])
+    def stream_chat():
+        payload = request.get_json(silent=True) or {}
+        user_input = payload.get("input")
+        if not user_input:
+            return jsonify({"error": "Missing input"}), 400
+
+        events = stream_events(
+            user_input,
+            payload.get("history") or [],
+            _parse_context(payload.get("privacy_context")),
+            _parse_context(payload.get("quality_context")),
+        )
+
+        def generate():
+            for event, data in events:
+                yield format_sse(event, {"text": data} if event == "token" else data)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            # Keep proxies from buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return blueprint
@@ -0,0 +1,318 @@
+"""
+Chunked, resumable file uploads for the Data Privacy Assist application.
+Files are streamed in fixed-size chunks straight to UPLOAD_FOLDER and hashed as they
+arrive, instead of travelling base64-encoded through a dcc.Upload callback.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import secrets
+import threading
+from typing import Any, BinaryIO, Dict, Optional
+
+from flask import Blueprint, jsonify, request
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Largest chunk accepted per request; kept below MAX_CONTENT_LENGTH
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+
+# Unfinished uploads untouched for this long are deleted
+UPLOAD_EXPIRY_SECONDS = 24 * 60 * 60
+
+# Bytes read from the request stream at a time while writing a chunk
+STREAM_BUFFER_BYTES = 1024 * 1024
+
+SUPPORTED_EXTENSIONS = (".csv", ".xls", ".xlsx")
+
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+HANDLE_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(Exception):
+    """Raised when an upload request cannot be applied; carries the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400, received: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.received = received
+
+
+class ChunkedUploadManager:
+    """
+    Bookkeeping for uploads that arrive in sequential chunks.
+
+    Every upload is a partial file plus a small JSON description on disk, so an
+    interrupted upload can be resumed from the number of bytes already received,
+    even after a server restart. The SHA-256 of the content is updated as each
+    chunk is written; it becomes the dataset handle once the upload completes.
+    """
+
+    def __init__(self, upload_dir: str = "./uploads/incoming", chunk_size: int = UPLOAD_CHUNK_BYTES):
+        """
+        Initialize the upload manager.
+
+        Args:
+            upload_dir: Directory holding partial and completed uploads
+            chunk_size: Largest chunk accepted per request
+        """
+        self.upload_dir = upload_dir
+        self.chunk_size = chunk_size
+        self._hashers = {}
+        self._upload_locks = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(upload_dir, exist_ok=True)
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.json")
+
+    def completed_path(self, handle: str, filename: str) -> Optional[str]:
+        """
+        Return the path of a completed upload.
+
+        Args:
+            handle: Content hash returned by complete()
+            filename: Original file name, used for its extension
+
+        Returns:
+            str: Path of the uploaded file, or None if there is no such upload
+        """
+        extension = os.path.splitext(filename or "")[1].lower()
+        if not handle or not HANDLE_PATTERN.match(handle) or extension not in SUPPORTED_EXTENSIONS:
+            return None
+        path = os.path.join(self.upload_dir, f"{handle}{extension}")
+        return path if os.path.exists(path) else None
+
+    def _load_meta(self, upload_id: str) -> Dict[str, Any]:
+        if not upload_id or not UPLOAD_ID_PATTERN.match(upload_id):
+            raise UploadError(f"Invalid upload id: {upload_id!r}", 404)
+        try:
+            with open(self._meta_path(upload_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadError(f"Unknown upload: {upload_id}", 404)
+
+    def _upload_lock(self, upload_id: str) -> threading.Lock:
+        """Return the lock serializing writes to one upload, so different uploads proceed in parallel."""
+        with self._lock:
+            return self._upload_locks.setdefault(upload_id, threading.Lock())
+
+    def _hasher(self, upload_id: str):
+        """Return the running hash of an upload, rebuilding it from the partial file if needed."""
+        hasher = self._hashers.get(upload_id)
+        if hasher is None:
+            hasher = hashlib.sha256()
+            with open(self._part_path(upload_id), "rb") as f:
+                for block in iter(lambda: f.read(STREAM_BUFFER_BYTES), b""):
+                    hasher.update(block)
+            self._hashers[upload_id] = hasher
+        return hasher
+
+    def _expire_stale(self) -> None:
+        """Delete unfinished uploads that have not received data for a while."""
+        cutoff = time.time() - UPLOAD_EXPIRY_SECONDS
+        for name in os.listdir(self.upload_dir):
+            upload_id, extension = os.path.splitext(name)
+            if extension != ".json" or not UPLOAD_ID_PATTERN.match(upload_id):
+                continue
+            part_path = self._part_path(upload_id)
+            last_activity = os.path.getmtime(part_path) if os.path.exists(part_path) else 0
+            if last_activity < cutoff:
+                for path in (part_path, self._meta_path(upload_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._hashers.pop(upload_id, None)
+                self._upload_locks.pop(upload_id, None)
+                logger.info(f"Expired unfinished upload {upload_id}")
+
+    def start(self, filename: str, size: int) -> Dict[str, Any]:
+        """
+        Start a new upload.
+
+        Args:
+            filename: Original file name
+            size: Total size of the file in bytes
+
+        Returns:
+            dict: Upload id, accepted chunk size and bytes received so far
+
+        Raises:
+            UploadError: If the file type or size is not supported
+        """
+        if not str(filename).lower().endswith(SUPPORTED_EXTENSIONS):
+            raise UploadError("Only CSV and Excel files are supported.", 415)
+        if not isinstance(size, int) or size < 0:
+            raise UploadError(f"Invalid file size: {size!r}")
+
+        upload_id = secrets.token_hex(16)
+        with self._lock:
+            self._expire_stale()
+            open(self._part_path(upload_id), "wb").close()
+            with open(self._meta_path(upload_id), "w") as f:
+                json.dump({"filename": os.path.basename(filename), "size": size}, f)
+            self._hashers[upload_id] = hashlib.sha256()
+
+        logger.info(f"Started upload {upload_id} for {filename} ({size} bytes)")
+        return {"upload_id": upload_id, "chunk_size": self.chunk_size, "received": 0}
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Report how much of an upload has been received, so a client can resume it.
+
+        Args:
+            upload_id: Id returned by start()
+
+        Returns:
+            dict: Upload id, file name, total size and bytes received so far
+        """
+        meta = self._load_meta(upload_id)
+        received = os.path.getsize(self._part_path(upload_id))
+        return {"upload_id": upload_id, "filename": meta["filename"], "size": meta["size"], "received": received}
+
+    def append(self, upload_id: str, offset: int, stream: BinaryIO, length: Optional[int]) -> int:
+        """
+        Append a chunk to an upload.
+
+        Chunks must arrive in order: the offset has to equal the number of bytes
+        already received, otherwise the client is told where to resume.
+
+        Args:
+            upload_id: Id returned by start()
+            offset: Position of the chunk in the file
+            stream: Readable stream holding the chunk
+            length: Declared chunk length in bytes
+
+        Returns:
+            int: Bytes received so far
+
+        Raises:
+            UploadError: If the chunk is out of order, too large or overruns the file
+        """
+        meta = self._load_meta(upload_id)
+        part_path = self._part_path(upload_id)
+
+        with self._upload_lock(upload_id):
+            received = os.path.getsize(part_path)
+            if offset != received:
+                raise UploadError(f"Expected offset {received}, got {offset}", 409, received)
+            if length is None or length > self.chunk_size:
+                raise UploadError(f"Chunks must declare a length of at most {self.chunk_size} bytes", 413, received)
+            if received + length > meta["size"]:
+                raise UploadError("Chunk extends past the end of the file", 416, received)
+
+            hasher = self._hasher(upload_id)
+            written = 0
+            with open(part_path, "ab") as f:
+                while written < length:
+                    block = stream.read(min(STREAM_BUFFER_BYTES, length - written))
+                    if not block:
+                        break
+                    f.write(block)
+                    hasher.update(block)
+                    written += len(block)
+
+            if written < length:
+                # Connection dropped mid-chunk: roll back so the chunk can be sent again
+                with open(part_path, "ab") as f:
+                    f.truncate(received)
+                self._hashers.pop(upload_id, None)
+                raise UploadError(f"Chunk ended after {written} of {length} bytes", 400, received)
+
+        return received + written
+
+    def complete(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Finish an upload and move it under its content hash.
+
+        Args:
+            upload_id: Id returned by start()
+
+        Returns:
+            dict: Dataset handle (SHA-256 of the content), file name and size
+
+        Raises:
+            UploadError: If not all bytes have been received
+        """
+        meta = self._load_meta(upload_id)
+        part_path = self._part_path(upload_id)
+
+        with self._upload_lock(upload_id):
+            received = os.path.getsize(part_path)
+            if received != meta["size"]:
+                raise UploadError(f"Upload incomplete: {received} of {meta['size']} bytes received", 409, received)
+
+            handle = self._hasher(upload_id).hexdigest()
+            extension = os.path.splitext(meta["filename"])[1].lower()
+            os.replace(part_path, os.path.join(self.upload_dir, f"{handle}{extension}"))
+            os.remove(self._meta_path(upload_id))
+            self._hashers.pop(upload_id, None)
+
+        with self._lock:
+            self._upload_locks.pop(upload_id, None)
+
+        logger.info(f"Completed upload {upload_id} as {handle[:12]}")
+        return {"handle": handle, "filename": meta["filename"], "size": meta["size"]}
+
+
+def create_upload_blueprint(manager: ChunkedUploadManager) -> Blueprint:
+    """
+    Create the Flask routes for chunked uploads.
+
+    POST   /uploads/chunked                 start an upload ({"filename", "size"})
+    GET    /uploads/chunked/<id>            bytes received so far, for resuming
+    PUT    /uploads/chunked/<id>?offset=N   append the raw chunk in the request body
+    POST   /uploads/chunked/<id>/complete   finish and return the dataset handle
+
+    Args:
+        manager: Upload manager the routes write to
+
+    Returns:
+        Blueprint: Blueprint to register on the Dash app's Flask server
+    """
+    blueprint = Blueprint("chunked_upload", __name__, url_prefix="/uploads/chunked")
+
+    @blueprint.errorhandler(UploadError)
+    def handle_upload_error(error):
+        body = {"error": str(error)}
+        if error.received is not None:
+            body["received"] = error.received
+        return jsonify(body), error.status
+
+    @blueprint.route("", methods=["POST"])
+    def start_upload():
+        payload = request.get_json(silent=True) or {}
+        return jsonify(manager.start(payload.get("filename", ""), payload.get("size")))
+
+    @blueprint.route("/<upload_id>", methods=["GET"])
+    def upload_status(upload_id):
+        return jsonify(manager.status(upload_id))
+
+    @blueprint.route("/<upload_id>", methods=["PUT"])
+    def upload_chunk(upload_id):
+        offset = request.args.get("offset", type=int)
+        if offset is None:
+            raise UploadError("Missing offset")
+        received = manager.append(upload_id, offset, request.stream, request.content_length)
+        return jsonify({"upload_id": upload_id, "received": received})
+
+    @blueprint.route("/<upload_id>/complete", methods=["POST"])
+    def complete_upload(upload_id):
+        return jsonify(manager.complete(upload_id))
+
+    return blueprint
+
+
+# Shared upload manager used by the Flask routes and the Dash callbacks
+upload_manager = ChunkedUploadManager(
+    upload_dir=os.path.join(os.getenv("UPLOAD_FOLDER", "./uploads"), "incoming"),
+)
@@ -0,0 +1,209 @@
+"""
+Column profiling module for the Data Privacy Assist application.
+Computes a single-pass summary of every column (factorized codes, value counts,
+null mask and inferred type) that is shared by the privacy and quality analyzers.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Largest key space packed into int64 codes before partial keys are re-densified
+MAX_PACKED_KEY_SPACE = 2 ** 62
+
+
+class ColumnProfile:
+    """
+    Single-pass profile of a pandas Series.
+
+    The column is factorized once; every metric that previously called
+    value_counts(), nunique(), isna() or dropna() reads from the arrays below.
+
+    Attributes:
+        name: Column name
+        dtype: Original pandas dtype
+        length: Number of rows, including missing values
+        codes: Factorized codes, -1 for missing values
+        uniques: Distinct non-null values, aligned with the codes
+        counts: Number of occurrences of each distinct value
+        null_mask: Boolean mask of missing values
+        null_count: Number of missing values
+        non_null_count: Number of present values
+        n_unique: Number of distinct non-null values
+        inferred_type: One of "integer", "float", "datetime", "boolean" or "string"
+    """
+
+    def __init__(self, column: pd.Series):
+        """
+        Profile a column.
+
+        Args:
+            column: The pandas Series to profile
+        """
+        self.name = column.name
+        self.dtype = column.dtype
+        self.length = len(column)
+
+        # Dtype checks are evaluated on the original column so downstream
+        # metrics keep exactly the same type semantics as before
+        self.is_numeric = pd.api.types.is_numeric_dtype(column)
+        self.is_datetime = pd.api.types.is_datetime64_any_dtype(column)
+        self.is_naive_datetime = pd.api.types.is_datetime64_dtype(column)
+        self.is_bool = pd.api.types.is_bool_dtype(column)
+        self.is_string = pd.api.types.is_string_dtype(column)
+
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        self.codes = codes
+        self.uniques = uniques
+        self.null_mask = codes < 0
+        self.null_count = int(self.null_mask.sum())
+        self.non_null_count = self.length - self.null_count
+        self.n_unique = len(uniques)
+        self.counts = np.bincount(codes[~self.null_mask], minlength=self.n_unique)
+
+        self.inferred_type = self._infer_type()
+
+    def _infer_type(self) -> str:
+        """Infer the logical type of the column from its distinct values."""
+        if self.is_numeric:
+            if self.integral_mask().all():
+                return "integer"
+            return "float"
+        if self.is_datetime:
+            return "datetime"
+        if self.is_bool:
+            return "boolean"
+        return "string"
+
+    def numeric_uniques(self) -> np.ndarray:
+        """Return the distinct values as a float array (numeric columns only)."""
+        return np.asarray(self.uniques, dtype="float64")
+
+    def integral_mask(self) -> np.ndarray:
+        """Return a mask of the distinct values that have no fractional part."""
+        return self.numeric_uniques() % 1 == 0
+
+    def string_mask(self, predicate) -> np.ndarray:
+        """
+        Evaluate a string predicate over the distinct values.
+
+        Non-string values never satisfy the predicate, matching the NaN results
+        the pandas .str accessor produces for them.
+
+        Args:
+            predicate: Callable applied to each distinct string value
+
+        Returns:
+            np.ndarray: Boolean mask aligned with the distinct values
+        """
+        return np.fromiter(
+            (isinstance(value, str) and bool(predicate(value)) for value in self.uniques),
+            dtype=bool,
+            count=self.n_unique,
+        )
+
+    def weighted_count(self, mask: np.ndarray) -> int:
+        """Return the number of rows whose value is selected by a mask over the distinct values."""
+        return int(self.counts[mask].sum())
+
+    @property
+    def missing_ratio(self) -> float:
+        """Fraction of missing values in the column."""
+        return self.null_count / self.length if self.length > 0 else 0.0
+
+
+def as_profile(column: Union[pd.Series, ColumnProfile]) -> ColumnProfile:
+    """
+    Return the profile of a column, computing it only if needed.
+
+    Args:
+        column: A pandas Series or an already computed ColumnProfile
+
+    Returns:
+        ColumnProfile: The column profile
+    """
+    if isinstance(column, ColumnProfile):
+        return column
+    return ColumnProfile(column)
+
+
+def build_column_profiles(df: pd.DataFrame,
+                          profiles: Optional[Dict[str, ColumnProfile]] = None) -> Dict[str, ColumnProfile]:
+    """
+    Profile every column of a dataframe.
+
+    Args:
+        df: The pandas DataFrame to profile
+        profiles: Optional profiles computed earlier; returned unchanged if given
+
+    Returns:
+        dict: Mapping of column name to ColumnProfile
+    """
+    if profiles is not None:
+        return profiles
+
+    profiles = {col: ColumnProfile(df[col]) for col in df.columns}
+    logger.debug(f"Profiled {len(profiles)} columns over {len(df)} rows")
+    return profiles
+
+
+def combine_column_codes(profiles: List[ColumnProfile]) -> Tuple[np.ndarray, int]:
+    """
+    Pack the factorized codes of several columns into a single int64 key per row.
+
+    Rows share a key exactly when they agree on every column; missing values
+    form a category of their own in each column. See combine_codes().
+
+    Args:
+        profiles: Profiles of the columns to combine, all of the same length
+
+    Returns:
+        tuple: (keys, key_space) where every key lies in [0, key_space)
+    """
+    if not profiles:
+        raise ValueError("At least one column profile is required")
+    return combine_codes([profile.codes for profile in profiles], [profile.n_unique for profile in profiles])
+
+
+def combine_codes(codes: List[np.ndarray], cardinalities: List[int]) -> Tuple[np.ndarray, int]:
+    """
+    Pack several arrays of factorized codes into a single int64 key per row.
+
+    Codes range over [-1, cardinality), -1 being the missing value. Whenever the
+    next array would overflow the int64 key space, the partial keys are
+    re-densified with pd.factorize, so any number of arrays can be combined.
+    Once every row has a key of its own the remaining arrays cannot change the
+    grouping and are skipped.
+
+    Args:
+        codes: Code arrays, all of the same length
+        cardinalities: Number of distinct non-missing codes of each array
+
+    Returns:
+        tuple: (keys, key_space) where every key lies in [0, key_space)
+    """
+    if not codes:
+        raise ValueError("At least one code array is required")
+
+    keys = np.zeros(len(codes[0]), dtype=np.int64)
+    key_space = 1
+    for column_codes, cardinality in zip(codes, cardinalities):
+        # Shift codes by one so missing values (-1) become category 0
+        radix = cardinality + 1
+        if key_space * radix > MAX_PACKED_KEY_SPACE:
+            dense_codes, uniques = pd.factorize(keys)
+            keys = dense_codes.astype(np.int64, copy=False)
+            key_space = len(uniques)
+            if key_space == len(keys):
+                break
+        keys *= radix
+        keys += column_codes
+        keys += 1
+        key_space *= radix
+    return keys, key_space
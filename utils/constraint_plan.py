@@ -0,0 +1,766 @@
+"""
+Custom constraint evaluation for the Data Privacy Assist application.
+Compiles the constraints defined in the UI into a plan grouped by column, so each
+constrained column is profiled once and all of its predicates are evaluated over
+the distinct values, and records a per-row violation bitmap for every constraint.
+Cross-column constraints (comparisons, conditional not-null, composite uniqueness)
+and foreign keys into an uploaded reference table are built on factorized key tuples.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import operator
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.column_profile import ColumnProfile, as_profile, combine_codes, combine_column_codes
+from utils.dataset_store import dataset_registry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Format used by date_format constraints that do not specify one
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+
+# Outcome of one constraint: (passed, pass_rate, error, violation mask or None, reported value)
+CheckOutcome = Tuple[bool, float, str, Optional[np.ndarray], Any]
+
+
+def date_format_mask(values: pd.Index, date_format: str) -> np.ndarray:
+    """
+    Check which values parse with a strptime format.
+
+    String values are parsed in a single vectorized pd.to_datetime call with
+    errors="coerce"; other values (e.g. numbers in an object column) are parsed
+    one by one, as the original per-value check did.
+
+    Args:
+        values: Distinct non-null values of a column
+        date_format: strptime format
+
+    Returns:
+        np.ndarray: Boolean mask aligned with the values
+    """
+    is_string = np.fromiter((isinstance(val, str) for val in values), dtype=bool, count=len(values))
+    valid = np.zeros(len(values), dtype=bool)
+
+    if is_string.any():
+        strings = pd.Index(values[is_string], dtype=object)
+        try:
+            # utc=True so values with different %z offsets parse into one index
+            parsed = pd.to_datetime(strings, format=date_format, errors="coerce", utc=True)
+            valid[is_string] = np.asarray(parsed.notna())
+        except (ValueError, TypeError):
+            # An invalid format string matches no value
+            pass
+
+    for position in np.flatnonzero(~is_string):
+        try:
+            valid[position] = pd.notna(pd.to_datetime(values[position], format=date_format))
+        except Exception:
+            pass
+
+    return valid
+
+
+def count_date_format_matches(column: pd.Series, date_format: str) -> int:
+    """
+    Count the non-null values of a column that parse with a strptime format.
+
+    Each distinct value is parsed once and weighted by its count.
+
+    Args:
+        column: The pandas Series (or its ColumnProfile) to check
+        date_format: strptime format
+
+    Returns:
+        int: Number of matching values
+    """
+    profile = as_profile(column)
+    return profile.weighted_count(date_format_mask(pd.Index(profile.uniques), date_format))
+
+
+def _row_mask(profile: ColumnProfile, unique_mask: np.ndarray) -> np.ndarray:
+    """Expand a mask over the distinct values to the rows; missing values are never selected."""
+    rows = unique_mask[profile.codes] if profile.n_unique else np.zeros(profile.length, dtype=bool)
+    rows[profile.null_mask] = False
+    return rows
+
+
+def _rate_outcome(profile: ColumnProfile, valid: np.ndarray, message: str, value: Any) -> CheckOutcome:
+    """Build the outcome of a per-value check from the mask of valid distinct values."""
+    valid_count = profile.weighted_count(valid)
+    total_count = profile.non_null_count
+    pass_rate = valid_count / total_count if total_count > 0 else 1.0
+    passed = pass_rate == 1.0
+    error = f"{total_count - valid_count} {message}" if not passed else ""
+    return passed, pass_rate, error, _row_mask(profile, ~valid), value
+
+
+def _check_not_null(profile: ColumnProfile, value: Any) -> CheckOutcome:
+    total_count = profile.length
+    pass_rate = profile.non_null_count / total_count if total_count > 0 else 1.0
+    passed = pass_rate == 1.0
+    error = f"{profile.null_count} null values found" if not passed else ""
+    return passed, pass_rate, error, profile.null_mask, value
+
+
+def _check_unique(profile: ColumnProfile, value: Any) -> CheckOutcome:
+    duplicate_count = profile.non_null_count - profile.n_unique
+    passed = duplicate_count == 0
+    if passed:
+        violations = np.zeros(profile.length, dtype=bool)
+    else:
+        # Every occurrence of a value after its first one
+        violations = pd.Series(profile.codes).duplicated(keep="first").to_numpy() & ~profile.null_mask
+    error = f"{duplicate_count} duplicate values found" if not passed else ""
+    return passed, 1.0 if passed else 0.0, error, violations, value
+
+
+def _bound_check(kind: str, compare: Callable[[np.ndarray, float], np.ndarray], message: str):
+    """Create the check of a min_value or max_value constraint."""
+    def check(profile: ColumnProfile, value: Any) -> CheckOutcome:
+        try:
+            bound = float(value) if value else 0
+        except (TypeError, ValueError):
+            return False, 0.0, f"Invalid {kind} value", None, value
+        if not profile.is_numeric:
+            return False, 0.0, "Column is not numeric", None, value
+        return _rate_outcome(profile, compare(profile.numeric_uniques(), bound), message, value)
+    return check
+
+
+def _check_regex(profile: ColumnProfile, value: Any) -> CheckOutcome:
+    if not value:
+        return False, 0.0, "No regex pattern provided", None, value
+    try:
+        pattern = re.compile(value)
+    except re.error:
+        return False, 0.0, "Invalid regex pattern", None, value
+    if not profile.is_string:
+        return False, 0.0, "Column is not string type", None, value
+    valid = np.fromiter((pattern.match(str(val)) is not None for val in profile.uniques),
+                        dtype=bool, count=profile.n_unique)
+    return _rate_outcome(profile, valid, "values don't match pattern", value)
+
+
+def _check_value_in_list(profile: ColumnProfile, value: Any) -> CheckOutcome:
+    if not value:
+        return False, 0.0, "No list of values provided", None, value
+    try:
+        # Parse comma-separated list, converted to numbers if the column is numeric
+        allowed_values = [v.strip() for v in value.split(',')]
+        if profile.is_numeric:
+            allowed_values = [float(v) for v in allowed_values]
+    except (AttributeError, ValueError):
+        return False, 0.0, "Invalid list format or type mismatch", None, value
+    valid = np.asarray(pd.Index(profile.uniques).isin(allowed_values), dtype=bool)
+    return _rate_outcome(profile, valid, "values not in allowed list", value)
+
+
+def _check_date_format(profile: ColumnProfile, value: Any) -> CheckOutcome:
+    value = value or DEFAULT_DATE_FORMAT
+    if profile.is_datetime:
+        # If already datetime, all values are valid
+        return True, 1.0, "", np.zeros(profile.length, dtype=bool), value
+    try:
+        valid = date_format_mask(pd.Index(profile.uniques), value)
+    except Exception:
+        return False, 0.0, "Invalid date format", None, value
+    return _rate_outcome(profile, valid, "values don't match date format", value)
+
+
+# Check of each constraint type, applied to the profile of the constrained column
+CONSTRAINT_CHECKS: Dict[str, Callable[[ColumnProfile, Any], CheckOutcome]] = {
+    "not_null": _check_not_null,
+    "unique": _check_unique,
+    "min_value": _bound_check("minimum", np.greater_equal, "values below minimum"),
+    "max_value": _bound_check("maximum", np.less_equal, "values above maximum"),
+    "regex": _check_regex,
+    "value_in_list": _check_value_in_list,
+    "date_format": _check_date_format,
+}
+
+
+
+class KeyIndex:
+    """
+    Hash index over the distinct key tuples of a table.
+
+    Each key column is factorized once (through its profile) and only the
+    distinct tuples of codes are kept. Probing translates the distinct values
+    of the probe columns into the index's codes with one hash lookup per
+    distinct value, so a foreign key check is a single hash join over codes
+    rather than a comparison of row values.
+    """
+
+    def __init__(self, profiles: List[ColumnProfile]):
+        """
+        Build the index.
+
+        Args:
+            profiles: Profiles of the key columns of the indexed table; rows with a missing part are skipped
+        """
+        self.uniques = [pd.Index(profile.uniques) for profile in profiles]
+        self.cardinalities = [profile.n_unique for profile in profiles]
+        complete = ~np.logical_or.reduce([profile.null_mask for profile in profiles])
+        tuples = pd.DataFrame({i: profile.codes[complete] for i, profile in enumerate(profiles)}).drop_duplicates()
+        self.codes = [tuples[i].to_numpy(dtype=np.int64) for i in range(len(profiles))]
+
+    def lookup(self, profiles: List[ColumnProfile]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look the key tuples of another table up in the index.
+
+        Args:
+            profiles: Profiles of the probe columns, aligned with the indexed key columns
+
+        Returns:
+            tuple: (complete, found) row masks; complete rows have no missing key part,
+            found rows are complete and their key tuple exists in the index
+        """
+        complete = ~np.logical_or.reduce([profile.null_mask for profile in profiles])
+        found = complete.copy()
+        probe_codes = []
+        for uniques, profile in zip(self.uniques, profiles):
+            mapping = np.append(uniques.get_indexer(pd.Index(profile.uniques)), -1)
+            # Missing values (code -1) pick the trailing -1
+            codes = mapping[profile.codes]
+            found &= codes >= 0
+            probe_codes.append(codes)
+
+        if len(probe_codes) > 1 and found.any():
+            # Pack the indexed and probed tuples together so both share one key space
+            n_indexed = len(self.codes[0])
+            keys, _ = combine_codes(
+                [np.concatenate([indexed, probed[found]]) for indexed, probed in zip(self.codes, probe_codes)],
+                self.cardinalities,
+            )
+            found[found] = pd.Series(keys[n_indexed:]).isin(keys[:n_indexed]).to_numpy()
+        return complete, found
+
+
+class ConstraintContext:
+    """
+    Dataset, column profiles and reference table a plan is evaluated against.
+
+    Profiles of the dataset and of the reference table are computed on first
+    use and shared by every constraint, as are the key indexes of the reference
+    table.
+    """
+
+    def __init__(self, df: pd.DataFrame, profiles: Optional[Dict[str, ColumnProfile]] = None,
+                 reference: Optional[pd.DataFrame] = None):
+        self.df = df
+        self.reference = reference
+        self._profiles = dict(profiles or {})
+        self._reference_profiles: Dict[Any, ColumnProfile] = {}
+        self._key_indexes: Dict[Tuple, KeyIndex] = {}
+
+    def profile(self, column: Any) -> ColumnProfile:
+        """Return the profile of a dataset column."""
+        if column not in self._profiles:
+            self._profiles[column] = ColumnProfile(self.df[column])
+        return self._profiles[column]
+
+    def reference_profile(self, column: Any) -> ColumnProfile:
+        """Return the profile of a reference table column."""
+        if column not in self._reference_profiles:
+            self._reference_profiles[column] = ColumnProfile(self.reference[column])
+        return self._reference_profiles[column]
+
+    def key_index(self, columns: Tuple) -> KeyIndex:
+        """Return the hash index over the given key columns of the reference table."""
+        if columns not in self._key_indexes:
+            self._key_indexes[columns] = KeyIndex([self.reference_profile(col) for col in columns])
+        return self._key_indexes[columns]
+
+
+def _split_columns(value: Any) -> List[str]:
+    """Split a comma-separated list of column names."""
+    return [part.strip() for part in str(value or "").split(",") if part.strip()]
+
+
+def _rows_outcome(total_count: int, violations: np.ndarray, message: str, value: Any) -> CheckOutcome:
+    """Build the outcome of a row-level check from its violation mask."""
+    violation_count = int(violations.sum())
+    pass_rate = (total_count - violation_count) / total_count if total_count > 0 else 1.0
+    passed = violation_count == 0
+    error = f"{violation_count} {message}" if not passed else ""
+    return passed, pass_rate, error, violations, value
+
+
+# value: "<operator> <column>", e.g. "< end_date"
+_COMPARISON_PATTERN = re.compile(r"^\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$")
+COMPARISON_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _check_column_comparison(context: ConstraintContext, profile: ColumnProfile, value: Any) -> CheckOutcome:
+    match = _COMPARISON_PATTERN.match(str(value or ""))
+    if not match:
+        return False, 0.0, "Expected an operator and a column, e.g. '< end_date'", None, value
+    symbol, other = match.groups()
+    if other not in context.df.columns:
+        return False, 0.0, f"Column not found in dataset: {other}", None, value
+
+    # Rows where either side is missing are not checked
+    present = ~profile.null_mask & ~context.profile(other).null_mask
+    try:
+        holds = COMPARISON_OPERATORS[symbol](context.df[profile.name], context.df[other])
+        holds = holds.fillna(False).to_numpy(dtype=bool)
+    except TypeError:
+        return False, 0.0, "Columns cannot be compared", None, value
+    return _rows_outcome(int(present.sum()), present & ~holds,
+                         f"rows where {profile.name} {symbol} {other} does not hold", value)
+
+
+def _check_conditional_not_null(context: ConstraintContext, profile: ColumnProfile, value: Any) -> CheckOutcome:
+    # value: "column" (condition: column is present) or "column=value"
+    condition_column, has_value, condition_value = str(value or "").partition("=")
+    condition_column = condition_column.strip()
+    if not condition_column:
+        return False, 0.0, "No condition column provided", None, value
+    if condition_column not in context.df.columns:
+        return False, 0.0, f"Column not found in dataset: {condition_column}", None, value
+
+    condition_profile = context.profile(condition_column)
+    if has_value:
+        condition_value = condition_value.strip()
+        if condition_profile.is_numeric:
+            try:
+                matches = condition_profile.numeric_uniques() == float(condition_value)
+            except ValueError:
+                matches = np.zeros(condition_profile.n_unique, dtype=bool)
+        else:
+            matches = np.fromiter((str(val) == condition_value for val in condition_profile.uniques),
+                                  dtype=bool, count=condition_profile.n_unique)
+        condition = _row_mask(condition_profile, matches)
+    else:
+        condition = ~condition_profile.null_mask
+    return _rows_outcome(int(condition.sum()), condition & profile.null_mask,
+                         "null values where the condition holds", value)
+
+
+def _check_composite_unique(context: ConstraintContext, profile: ColumnProfile, value: Any) -> CheckOutcome:
+    # value: the other key columns, comma-separated
+    others = _split_columns(value)
+    if not others:
+        return False, 0.0, "No additional key columns provided", None, value
+    missing = [col for col in others if col not in context.df.columns]
+    if missing:
+        return False, 0.0, f"Column not found in dataset: {', '.join(missing)}", None, value
+
+    profiles = [profile] + [context.profile(col) for col in others]
+    # Rows with a missing key part are not checked, as for single-column uniqueness
+    complete = ~np.logical_or.reduce([key_profile.null_mask for key_profile in profiles])
+    keys, _ = combine_column_codes(profiles)
+    violations = pd.Series(keys).duplicated(keep="first").to_numpy() & complete
+    duplicate_count = int(violations.sum())
+    passed = duplicate_count == 0
+    error = f"{duplicate_count} duplicate key combinations found" if not passed else ""
+    return passed, 1.0 if passed else 0.0, error, violations, value
+
+
+def foreign_key_columns(column: Any, value: Any) -> List[Tuple[Any, str]]:
+    """
+    Parse the key columns of a foreign_key constraint.
+
+    The value names the referenced column of the constrained column (the same
+    name if empty), optionally followed by further "column=reference_column"
+    pairs for composite keys, e.g. "id" or "country_code, city=city_name".
+
+    Args:
+        column: The constrained column
+        value: The constraint value
+
+    Returns:
+        list: (column, reference column) pairs
+    """
+    parts = _split_columns(value) or [column]
+    pairs = [(column, parts[0])]
+    for part in parts[1:]:
+        local, _, referenced = part.partition("=")
+        pairs.append((local.strip(), referenced.strip() or local.strip()))
+    return pairs
+
+
+def _check_foreign_key(context: ConstraintContext, profile: ColumnProfile, value: Any) -> CheckOutcome:
+    if context.reference is None:
+        return False, 0.0, "No reference table uploaded", None, value
+    pairs = foreign_key_columns(profile.name, value)
+    missing = [local for local, _ in pairs if local not in context.df.columns]
+    if missing:
+        return False, 0.0, f"Column not found in dataset: {', '.join(missing)}", None, value
+    missing = [referenced for _, referenced in pairs if referenced not in context.reference.columns]
+    if missing:
+        return False, 0.0, f"Column not found in reference table: {', '.join(missing)}", None, value
+
+    index = context.key_index(tuple(referenced for _, referenced in pairs))
+    complete, found = index.lookup([context.profile(local) for local, _ in pairs])
+    return _rows_outcome(int(complete.sum()), complete & ~found, "values not found in reference table", value)
+
+
+# Checks that also read other columns or the reference table
+CROSS_COLUMN_CHECKS: Dict[str, Callable[[ConstraintContext, ColumnProfile, Any], CheckOutcome]] = {
+    "column_comparison": _check_column_comparison,
+    "conditional_not_null": _check_conditional_not_null,
+    "composite_unique": _check_composite_unique,
+    "foreign_key": _check_foreign_key,
+}
+
+class ConstraintOutcome:
+    """
+    Result of one constraint on one dataset.
+
+    Attributes:
+        passed: Whether every checked row satisfies the constraint
+        pass_rate: Fraction of the checked rows (or values) that satisfy it
+        error: Message describing the violations or why the constraint could not be checked
+        value: Constraint value as reported, e.g. with the default date format filled in
+        violations: Bitmap (np.packbits) of the violating rows, None if the constraint was not checked
+        violation_count: Number of violating rows
+    """
+
+    def __init__(self, passed: bool, pass_rate: float, error: str, value: Any,
+                 violations: Optional[np.ndarray], violation_count: int):
+        self.passed = passed
+        self.pass_rate = pass_rate
+        self.error = error
+        self.value = value
+        self.violations = violations
+        self.violation_count = violation_count
+
+    @classmethod
+    def from_check(cls, outcome: CheckOutcome) -> "ConstraintOutcome":
+        """Build the outcome from the tuple returned by a check, packing its violation mask."""
+        passed, pass_rate, error, mask, value = outcome
+        if mask is None:
+            return cls(bool(passed), float(pass_rate), error, value, None, 0)
+        return cls(bool(passed), float(pass_rate), error, value, np.packbits(mask), int(mask.sum()))
+
+
+class ConstraintEvaluation:
+    """
+    Results of a constraint plan on one dataset.
+
+    Attributes:
+        results: Summary in the format of the quality results' "custom_constraints" entry
+        violations: Per-constraint bitmaps (np.packbits) of the violating rows, in the
+            order of the constraints; None where the constraint could not be checked
+        n_rows: Number of rows of the dataset
+    """
+
+    def __init__(self, results: Dict[str, Any], violations: List[Optional[np.ndarray]], n_rows: int):
+        self.results = results
+        self.violations = violations
+        self.n_rows = n_rows
+
+    def violation_mask(self, index: int) -> Optional[np.ndarray]:
+        """
+        Unpack the violation bitmap of a constraint.
+
+        Args:
+            index: Position of the constraint in the plan
+
+        Returns:
+            np.ndarray: Boolean mask of the violating rows, or None if the constraint was not checked
+        """
+        packed = self.violations[index]
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+    def violating_rows(self, index: int, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Return the positions of the rows that violate a constraint.
+
+        Args:
+            index: Position of the constraint in the plan
+            limit: Maximum number of positions to return
+
+        Returns:
+            np.ndarray: Row positions, empty if the constraint was not checked
+        """
+        mask = self.violation_mask(index)
+        if mask is None:
+            return np.array([], dtype=np.int64)
+        return np.flatnonzero(mask)[:limit]
+
+
+class ConstraintPlan:
+    """
+    Compiled list of custom constraints.
+
+    Constraints are grouped by column: each constrained column is profiled (or
+    its shared profile reused) once, so its null mask, non-null count and
+    distinct values serve every constraint on it, and each predicate is
+    evaluated once per distinct value and expanded to the rows by the codes.
+    Cross-column constraints read the other columns' profiles from the same
+    shared context; foreign keys are checked against hash indexes of the
+    reference table's key tuples.
+    """
+
+    def __init__(self, constraints: Optional[List[Dict[str, Any]]]):
+        """
+        Compile a list of constraints.
+
+        Args:
+            constraints: Constraints as stored by the UI, dicts with "column", "type" and "value"
+        """
+        self.constraints = list(constraints or [])
+        self.columns: Dict[Any, List[int]] = {}
+        for index, constraint in enumerate(self.constraints):
+            self.columns.setdefault(constraint.get("column"), []).append(index)
+
+    def check(self, df: pd.DataFrame, profiles: Optional[Dict[str, ColumnProfile]] = None,
+              reference: Optional[pd.DataFrame] = None) -> List[ConstraintOutcome]:
+        """
+        Check every constraint on a dataset.
+
+        Args:
+            df: The pandas DataFrame to check
+            profiles: Optional column profiles computed earlier
+            reference: Optional reference table for foreign_key constraints
+
+        Returns:
+            list: One ConstraintOutcome per constraint, in order
+        """
+        context = ConstraintContext(df, profiles, reference)
+        outcomes: List[ConstraintOutcome] = [None] * len(self.constraints)
+
+        for column, indices in self.columns.items():
+            if column not in df.columns:
+                for index in indices:
+                    outcomes[index] = ConstraintOutcome.from_check(
+                        (False, 0.0, "Column not found in dataset", None, self.constraints[index].get("value")))
+                continue
+
+            profile = context.profile(column)
+            for index in indices:
+                constraint = self.constraints[index]
+                constraint_type = constraint.get("type")
+                if constraint_type in CONSTRAINT_CHECKS:
+                    outcome = CONSTRAINT_CHECKS[constraint_type](profile, constraint.get("value"))
+                elif constraint_type in CROSS_COLUMN_CHECKS:
+                    outcome = CROSS_COLUMN_CHECKS[constraint_type](context, profile, constraint.get("value"))
+                else:
+                    outcome = (False, 0.0, "Unknown constraint type", None, constraint.get("value"))
+                outcomes[index] = ConstraintOutcome.from_check(outcome)
+        return outcomes
+
+    def evaluate(self, df: pd.DataFrame, profiles: Optional[Dict[str, ColumnProfile]] = None,
+                 reference: Optional[pd.DataFrame] = None) -> ConstraintEvaluation:
+        """
+        Evaluate every constraint on a dataset.
+
+        Args:
+            df: The pandas DataFrame to check
+            profiles: Optional column profiles computed earlier
+            reference: Optional reference table for foreign_key constraints
+
+        Returns:
+            ConstraintEvaluation: Results and violation bitmaps
+        """
+        return assemble_evaluation(self.constraints, self.check(df, profiles, reference), len(df))
+
+
+def assemble_evaluation(constraints: List[Dict[str, Any]], outcomes: List[ConstraintOutcome],
+                        n_rows: int) -> ConstraintEvaluation:
+    """
+    Combine the outcomes of individual constraints into the results of a plan.
+
+    Args:
+        constraints: The constraints, in order
+        outcomes: Their outcomes, fresh or cached
+        n_rows: Number of rows of the dataset
+
+    Returns:
+        ConstraintEvaluation: Results with the overall score, and violation bitmaps
+    """
+    results = {
+        "constraints": [],
+        "overall_score": 1.0,
+        "pass_count": 0,
+        "fail_count": 0,
+        "total_count": len(constraints)
+    }
+    foreign_keys = []
+    for constraint, outcome in zip(constraints, outcomes):
+        results["constraints"].append({
+            "column": constraint.get("column"),
+            "type": constraint.get("type"),
+            "value": outcome.value,
+            "passed": outcome.passed,
+            "error": outcome.error,
+            "pass_rate": outcome.pass_rate
+        })
+        results["pass_count" if outcome.passed else "fail_count"] += 1
+
+        if constraint.get("type") == "foreign_key" and outcome.violations is not None:
+            pairs = foreign_key_columns(constraint.get("column"), outcome.value)
+            foreign_keys.append({
+                "columns": [local for local, _ in pairs],
+                "reference_columns": [referenced for _, referenced in pairs],
+                "match_rate": outcome.pass_rate,
+                "orphan_count": outcome.violation_count
+            })
+
+    results["overall_score"] = results["pass_count"] / results["total_count"] if results["total_count"] > 0 else 1.0
+    if foreign_keys:
+        results["foreign_keys"] = foreign_keys
+    return ConstraintEvaluation(results, [outcome.violations for outcome in outcomes], n_rows)
+
+
+def constraint_fingerprint(constraint: Dict[str, Any], reference_key: Optional[str] = None) -> str:
+    """
+    Hash a constraint in canonical form.
+
+    Only the fields that determine the outcome are hashed, as sorted-key JSON,
+    so extra keys or their order do not matter; foreign keys also depend on
+    the reference table.
+
+    Args:
+        constraint: Constraint dict with "column", "type" and "value"
+        reference_key: Fingerprint of the reference table, e.g. its registry handle
+
+    Returns:
+        str: Hex digest identifying the constraint
+    """
+    canonical_constraint = {
+        "column": constraint.get("column"),
+        "type": constraint.get("type"),
+        "value": constraint.get("value"),
+        "reference": reference_key if constraint.get("type") == "foreign_key" else None,
+    }
+    payload = json.dumps(canonical_constraint, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ConstraintResultCache:
+    """
+    Constraint outcomes cached by (dataset fingerprint, constraint fingerprint).
+
+    When the constraint list changes, only new or changed constraints are
+    checked; the results and overall score are recombined from the cached
+    outcomes of the others. Outcomes hold the packed violation bitmap, so an
+    entry costs an eighth of a byte per row.
+
+    With a store (the dataset registry), outcomes are also persisted next to
+    the dataset, one artifact per constraint, so they survive background job
+    processes and server restarts; the in-memory LRU stays the first level.
+    """
+
+    def __init__(self, max_entries: int = 1024, store: Optional[Any] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of constraint outcomes kept in memory
+            store: Optional object with load_artifact(handle, name) and
+                save_artifact(handle, name, artifact), e.g. the dataset registry
+        """
+        self.max_entries = max_entries
+        self.store = store
+        self._outcomes = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _artifact_name(key: Tuple) -> str:
+        return f"constraint.{key[1]}"
+
+    def _remember(self, key: Tuple, outcome: ConstraintOutcome) -> None:
+        with self._lock:
+            self._outcomes[key] = outcome
+            self._outcomes.move_to_end(key)
+            while len(self._outcomes) > self.max_entries:
+                self._outcomes.popitem(last=False)
+
+    def _lookup(self, key: Tuple) -> Optional[ConstraintOutcome]:
+        with self._lock:
+            outcome = self._outcomes.get(key)
+            if outcome is not None:
+                self._outcomes.move_to_end(key)
+                return outcome
+
+        if self.store is None:
+            return None
+        outcome = self.store.load_artifact(key[0], self._artifact_name(key))
+        if not isinstance(outcome, ConstraintOutcome):
+            return None
+        self._remember(key, outcome)
+        return outcome
+
+    def _store(self, key: Tuple, outcome: ConstraintOutcome) -> None:
+        self._remember(key, outcome)
+        if self.store is not None:
+            self.store.save_artifact(key[0], self._artifact_name(key), outcome)
+
+    def evaluate(self, constraints: Optional[List[Dict[str, Any]]], df: pd.DataFrame,
+                 profiles: Optional[Dict[str, ColumnProfile]] = None, reference: Optional[pd.DataFrame] = None,
+                 dataset_key: Optional[str] = None, reference_key: Optional[str] = None) -> ConstraintEvaluation:
+        """
+        Evaluate constraints, reusing the outcomes cached for the same dataset.
+
+        Args:
+            constraints: Constraints as stored by the UI
+            df: The pandas DataFrame to check
+            profiles: Optional column profiles computed earlier
+            reference: Optional reference table for foreign_key constraints
+            dataset_key: Fingerprint of the dataset, e.g. its registry handle; None disables caching
+            reference_key: Fingerprint of the reference table; foreign keys are not cached without it
+
+        Returns:
+            ConstraintEvaluation: Results and violation bitmaps
+        """
+        plan = compile_constraints(constraints)
+        if dataset_key is None:
+            return plan.evaluate(df, profiles, reference)
+
+        keys = []
+        for constraint in plan.constraints:
+            cacheable = constraint.get("type") != "foreign_key" or reference is None or reference_key is not None
+            keys.append((dataset_key, constraint_fingerprint(constraint, reference_key)) if cacheable else None)
+        outcomes = [self._lookup(key) if key is not None else None for key in keys]
+
+        missing = [index for index, outcome in enumerate(outcomes) if outcome is None]
+        if missing:
+            fresh = compile_constraints([plan.constraints[index] for index in missing]).check(df, profiles, reference)
+            for index, outcome in zip(missing, fresh):
+                outcomes[index] = outcome
+                if keys[index] is not None:
+                    self._store(keys[index], outcome)
+        logger.debug(f"Checked {len(missing)} of {len(outcomes)} constraints, the others were cached")
+
+        return assemble_evaluation(plan.constraints, outcomes, len(df))
+
+
+def compile_constraints(constraints: Optional[List[Dict[str, Any]]]) -> ConstraintPlan:
+    """
+    Compile the constraints stored by the UI into an evaluation plan.
+
+    Args:
+        constraints: List of constraint dicts
+
+    Returns:
+        ConstraintPlan: The compiled plan
+    """
+    return ConstraintPlan(constraints)
+
+
+# Shared cache used by the quality analysis, persisting outcomes next to the registered datasets
+constraint_cache = ConstraintResultCache(max_entries=int(os.getenv("CONSTRAINT_CACHE_SIZE", "1024")),
+                                         store=dataset_registry)
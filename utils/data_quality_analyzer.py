@@ -1,32 +1,123 @@
+import json
+import math
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import html, dcc
+from dash import html, dcc, dash_table
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
-from sklearn.ensemble import IsolationForest
 
+from utils.column_profile import build_column_profiles
+from utils.analysis_executor import analysis_executor
+from utils.constraint_plan import constraint_cache
+from utils.outlier_detection import ACCURACY_ENGINES, DEFAULT_ACCURACY_ENGINE, MULTIVARIATE_ROW_LIMIT, outlier_detector
+from utils.row_hashes import build_row_hash_index
+from utils.render_cache import figure_cache, render_cache, result_fingerprint
 
-def analyze_data_quality(df, custom_constraints=None):
-    """Perform data quality analysis on the dataset using the six dimensions and custom constraints."""
-    # Calculate data quality metrics for each dimension
-    completeness_metrics = calculate_completeness(df)
-    accuracy_metrics = calculate_accuracy(df)
-    validity_metrics = calculate_validity(df)
-    uniqueness_metrics = calculate_uniqueness(df)
-    integrity_metrics = calculate_integrity(df)
-    consistency_metrics = calculate_consistency(df)
-    
-    # Apply custom constraints if provided
-    custom_constraints_results = {}
+# Quality dimensions combined into the overall score
+QUALITY_DIMENSIONS = ("completeness", "accuracy", "validity", "uniqueness", "integrity", "consistency")
+
+# Rows per page of the column-level quality table; further pages are served by a callback
+QUALITY_TABLE_PAGE_SIZE = 25
+
+# Columns listed in the near-duplicate summary
+NEAR_DUPLICATE_COLUMNS_LISTED = 10
+
+
+def analyze_data_quality(df, custom_constraints=None, profiles=None, dataset_key=None,
+                         accuracy_engine=DEFAULT_ACCURACY_ENGINE, shared_path=None, reference_df=None,
+                         reference_key=None, dimensions=None, row_hashes=None, progress=None):
+    """Perform data quality analysis on the dataset using the six dimensions and custom constraints.
+    
+    Column profiles are computed once (or reused if given) and shared by every dimension.
+    Outlier models are fitted once per column and cached under dataset_key (e.g. the
+    registry handle), so repeated runs on the same dataset reuse them. accuracy_engine
+    selects the outlier detection: "isolation_forest", the much faster robust
+    statistics "iqr" and "mad", or "multivariate", which fits one model over all
+    numeric columns and also reports the outlier rows.
+    
+    The dimensions are independent and run concurrently on the analysis executor;
+    shared_path (the dataset's Arrow copy) lets worker processes read columns for
+    the per-column outlier models without pickling the frame. dimensions computed
+    earlier by calculate_quality_dimensions() for the same dataset are reused as is.
+    
+    reference_df is the reference table that foreign_key constraints are checked against.
+    Constraint outcomes are cached under dataset_key and reference_key, so only new or
+    changed constraints are checked again. row_hashes is the dataset's cached
+    RowHashIndex, from which duplicate rows are counted.
+    progress (an AnalysisProgress) is advanced per finished dimension and per
+    column checked for outliers.
+    """
+    if accuracy_engine not in ACCURACY_ENGINES:
+        raise ValueError(f"Unsupported accuracy engine: {accuracy_engine}")
+
+    profiles = build_column_profiles(df, profiles)
+    
+    # Calculate data quality metrics for each dimension, and apply custom constraints if provided
+    tasks = {} if dimensions is not None else quality_dimension_tasks(df, profiles, dataset_key, accuracy_engine, shared_path,
+                                                                          row_hashes, progress)
     if custom_constraints:
-        custom_constraints_results = apply_custom_constraints(df, custom_constraints)
+        tasks["custom_constraints"] = lambda: apply_custom_constraints(df, custom_constraints, profiles, reference_df,
+                                                                       dataset_key, reference_key)
+    metrics = analysis_executor.run(tasks, progress)
+    if dimensions is None:
+        dimensions = {name: metrics[name] for name in QUALITY_DIMENSIONS}
+    custom_constraints_results = metrics.get("custom_constraints", {})
+    if custom_constraints_results.get("foreign_keys"):
+        # Checked foreign keys replace the estimate based on ID-like column names
+        dimensions = dict(dimensions, integrity=calculate_integrity(df, profiles, custom_constraints_results["foreign_keys"]))
+    
+    # Legacy metrics for backward compatibility; the outlier counts are the accuracy dimension's,
+    # so reused dimensions need no outlier models (e.g. in a fresh background job process)
+    missing_values = calculate_missing_values(df, profiles)
+    outliers = outliers_from_accuracy(dimensions["accuracy"])
+    data_types = calculate_data_types(df, profiles)
+    row_outliers = calculate_row_outliers(df, dataset_key) if accuracy_engine == "multivariate" else None
+    
+    quality_results = assemble_quality_results(
+        dimensions,
+        custom_constraints_results,
+        missing_values,
+        outliers,
+        data_types,
+        row_outliers
+    )
     
-    # Legacy metrics for backward compatibility
-    missing_values = calculate_missing_values(df)
-    outliers = calculate_outliers(df)
-    data_types = calculate_data_types(df)
+    # Create visualizations
+    visualizations = create_quality_visualizations(quality_results, df)
+    
+    return quality_results, visualizations
+
+def quality_dimension_tasks(df, profiles, dataset_key=None, accuracy_engine=DEFAULT_ACCURACY_ENGINE, shared_path=None,
+                            row_hashes=None, progress=None):
+    """Return the calculation of each quality dimension as a zero-argument task for the analysis executor."""
+    return {
+        "completeness": lambda: calculate_completeness(df, profiles),
+        "accuracy": lambda: calculate_accuracy(df, dataset_key, accuracy_engine, shared_path, progress),
+        "validity": lambda: calculate_validity(df, profiles),
+        "uniqueness": lambda: calculate_uniqueness(df, profiles, row_hashes),
+        "integrity": lambda: calculate_integrity(df, profiles),
+        "consistency": lambda: calculate_consistency(df, profiles),
+    }
+
+def calculate_quality_dimensions(df, profiles=None, dataset_key=None, accuracy_engine=DEFAULT_ACCURACY_ENGINE, shared_path=None,
+                                 row_hashes=None, progress=None):
+    """Calculate the six quality dimensions; they do not depend on the custom constraints and can be reused across runs."""
+    if accuracy_engine not in ACCURACY_ENGINES:
+        raise ValueError(f"Unsupported accuracy engine: {accuracy_engine}")
+    profiles = build_column_profiles(df, profiles)
+    return analysis_executor.run(quality_dimension_tasks(df, profiles, dataset_key, accuracy_engine, shared_path,
+                                                         row_hashes, progress), progress)
+
+def assemble_quality_results(dimensions, custom_constraints_results, missing_values, outliers, data_types, row_outliers=None):
+    """Combine the six dimension metrics into the quality results with the overall score and legacy fields."""
+    completeness_metrics = dimensions["completeness"]
+    accuracy_metrics = dimensions["accuracy"]
+    validity_metrics = dimensions["validity"]
+    uniqueness_metrics = dimensions["uniqueness"]
+    integrity_metrics = dimensions["integrity"]
+    consistency_metrics = dimensions["consistency"]
     
     # Calculate overall data quality score (weighted average of dimension scores)
     dimension_weights = {
@@ -76,23 +167,24 @@ def analyze_data_quality(df, custom_constraints=None):
         }
     }
     
-    # Create visualizations
-    visualizations = create_quality_visualizations(quality_results, df)
+    if row_outliers is not None:
+        quality_results["row_outliers"] = row_outliers
     
-    return quality_results, visualizations
+    return quality_results
 
 # Add these functions to data_quality_analyzer.py
 
-def calculate_completeness(df):
+def calculate_completeness(df, profiles=None):
     """
     Calculate completeness metrics for each column in the dataset.
     
     Completeness: Is your data complete, with no missing values or gaps?
     """
+    profiles = build_column_profiles(df, profiles)
     column_completeness = {}
     
     for col in df.columns:
-        missing_count = df[col].isna().sum()
+        missing_count = profiles[col].null_count
         missing_percentage = missing_count / len(df) if len(df) > 0 else 0
         completeness_score = 1 - missing_percentage
         
@@ -104,7 +196,7 @@ def calculate_completeness(df):
     
     # Calculate overall completeness
     total_cells = df.size
-    non_missing_cells = total_cells - df.isna().sum().sum()
+    non_missing_cells = total_cells - sum(profile.null_count for profile in profiles.values())
     overall_completeness_score = non_missing_cells / total_cells if total_cells > 0 else 1.0
     
     return {
@@ -115,7 +207,7 @@ def calculate_completeness(df):
         "column_details": column_completeness
     }
 
-def calculate_accuracy(df):
+def calculate_accuracy(df, dataset_key=None, engine=DEFAULT_ACCURACY_ENGINE, shared_path=None, progress=None):
     """
     Calculate accuracy metrics for each column in the dataset.
     
@@ -126,28 +218,22 @@ def calculate_accuracy(df):
     """
     column_accuracy = {}
     
+    # Detect outliers as a proxy for accuracy; columns whose detection fails count as accurate
+    numeric_columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    outlier_counts = outlier_detector.outlier_counts(df, numeric_columns, dataset_key, engine, shared_path=shared_path,
+                                                    progress=progress)
+    
     for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            # Use isolation forest to detect outliers as a proxy for accuracy
-            try:
-                clf = IsolationForest(contamination=0.1, random_state=42)
-                column_data = df[col].fillna(df[col].median()).values.reshape(-1, 1)
-                outlier_predictions = clf.fit_predict(column_data)
-                outlier_count = (outlier_predictions == -1).sum()
-                outlier_percentage = outlier_count / len(df) if len(df) > 0 else 0
-                accuracy_score = 1 - outlier_percentage
-                
-                column_accuracy[col] = {
-                    "outlier_count": int(outlier_count),
-                    "outlier_percentage": float(outlier_percentage),
-                    "accuracy_score": float(accuracy_score)
-                }
-            except Exception as e:
-                column_accuracy[col] = {
-                    "outlier_count": 0,
-                    "outlier_percentage": 0,
-                    "accuracy_score": 1.0
-                }
+        if col in outlier_counts:
+            outlier_count = outlier_counts[col]
+            outlier_percentage = outlier_count / len(df) if len(df) > 0 else 0
+            accuracy_score = 1 - outlier_percentage
+            
+            column_accuracy[col] = {
+                "outlier_count": int(outlier_count),
+                "outlier_percentage": float(outlier_percentage),
+                "accuracy_score": float(accuracy_score)
+            }
         else:
             column_accuracy[col] = {
                 "outlier_count": 0,
@@ -163,36 +249,39 @@ def calculate_accuracy(df):
         "column_details": column_accuracy
     }
 
-def calculate_validity(df):
+def calculate_validity(df, profiles=None):
     """
     Calculate validity metrics for each column in the dataset.
     
     Validity: Does your data conform to specified formats, ranges, and definitions?
     """
+    profiles = build_column_profiles(df, profiles)
     column_validity = {}
     
     for col in df.columns:
+        profile = profiles[col]
+        
         # Initialize validity score
         validity_score = 1.0
         invalid_count = 0
         
         # Check validity based on data type
-        if pd.api.types.is_numeric_dtype(df[col]):
+        if profile.is_numeric:
             # For numeric columns, check for infinity and NaN values
-            non_finite_count = (~np.isfinite(df[col].dropna())).sum()
+            non_finite_count = profile.weighted_count(~np.isfinite(profile.numeric_uniques()))
             invalid_count = non_finite_count
             
-            if len(df[col].dropna()) > 0:
-                validity_score = 1 - (non_finite_count / len(df[col].dropna()))
+            if profile.non_null_count > 0:
+                validity_score = 1 - (non_finite_count / profile.non_null_count)
             
-        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+        elif profile.is_datetime:
             # For datetime columns, all non-null values are considered valid
             # (pandas already converted them to datetime)
             validity_score = 1.0
             
-        elif pd.api.types.is_string_dtype(df[col]):
-            # For string columns, check for empty strings
-            empty_string_count = (df[col].fillna('') == '').sum()
+        elif profile.is_string:
+            # For string columns, check for empty strings (missing values count as empty)
+            empty_string_count = profile.null_count + profile.weighted_count(profile.string_mask(lambda v: v == ''))
             invalid_count = empty_string_count
             
             if len(df) > 0:
@@ -211,19 +300,27 @@ def calculate_validity(df):
         "column_details": column_validity
     }
 
-def calculate_uniqueness(df):
+def calculate_uniqueness(df, profiles=None, row_hashes=None):
     """
     Calculate uniqueness metrics for each column in the dataset.
     
     Uniqueness: Is your data free from unintended duplicates?
+    
+    Duplicate rows are counted from the row hashes (row_hashes, if cached with the
+    dataset). Near-duplicate rows cost a sort per column and are only searched on
+    request, see create_near_duplicates_summary().
     """
+    profiles = build_column_profiles(df, profiles)
+    row_hashes = build_row_hash_index(df, profiles, row_hashes)
     column_uniqueness = {}
     
     for col in df.columns:
+        profile = profiles[col]
+        
         # Count duplicate values
-        value_counts = df[col].value_counts()
-        duplicate_values = value_counts[value_counts > 1].sum() - len(value_counts[value_counts > 1])
-        total_values = len(df[col].dropna())
+        repeated_counts = profile.counts[profile.counts > 1]
+        duplicate_values = repeated_counts.sum() - len(repeated_counts)
+        total_values = profile.non_null_count
         
         # Calculate uniqueness score
         uniqueness_score = 1.0
@@ -232,12 +329,12 @@ def calculate_uniqueness(df):
         
         column_uniqueness[col] = {
             "duplicate_count": int(duplicate_values),
-            "unique_percentage": float(df[col].nunique() / total_values if total_values > 0 else 1.0),
+            "unique_percentage": float(profile.n_unique / total_values if total_values > 0 else 1.0),
             "uniqueness_score": float(uniqueness_score)
         }
     
     # Check for duplicate rows
-    duplicate_rows_count = df.duplicated().sum()
+    duplicate_rows_count = row_hashes.duplicate_count
     row_uniqueness_score = 1 - (duplicate_rows_count / len(df) if len(df) > 0 else 0)
     
     # Calculate overall uniqueness score (average of column scores + row uniqueness)
@@ -251,30 +348,36 @@ def calculate_uniqueness(df):
         "column_details": column_uniqueness
     }
 
-def calculate_integrity(df):
+def calculate_integrity(df, profiles=None, foreign_keys=None):
     """
     Calculate integrity metrics for the dataset.
     
     Integrity: Can your data be consistently traced and connected across your agency?
     
     Note: Full integrity assessment requires knowledge of relationships between tables.
-    This implementation focuses on potential foreign key columns and referential integrity.
+    Without it, this implementation focuses on potential foreign key columns guessed from
+    column names. When foreign_key constraints were checked against a reference table
+    (the "foreign_keys" of the custom constraint results), the score is their match rate.
     """
+    profiles = build_column_profiles(df, profiles)
+    
     # Identify potential ID columns (columns with unique values that might be foreign keys)
     potential_id_columns = []
     column_integrity = {}
     
     for col in df.columns:
+        profile = profiles[col]
+        
         # Check if column name contains 'id', 'key', 'code' or similar
         is_potential_id = any(id_term in col.lower() for id_term in ['id', 'key', 'code', 'num', 'uuid'])
         
         # Check if column has high cardinality (many unique values)
-        unique_count = df[col].nunique()
-        total_count = len(df[col].dropna())
+        unique_count = profile.n_unique
+        total_count = profile.non_null_count
         unique_ratio = unique_count / total_count if total_count > 0 else 0
         
         # Calculate integrity score based on null values in potential ID columns
-        null_count = df[col].isna().sum()
+        null_count = profile.null_count
         integrity_score = 1 - (null_count / len(df) if len(df) > 0 else 0)
         
         if is_potential_id or unique_ratio > 0.9:
@@ -287,50 +390,67 @@ def calculate_integrity(df):
             "integrity_score": float(integrity_score)
         }
     
-    # Calculate overall integrity score
-    # Higher weight for potential ID columns
+    if foreign_keys:
+        # Referential integrity measured on the declared foreign keys
+        for foreign_key in foreign_keys:
+            for col in foreign_key["columns"]:
+                column_integrity[col]["referential_match_rate"] = foreign_key["match_rate"]
+        return {
+            "overall_score": float(np.mean([foreign_key["match_rate"] for foreign_key in foreign_keys])),
+            "potential_id_columns": potential_id_columns,
+            "column_details": column_integrity,
+            "referential_integrity": foreign_keys
+        }
+    
+    return {
+        "overall_score": float(overall_integrity_score(column_integrity, potential_id_columns)),
+        "potential_id_columns": potential_id_columns,
+        "column_details": column_integrity
+    }
+
+def overall_integrity_score(column_integrity, potential_id_columns):
+    """Average the column integrity scores, with a higher weight for potential ID columns."""
     if potential_id_columns:
         id_scores_sum = sum([column_integrity[col]["integrity_score"] for col in potential_id_columns])
         id_score = id_scores_sum / len(potential_id_columns)
-        other_columns = [col for col in df.columns if col not in potential_id_columns]
+        other_columns = [col for col in column_integrity if col not in potential_id_columns]
         
         if other_columns:
             other_scores_sum = sum([column_integrity[col]["integrity_score"] for col in other_columns])
             other_score = other_scores_sum / len(other_columns)
-            overall_integrity_score = (id_score * 0.7) + (other_score * 0.3)
+            integrity_score = (id_score * 0.7) + (other_score * 0.3)
         else:
-            overall_integrity_score = id_score
+            integrity_score = id_score
     else:
         # If no potential ID columns, use average of all columns
-        overall_integrity_score = sum([v["integrity_score"] for v in column_integrity.values()]) / len(column_integrity) if column_integrity else 1.0
+        integrity_score = sum([v["integrity_score"] for v in column_integrity.values()]) / len(column_integrity) if column_integrity else 1.0
     
-    return {
-        "overall_score": float(overall_integrity_score),
-        "potential_id_columns": potential_id_columns,
-        "column_details": column_integrity
-    }
+    return integrity_score
 
-def calculate_consistency(df):
+def calculate_consistency(df, profiles=None):
     """
     Calculate consistency metrics for the dataset.
     
     Consistency: Is your data stable and coherent across different systems and time periods?
     """
+    profiles = build_column_profiles(df, profiles)
     column_consistency = {}
     
     for col in df.columns:
+        profile = profiles[col]
+        
         # Initialize consistency metrics
         case_consistency_score = 1.0
         format_consistency_score = 1.0
         
-        # Check for case consistency in string columns
-        if pd.api.types.is_string_dtype(df[col]):
-            lowercase_count = df[col].dropna().str.islower().sum()
-            uppercase_count = df[col].dropna().str.isupper().sum()
-            mixed_case_count = len(df[col].dropna()) - lowercase_count - uppercase_count
+        # Check for case consistency in string columns (evaluated once per distinct value)
+        if profile.is_string:
+            lowercase_count = profile.weighted_count(profile.string_mask(str.islower))
+            uppercase_count = profile.weighted_count(profile.string_mask(str.isupper))
+            mixed_case_count = profile.non_null_count - lowercase_count - uppercase_count
             
-            if len(df[col].dropna()) > 0:
-                case_consistency_score = max(lowercase_count, uppercase_count, mixed_case_count) / len(df[col].dropna())
+            if profile.non_null_count > 0:
+                case_consistency_score = max(lowercase_count, uppercase_count, mixed_case_count) / profile.non_null_count
             
             column_consistency[col] = {
                 "case_consistency_score": float(case_consistency_score),
@@ -341,16 +461,15 @@ def calculate_consistency(df):
             }
         
         # Check for format consistency in numeric columns
-        elif pd.api.types.is_numeric_dtype(df[col]):
+        elif profile.is_numeric:
             # Check if values follow a consistent pattern (e.g., all integers vs. mix of integers and floats)
-            non_null_values = df[col].dropna()
             integer_count = 0
             float_count = 0
             
-            if len(non_null_values) > 0:
-                integer_count = (non_null_values % 1 == 0).sum()
-                float_count = len(non_null_values) - integer_count
-                format_consistency_score = max(integer_count, float_count) / len(non_null_values)
+            if profile.non_null_count > 0:
+                integer_count = profile.weighted_count(profile.integral_mask())
+                float_count = profile.non_null_count - integer_count
+                format_consistency_score = max(integer_count, float_count) / profile.non_null_count
             
             column_consistency[col] = {
                 "case_consistency_score": float(case_consistency_score),
@@ -379,12 +498,13 @@ def calculate_consistency(df):
 
 
 
-def calculate_missing_values(df):
+def calculate_missing_values(df, profiles=None):
     """Calculate missing value metrics for each column."""
+    profiles = build_column_profiles(df, profiles)
     missing_values = {}
     
     for col in df.columns:
-        missing_count = df[col].isna().sum()
+        missing_count = profiles[col].null_count
         missing_percentage = missing_count / len(df) if len(df) > 0 else 0
         
         missing_values[col] = {
@@ -394,30 +514,23 @@ def calculate_missing_values(df):
     
     return missing_values
 
-def calculate_outliers(df):
-    """Calculate outlier metrics for each numerical column."""
+def calculate_outliers(df, dataset_key=None, engine=DEFAULT_ACCURACY_ENGINE):
+    """Calculate outlier metrics for each numerical column, reusing the accuracy dimension's models."""
     outliers = {}
     
+    # Columns whose outlier detection fails are reported without outliers
+    numeric_columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    outlier_counts = outlier_detector.outlier_counts(df, numeric_columns, dataset_key, engine)
+    
     for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            # Use isolation forest to detect outliers
-            try:
-                clf = IsolationForest(contamination=0.1, random_state=42)
-                column_data = df[col].fillna(df[col].median()).values.reshape(-1, 1)
-                outlier_predictions = clf.fit_predict(column_data)
-                outlier_count = (outlier_predictions == -1).sum()
-                outlier_percentage = outlier_count / len(df) if len(df) > 0 else 0
-                
-                outliers[col] = {
-                    "outlier_count": int(outlier_count),
-                    "outlier_percentage": float(outlier_percentage),
-                }
-            except Exception as e:
-                # If outlier detection fails, set to 0
-                outliers[col] = {
-                    "outlier_count": 0,
-                    "outlier_percentage": 0,
-                }
+        if col in outlier_counts:
+            outlier_count = outlier_counts[col]
+            outlier_percentage = outlier_count / len(df) if len(df) > 0 else 0
+    
+            outliers[col] = {
+                "outlier_count": int(outlier_count),
+                "outlier_percentage": float(outlier_percentage),
+            }
         else:
             outliers[col] = {
                 "outlier_count": 0,
@@ -426,31 +539,60 @@ def calculate_outliers(df):
     
     return outliers
 
-def calculate_data_types(df):
+def outliers_from_accuracy(accuracy):
+    """Return the per-column outlier metrics of calculate_outliers() from the accuracy dimension's results."""
+    return {
+        col: {
+            "outlier_count": details["outlier_count"],
+            "outlier_percentage": details["outlier_percentage"],
+        }
+        for col, details in accuracy["column_details"].items()
+    }
+
+def calculate_row_outliers(df, dataset_key=None):
+    """Flag anomalous rows with one model over all numeric columns, attributing each to its most deviant column."""
+    numeric_columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    result = outlier_detector.row_outliers(df, numeric_columns, dataset_key)
+    columns, rows, scores, top_columns = result["columns"], result["rows"], result["scores"], result["top_columns"]
+    
+    outlier_count = len(rows)
+    attributed = np.bincount(top_columns, minlength=len(columns))
+    
+    # List the most anomalous rows first; score_samples is lower for more anomalous rows
+    listed = np.argsort(scores, kind="stable")[:MULTIVARIATE_ROW_LIMIT]
+    
+    return {
+        "columns": [str(col) for col in columns],
+        "outlier_count": int(outlier_count),
+        "outlier_percentage": float(outlier_count / len(df)) if len(df) > 0 else 0,
+        "column_contributions": {
+            str(col): float(attributed[i] / outlier_count) if outlier_count else 0.0
+            for i, col in enumerate(columns)
+        },
+        "rows": [
+            {
+                "row_number": int(rows[i]),
+                "anomaly_score": float(-scores[i]),
+                "top_column": str(columns[top_columns[i]])
+            }
+            for i in listed
+        ]
+    }
+
+def calculate_data_types(df, profiles=None):
     """Calculate data type information for each column."""
+    profiles = build_column_profiles(df, profiles)
     data_types = {}
     
     for col in df.columns:
-        dtype = df[col].dtype
+        profile = profiles[col]
         
-        if pd.api.types.is_numeric_dtype(df[col]):
-            if (df[col].dropna() % 1 == 0).all():
-                inferred_type = "integer"
-            else:
-                inferred_type = "float"
-        elif pd.api.types.is_datetime64_any_dtype(df[col]):
-            inferred_type = "datetime"
-        elif pd.api.types.is_bool_dtype(df[col]):
-            inferred_type = "boolean"
-        else:
-            inferred_type = "string"
-        
-        unique_values = df[col].nunique()
+        unique_values = profile.n_unique
         unique_percentage = unique_values / len(df) if len(df) > 0 else 0
         
         data_types[col] = {
-            "dtype": str(dtype),
-            "inferred_type": inferred_type,
+            "dtype": str(profile.dtype),
+            "inferred_type": profile.inferred_type,
             "unique_values": int(unique_values),
             "unique_percentage": float(unique_percentage),
         }
@@ -547,191 +689,24 @@ def analyze_data_quality_old(df):
     return quality_results, visualizations
 
 
-def apply_custom_constraints(df, constraints):
-    """Apply custom constraints to the dataset and return the results."""
-    results = {
-        "constraints": [],
-        "overall_score": 1.0,
-        "pass_count": 0,
-        "fail_count": 0,
-        "total_count": len(constraints) if constraints else 0
-    }
-    
-    if not constraints:
-        return results
-    
-    for constraint in constraints:
-        column = constraint.get("column")
-        constraint_type = constraint.get("type")
-        value = constraint.get("value")
-        
-        # Skip if column doesn't exist
-        if column not in df.columns:
-            results["constraints"].append({
-                "column": column,
-                "type": constraint_type,
-                "value": value,
-                "passed": False,
-                "error": "Column not found in dataset",
-                "pass_rate": 0.0
-            })
-            results["fail_count"] += 1
-            continue
-        
-        # Apply the constraint based on its type
-        if constraint_type == "not_null":
-            non_null_count = df[column].count()
-            total_count = len(df)
-            pass_rate = non_null_count / total_count if total_count > 0 else 1.0
-            passed = pass_rate == 1.0
-            error = f"{total_count - non_null_count} null values found" if not passed else ""
-        
-        elif constraint_type == "unique":
-            unique_count = df[column].nunique()
-            total_count = df[column].count()
-            pass_rate = 1.0 if unique_count == total_count else 0.0
-            passed = pass_rate == 1.0
-            error = f"{total_count - unique_count} duplicate values found" if not passed else ""
-        
-        elif constraint_type == "min_value":
-            try:
-                min_value = float(value) if value else 0
-                if pd.api.types.is_numeric_dtype(df[column]):
-                    valid_count = (df[column] >= min_value).sum()
-                    total_count = df[column].count()
-                    pass_rate = valid_count / total_count if total_count > 0 else 1.0
-                    passed = pass_rate == 1.0
-                    error = f"{total_count - valid_count} values below minimum" if not passed else ""
-                else:
-                    passed = False
-                    pass_rate = 0.0
-                    error = "Column is not numeric"
-            except ValueError:
-                passed = False
-                pass_rate = 0.0
-                error = "Invalid minimum value"
-        
-        elif constraint_type == "max_value":
-            try:
-                max_value = float(value) if value else 0
-                if pd.api.types.is_numeric_dtype(df[column]):
-                    valid_count = (df[column] <= max_value).sum()
-                    total_count = df[column].count()
-                    pass_rate = valid_count / total_count if total_count > 0 else 1.0
-                    passed = pass_rate == 1.0
-                    error = f"{total_count - valid_count} values above maximum" if not passed else ""
-                else:
-                    passed = False
-                    pass_rate = 0.0
-                    error = "Column is not numeric"
-            except ValueError:
-                passed = False
-                pass_rate = 0.0
-                error = "Invalid maximum value"
-        
-        elif constraint_type == "regex":
-            if not value:
-                passed = False
-                pass_rate = 0.0
-                error = "No regex pattern provided"
-            else:
-                try:
-                    import re
-                    pattern = re.compile(value)
-                    if pd.api.types.is_string_dtype(df[column]):
-                        # Apply regex to non-null values
-                        valid_mask = df[column].notna() & df[column].astype(str).str.match(pattern)
-                        valid_count = valid_mask.sum()
-                        total_count = df[column].count()
-                        pass_rate = valid_count / total_count if total_count > 0 else 1.0
-                        passed = pass_rate == 1.0
-                        error = f"{total_count - valid_count} values don't match pattern" if not passed else ""
-                    else:
-                        passed = False
-                        pass_rate = 0.0
-                        error = "Column is not string type"
-                except re.error:
-                    passed = False
-                    pass_rate = 0.0
-                    error = "Invalid regex pattern"
-        
-        elif constraint_type == "value_in_list":
-            if not value:
-                passed = False
-                pass_rate = 0.0
-                error = "No list of values provided"
-            else:
-                try:
-                    # Parse comma-separated list
-                    allowed_values = [v.strip() for v in value.split(',')]
-                    # Convert to appropriate type if column is numeric
-                    if pd.api.types.is_numeric_dtype(df[column]):
-                        allowed_values = [float(v) for v in allowed_values]
-                    
-                    valid_count = df[column].isin(allowed_values).sum()
-                    total_count = df[column].count()
-                    pass_rate = valid_count / total_count if total_count > 0 else 1.0
-                    passed = pass_rate == 1.0
-                    error = f"{total_count - valid_count} values not in allowed list" if not passed else ""
-                except ValueError:
-                    passed = False
-                    pass_rate = 0.0
-                    error = "Invalid list format or type mismatch"
-        
-        elif constraint_type == "date_format":
-            if not value:
-                value = "%Y-%m-%d"  # Default format
-            
-            if pd.api.types.is_datetime64_any_dtype(df[column]):
-                # If already datetime, all values are valid
-                passed = True
-                pass_rate = 1.0
-                error = ""
-            else:
-                try:
-                    # Try to parse as datetime with the given format
-                    valid_count = 0
-                    total_count = df[column].count()
-                    
-                    for val in df[column].dropna():
-                        try:
-                            pd.to_datetime(val, format=value)
-                            valid_count += 1
-                        except:
-                            pass
-                    
-                    pass_rate = valid_count / total_count if total_count > 0 else 1.0
-                    passed = pass_rate == 1.0
-                    error = f"{total_count - valid_count} values don't match date format" if not passed else ""
-                except:
-                    passed = False
-                    pass_rate = 0.0
-                    error = "Invalid date format"
-        
-        else:  # Unknown constraint type
-            passed = False
-            pass_rate = 0.0
-            error = "Unknown constraint type"
-        
-        # Add result to the constraints list
-        results["constraints"].append({
-            "column": column,
-            "type": constraint_type,
-            "value": value,
-            "passed": passed,
-            "error": error,
-            "pass_rate": float(pass_rate)
-        })
-        
-        if passed:
-            results["pass_count"] += 1
-        else:
-            results["fail_count"] += 1
-    
-    # Calculate overall score
-    results["overall_score"] = results["pass_count"] / results["total_count"] if results["total_count"] > 0 else 1.0
-    
-    return results
+def apply_custom_constraints(df, constraints, profiles=None, reference_df=None, dataset_key=None, reference_key=None):
+    """Apply custom constraints to the dataset and return the results.
+    
+    The constraints are compiled into a plan that evaluates all constraints on a
+    column in one pass over its (shared) profile; use compile_constraints() directly
+    to also get the per-row violation bitmaps. foreign_key constraints are checked
+    against reference_df. With a dataset_key, outcomes are cached per constraint and
+    only new or changed constraints are checked.
+    """
+    return constraint_cache.evaluate(constraints, df, profiles, reference_df, dataset_key, reference_key).results
+
+
+def constraints_score_text(constraints_results):
+    """Describe the overall constraints score, which is None when no constraint was checked."""
+    overall_score = constraints_results.get("overall_score", 1.0)
+    if overall_score is None:
+        return "Overall Constraints Score: not computed (no constraint was checked)"
+    return f"Overall Constraints Score: {overall_score:.2f}"
 
 
 def create_constraints_results_table(constraints_results):
@@ -739,15 +714,17 @@ def create_constraints_results_table(constraints_results):
     if not constraints_results or not constraints_results.get("constraints"):
         return html.P("No constraints results available.", className="text-muted")
     
-    # Create table data
+    # Create table data; passed is None for constraints that were not checked (streaming mode)
     table_data = []
     for constraint in constraints_results.get("constraints", []):
+        passed = constraint.get("passed", False)
+        pass_rate = constraint.get("pass_rate", 0.0)
         table_data.append({
             "Column": constraint.get("column", ""),
             "Constraint Type": constraint.get("type", "").replace("_", " ").title(),
             "Value": constraint.get("value", ""),
-            "Status": "✓ Passed" if constraint.get("passed", False) else "✗ Failed",
-            "Pass Rate": f"{constraint.get('pass_rate', 0.0) * 100:.1f}%",
+            "Status": "– Not checked" if passed is None else "✓ Passed" if passed else "✗ Failed",
+            "Pass Rate": "N/A" if pass_rate is None else f"{pass_rate * 100:.1f}%",
             "Error": constraint.get("error", "")
         })
     
@@ -764,14 +741,13 @@ def create_constraints_results_table(constraints_results):
     return constraints_table
 
 
-def create_column_quality_table(quality_results, df):
-    """Create a detailed table showing quality metrics for each column."""
-    # Create data quality details table
+def column_quality_rows(quality_results, columns):
+    """Build the column-level quality table rows of the given columns."""
     quality_table_data = []
     
     # Check if we're using the new data structure with dimensions
     if "dimensions" in quality_results:
-        for col in df.columns:
+        for col in columns:
             # Get metrics from each dimension
             completeness_score = quality_results["dimensions"]["completeness"]["column_details"][col]["completeness_score"]
             missing_percentage = quality_results["dimensions"]["completeness"]["column_details"][col]["missing_percentage"] * 100
@@ -812,7 +788,7 @@ def create_column_quality_table(quality_results, df):
             })
     else:
         # For backward compatibility with old data structure
-        for col in df.columns:
+        for col in columns:
             quality_table_data.append({
                 "Column": col,
                 "Data Type": quality_results["column_details"]["data_types"][col]["inferred_type"],
@@ -822,44 +798,67 @@ def create_column_quality_table(quality_results, df):
                 "Consistency": f"{quality_results['column_details']['consistency'][col]:.2f}",
             })
     
+    return quality_table_data
+
+def column_quality_page(quality_data, page_current, page_size=QUALITY_TABLE_PAGE_SIZE):
+    """Return one page of rows of the column-level quality table.
+    
+    quality_data is the JSON kept in data-quality-scores-store. The rows of all columns are
+    built once per result and kept in the render cache, so paging only slices them.
+    """
+    def build():
+        quality_results = json.loads(quality_data) if isinstance(quality_data, str) else quality_data
+        return column_quality_rows(quality_results, list(quality_results["column_details"]["data_types"]))
+    
+    rows = render_cache.get_or_render(("column_quality_rows", result_fingerprint(quality_data)), build)
+    start = page_current * page_size
+    return rows[start:start + page_size]
+
+def create_near_duplicates_summary(near_duplicates):
+    """Summarize the near-duplicate search of RowHashIndex.near_duplicates() for the uniqueness details."""
+    columns = sorted(((count, col) for col, count in near_duplicates["columns"].items() if count), reverse=True)
+    return html.Div([
+        html.P(f"Near-duplicate rows (differing in one column): {near_duplicates['near_duplicate_rows']:,}", className="mb-1"),
+        html.P(
+            "Most often the only difference: " + ", ".join(f"{col} ({count:,})" for count, col in columns[:NEAR_DUPLICATE_COLUMNS_LISTED]),
+            className="small text-muted"
+        ) if columns else html.Div(),
+    ])
+
+def create_column_quality_table(quality_results, df):
+    """Create a detailed table showing quality metrics for each column.
+    
+    Only the first page of rows is rendered; the table pages server-side (page_action="custom"),
+    so its payload does not grow with the number of columns.
+    """
+    columns = list(df.columns)
+    if not columns:
+        return html.P("No columns to display.", className="text-muted")
+    
+    quality_table_data = column_quality_rows(quality_results, columns[:QUALITY_TABLE_PAGE_SIZE])
+    
     # Create the table
-    quality_table = dbc.Table.from_dataframe(
-        pd.DataFrame(quality_table_data),
-        striped=True,
-        bordered=True,
-        hover=True,
-        responsive=True,
-        className="mt-3",
+    quality_table = dash_table.DataTable(
+        id="column-quality-table",
+        columns=[{"name": name, "id": name} for name in quality_table_data[0]],
+        data=quality_table_data,
+        page_action="custom",
+        page_current=0,
+        page_size=QUALITY_TABLE_PAGE_SIZE,
+        page_count=math.ceil(len(columns) / QUALITY_TABLE_PAGE_SIZE),
+        style_table={"overflowX": "auto", "marginTop": "1rem"},
+        style_header={"fontWeight": "600", "backgroundColor": "#f8f9fa", "border": "1px solid #dee2e6"},
+        style_cell={"fontFamily": "Roboto", "fontSize": "0.85rem", "textAlign": "left",
+                    "padding": "6px 10px", "border": "1px solid #dee2e6"},
+        style_data_conditional=[{"if": {"row_index": "odd"}, "backgroundColor": "#f8f9fa"}],
     )
     
     return quality_table
 
-def create_quality_visualizations(quality_results, df):
-    """Create visualizations for data quality analysis based on the six dimensions."""
-    # Create a radar chart for the six dimensions
+def create_quality_radar_chart(dimension_scores):
+    """Create the radar chart of the six dimension scores."""
     dimensions = ["Completeness", "Accuracy", "Validity", "Uniqueness", "Integrity", "Consistency"]
     
-    # Check if we're using the new data structure with dimensions
-    if "dimensions" in quality_results:
-        dimension_scores = [
-            quality_results["dimensions"]["completeness"]["overall_score"],
-            quality_results["dimensions"]["accuracy"]["overall_score"],
-            quality_results["dimensions"]["validity"]["overall_score"],
-            quality_results["dimensions"]["uniqueness"]["overall_score"],
-            quality_results["dimensions"]["integrity"]["overall_score"],
-            quality_results["dimensions"]["consistency"]["overall_score"]
-        ]
-    else:
-        # For backward compatibility with old data structure
-        dimension_scores = [
-            quality_results["completeness"]["completeness_score"],
-            quality_results["outlier_score"],  # Use outlier score as a proxy for accuracy
-            1.0,  # Default validity score
-            1.0,  # Default uniqueness score
-            1.0,  # Default integrity score
-            quality_results["consistency_score"]  # Use consistency score
-        ]
-    
     # Create radar chart with purple color theme
     fig_dimensions = go.Figure()
     
@@ -911,11 +910,10 @@ def create_quality_visualizations(quality_results, df):
         plot_bgcolor='rgba(0,0,0,0)'
     )
     
-    # Continue with the rest of your visualizations...
-    # (Include your existing visualizations here)
-    
-    # Create overall quality score gauge (donut chart with large hole)
-    overall_score = quality_results["overall_quality_score"]
+    return fig_dimensions
+
+def create_quality_gauge_chart(overall_score):
+    """Create the donut gauge of the overall quality score."""
     fig_gauge = go.Figure()
     
     # Create a donut chart with user's preferred design (large hole, clean borders)
@@ -949,6 +947,37 @@ def create_quality_visualizations(quality_results, df):
         plot_bgcolor='rgba(0,0,0,0)'
     )
     
+    return fig_gauge
+
+def create_quality_visualizations(quality_results, df):
+    """Create visualizations for data quality analysis based on the six dimensions."""
+    # Check if we're using the new data structure with dimensions
+    if "dimensions" in quality_results:
+        dimension_scores = [
+            quality_results["dimensions"]["completeness"]["overall_score"],
+            quality_results["dimensions"]["accuracy"]["overall_score"],
+            quality_results["dimensions"]["validity"]["overall_score"],
+            quality_results["dimensions"]["uniqueness"]["overall_score"],
+            quality_results["dimensions"]["integrity"]["overall_score"],
+            quality_results["dimensions"]["consistency"]["overall_score"]
+        ]
+    else:
+        # For backward compatibility with old data structure
+        dimension_scores = [
+            quality_results["completeness"]["completeness_score"],
+            quality_results["outlier_score"],  # Use outlier score as a proxy for accuracy
+            1.0,  # Default validity score
+            1.0,  # Default uniqueness score
+            1.0,  # Default integrity score
+            quality_results["consistency_score"]  # Use consistency score
+        ]
+    
+    # Charts come from the figure cache when the same scores were drawn before
+    overall_score = quality_results["overall_quality_score"]
+    scores_key = result_fingerprint({"dimension_scores": dimension_scores, "overall_score": overall_score})
+    fig_dimensions = figure_cache.get_or_build(scores_key, "quality_radar", lambda: create_quality_radar_chart(dimension_scores))
+    fig_gauge = figure_cache.get_or_build(scores_key, "quality_gauge", lambda: create_quality_gauge_chart(overall_score))
+    
     # Improved visualization layout with modern, clean design
     return html.Div(
         [
@@ -1040,12 +1069,17 @@ def create_quality_visualizations(quality_results, df):
                                     html.P("Is your data free from unintended duplicates?"),
                                     html.P(f"Score: {quality_results['dimensions']['uniqueness']['overall_score']:.2f}" if 'dimensions' in quality_results else "Score: 1.00 (Not calculated in this version)"),
                                     html.P(f"Duplicate rows: {quality_results['dimensions']['uniqueness']['duplicate_rows']}" if 'dimensions' in quality_results else ""),
+                                    html.Div([
+                                        dbc.Button("Find near-duplicate rows", id="near-duplicates-btn", color="link", size="sm", className="p-0 mb-2"),
+                                        html.Div(id="near-duplicates-output"),
+                                    ]) if 'dimensions' in quality_results else html.Div(),
                                     html.P("Computation: Analyzes duplicate values in columns and duplicate rows. Higher score means fewer duplicates.", className="small text-muted"),
                                     
                                     html.H6("Integrity", className="mt-3"),
                                     html.P("Can your data be consistently traced and connected across your agency?"),
                                     html.P(f"Score: {quality_results['dimensions']['integrity']['overall_score']:.2f}" if 'dimensions' in quality_results else "Score: 1.00 (Not calculated in this version)"),
                                     html.P(f"Potential ID columns: {', '.join(quality_results['dimensions']['integrity']['potential_id_columns']) if 'dimensions' in quality_results and quality_results['dimensions']['integrity']['potential_id_columns'] else 'None detected'}"),
+                                    html.P("Foreign keys: " + ", ".join(f"{' + '.join(fk['columns'])} ({fk['match_rate']:.1%} matched)" for fk in quality_results['dimensions']['integrity']['referential_integrity'])) if 'dimensions' in quality_results and quality_results['dimensions']['integrity'].get('referential_integrity') else html.Div(),
                                     html.P("Computation: Identifies potential ID columns and checks for null values. Higher weight given to ID columns. Higher score means better referential integrity.", className="small text-muted"),
                                     
                                     html.H6("Consistency", className="mt-3"),
@@ -1103,9 +1137,11 @@ def create_quality_visualizations(quality_results, df):
                                 # Show custom constraints results if available
                                 html.Div([
                                     html.H6("Custom Constraints Results", className="mb-3"),
-                                    html.P(f"Overall Constraints Score: {quality_results.get('custom_constraints', {}).get('overall_score', 1.0):.2f}", className="mb-2"),
+                                    html.P(constraints_score_text(quality_results.get('custom_constraints', {})), className="mb-2"),
                                     html.P([
                                         f"Passed: {quality_results.get('custom_constraints', {}).get('pass_count', 0)}/{quality_results.get('custom_constraints', {}).get('total_count', 0)} constraints",
+                                        f" ({quality_results['custom_constraints']['skipped_count']} not checked)"
+                                        if quality_results.get('custom_constraints', {}).get('skipped_count') else "",
                                     ], className="mb-3"),
                                     
                                     # Create constraints results table
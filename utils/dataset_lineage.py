@@ -0,0 +1,239 @@
+"""
+Dataset lineages for the Data Privacy Assist application.
+A lineage follows a CSV file that grows by appended batches between uploads. The
+streaming analyzer state of its latest version (per-column accumulators and the
+duplicate-row sketch) is persisted, so an upload that extends it is analyzed by
+folding in only the appended rows.
+"""
+
+import io
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.analysis_executor import AnalysisProgress
+from utils.streaming_analyzer import (
+    STREAMING_CHUNK_ROWS,
+    CsvSource,
+    StreamingDatasetAnalyzer,
+    analyze_csv_stream,
+    read_csv_columns
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bytes read at a time while hashing the part of a new upload shared with a lineage
+HASH_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def _open_binary(source: CsvSource) -> BinaryIO:
+    """Open a path or raw bytes as a binary file object."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+
+def _source_size(source: CsvSource) -> int:
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    return os.path.getsize(source)
+
+
+def _header_line(source: CsvSource) -> bytes:
+    """Return the first line of a CSV file, without its line terminator."""
+    with _open_binary(source) as f:
+        return f.readline().rstrip(b"\r\n")
+
+
+class LineageStore:
+    """
+    Persisted analyzer state of growing CSV files.
+
+    Each lineage records the size, SHA-256 and header of its latest version
+    and the pickled StreamingDatasetAnalyzer of that version. A new file
+    continues a lineage when the lineage's latest version is a byte prefix of
+    it ending on a line boundary; only the rows after that prefix are parsed.
+    The new version then becomes the lineage's latest one.
+    """
+
+    def __init__(self, storage_dir: str = "./uploads/lineages"):
+        """
+        Initialize the lineage store.
+
+        Args:
+            storage_dir: Directory holding the lineage index and analyzer states
+        """
+        self.storage_dir = storage_dir
+        self._index_path = os.path.join(storage_dir, "lineages.json")
+        self._lock = threading.Lock()
+
+        os.makedirs(storage_dir, exist_ok=True)
+
+    def _state_path(self, lineage_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{lineage_id}.pkl")
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self._index_path):
+            return {}
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _load_state(self, lineage_id: str) -> Optional[StreamingDatasetAnalyzer]:
+        try:
+            with open(self._state_path(lineage_id), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Lineage {lineage_id[:12]} has no usable analyzer state: {e}")
+            return None
+
+    def _save(self, lineage_id: str, analyzer: StreamingDatasetAnalyzer, record: Dict[str, Any]) -> None:
+        tmp_path = self._state_path(lineage_id) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(analyzer, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            os.replace(tmp_path, self._state_path(lineage_id))
+            index = self._read_index()
+            index[lineage_id] = record
+            self._write_index(index)
+
+    def find_parent(self, source: CsvSource, handle: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the lineage a file continues.
+
+        Candidates with the same header and a smaller (or equal) size are
+        checked by hashing the file once up to the largest candidate size.
+
+        Args:
+            source: Path of the file or its raw bytes
+            handle: SHA-256 of the whole file, if already known
+
+        Returns:
+            tuple: (lineage_id, record) of the longest matching version, or None
+        """
+        with self._lock:
+            index = self._read_index()
+        size = _source_size(source)
+        header = _header_line(source).decode("utf-8", errors="replace")
+
+        candidates = sorted(
+            ((record["size"], lineage_id) for lineage_id, record in index.items()
+             if record["header"] == header and record["size"] <= size),
+            reverse=True,
+        )
+        if not candidates:
+            return None
+        if handle is not None:
+            for lineage_id, record in index.items():
+                if record["sha256"] == handle:
+                    return lineage_id, record
+
+        # Hash the file once; compare the digest at each candidate size on the way
+        boundaries = {}
+        for candidate_size, lineage_id in candidates:
+            boundaries.setdefault(candidate_size, []).append(lineage_id)
+        digest = hashlib.sha256()
+        position = 0
+        matches = []
+        with _open_binary(source) as f:
+            for boundary in sorted(boundaries):
+                while position < boundary:
+                    block = f.read(min(HASH_BLOCK_BYTES, boundary - position))
+                    if not block:
+                        break
+                    digest.update(block)
+                    position += len(block)
+                # The appended part must start on a new line
+                next_byte = f.read(1)
+                f.seek(position)
+                for lineage_id in boundaries[boundary]:
+                    record = index[lineage_id]
+                    if digest.hexdigest() == record["sha256"] and (
+                            record["ends_with_newline"] or next_byte in (b"", b"\n", b"\r")):
+                        matches.append((boundary, lineage_id))
+        if not matches:
+            return None
+        _, lineage_id = max(matches)
+        return lineage_id, index[lineage_id]
+
+    def _read_appended_chunks(self, source: CsvSource, offset: int, columns: List[str],
+                              analyzer: StreamingDatasetAnalyzer, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Parse the rows after a byte offset with the lineage's columns and text column types."""
+        # Same rule as read_csv_chunks: columns first parsed as text stay text
+        text_columns = {col: str for col, accumulator in analyzer.columns.items() if accumulator.dtype == "object"}
+        with _open_binary(source) as f:
+            f.seek(offset)
+            yield from pd.read_csv(f, header=None, names=columns, dtype=text_columns, chunksize=chunksize)
+
+    def analyze(self, source: CsvSource, handle: Optional[str] = None, chunksize: int = STREAMING_CHUNK_ROWS,
+                scan_mode: str = "auto", progress: Optional[AnalysisProgress] = None) -> StreamingDatasetAnalyzer:
+        """
+        Analyze a CSV file, continuing the lineage it extends.
+
+        Args:
+            source: Path of the file or its raw bytes
+            handle: SHA-256 of the whole file, if already known
+            chunksize: Number of rows per chunk
+            scan_mode: PII scan mode, see scan_sensitive_patterns
+            progress: Progress advanced after every parsed chunk
+
+        Returns:
+            StreamingDatasetAnalyzer: Analyzer holding the state of the whole file
+        """
+        if handle is None:
+            with _open_binary(source) as f:
+                digest = hashlib.sha256()
+                for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+                    digest.update(block)
+            handle = digest.hexdigest()
+
+        size = _source_size(source)
+        with _open_binary(source) as f:
+            f.seek(max(size - 1, 0))
+            ends_with_newline = f.read(1) in (b"\n", b"\r")
+        record = {
+            "size": size,
+            "sha256": handle,
+            "header": _header_line(source).decode("utf-8", errors="replace"),
+            "ends_with_newline": ends_with_newline,
+        }
+
+        parent = self.find_parent(source, handle)
+        analyzer = self._load_state(parent[0]) if parent else None
+        if analyzer is None:
+            analyzer = analyze_csv_stream(source, chunksize, scan_mode, progress)
+            self._save(handle, analyzer, dict(record, rows=analyzer.row_count))
+            logger.info(f"Started lineage {handle[:12]} with {analyzer.row_count} rows")
+            return analyzer
+
+        lineage_id, parent_record = parent
+        if parent_record["sha256"] == handle:
+            return analyzer
+
+        previous_rows = analyzer.row_count
+        for chunk in self._read_appended_chunks(source, parent_record["size"], read_csv_columns(source),
+                                                analyzer, chunksize):
+            analyzer.update(chunk)
+            if progress is not None:
+                progress.advance(f"Read {analyzer.row_count - previous_rows:,} appended rows")
+        self._save(lineage_id, analyzer, dict(record, rows=analyzer.row_count))
+        logger.info(f"Lineage {lineage_id[:12]}: folded in {analyzer.row_count - previous_rows} appended rows, "
+                    f"{analyzer.row_count} in total")
+        return analyzer
+
+
+# Shared lineage store used by the incremental analysis mode
+lineage_store = LineageStore(storage_dir=os.path.join(os.getenv("UPLOAD_FOLDER", "./uploads"), "lineages"))
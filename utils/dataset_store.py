@@ -0,0 +1,413 @@
+"""
+Server-side dataset registry for the Data Privacy Assist application.
+Uploaded datasets are parsed once, persisted as Parquet files keyed by a content hash
+and kept in a small in-memory LRU, so Dash stores only carry a short dataset handle.
+Files too large to parse in memory are kept as raw CSV sources for streaming analysis.
+Expensive derived results can also be persisted next to the dataset, so analyses running
+in other processes (background callbacks, other server workers) share them.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Handles are hex SHA-256 digests; anything else coming back from the browser is rejected
+HANDLE_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Characters of artifact names replaced when they are used in file names
+ARTIFACT_NAME_UNSAFE = re.compile(r'[^0-9A-Za-z_.-]')
+
+
+class DatasetRegistry:
+    """
+    Registry of uploaded datasets keyed by the SHA-256 hash of their content.
+
+    Frames are written to disk in Parquet form and the most recently used ones
+    are kept in memory, so callbacks receive the already-parsed frame instead of
+    decoding a JSON payload sent back from the browser.
+
+    Files registered as sources are never parsed as a whole; callbacks read
+    them chunk by chunk from source_path().
+
+    Cached frames are shared between callbacks and must be treated as read-only.
+    """
+
+    def __init__(self, storage_dir: str = "./uploads/datasets", max_cached: int = 4):
+        """
+        Initialize the dataset registry.
+
+        Args:
+            storage_dir: Directory where the Parquet copies of the datasets are stored
+            max_cached: Maximum number of parsed frames kept in memory
+        """
+        self.storage_dir = storage_dir
+        self.max_cached = max_cached
+        self._frames = OrderedDict()
+        self._sources = OrderedDict()
+        self._artifacts = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(storage_dir, exist_ok=True)
+
+    @staticmethod
+    def compute_handle(content: bytes) -> str:
+        """
+        Compute the dataset handle for the raw content of an uploaded file.
+
+        Args:
+            content: Raw bytes of the uploaded file
+
+        Returns:
+            str: Hex SHA-256 digest used as the dataset handle
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def fingerprint_frame(df: pd.DataFrame) -> str:
+        """
+        Compute a content hash for a frame that has no raw file behind it.
+
+        Args:
+            df: The pandas DataFrame to fingerprint
+
+        Returns:
+            str: Hex SHA-256 digest of the column names and row hashes
+        """
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    def _parquet_path(self, handle: str) -> str:
+        return os.path.join(self.storage_dir, f"{handle}.parquet")
+
+    def _pickle_path(self, handle: str) -> str:
+        return os.path.join(self.storage_dir, f"{handle}.pkl")
+
+    def _arrow_path(self, handle: str) -> str:
+        return os.path.join(self.storage_dir, f"{handle}.arrow")
+
+    def _csv_path(self, handle: str) -> str:
+        return os.path.join(self.storage_dir, f"{handle}.csv")
+
+    def _artifact_path(self, handle: str, name: str) -> str:
+        return os.path.join(self.storage_dir, f"{handle}.{ARTIFACT_NAME_UNSAFE.sub('_', name)}.artifact.pkl")
+
+    def _load_persisted_artifact(self, handle: str, name: str) -> Optional[Any]:
+        """Load an artifact persisted by another process, or return None if there is none."""
+        try:
+            with open(self._artifact_path(handle, name), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable artifact {name} of dataset {handle[:12]}: {e}")
+            return None
+
+    def _persist_artifact(self, handle: str, name: str, artifact: Any) -> None:
+        """Write an artifact next to the dataset; a concurrent writer of the same artifact is harmless."""
+        path = self._artifact_path(handle, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, TypeError) as e:
+            logger.warning(f"Artifact {name} of dataset {handle[:12]} is not persisted: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remember(self, handle: str, df: pd.DataFrame) -> None:
+        """Insert a frame into the in-memory LRU, evicting the least recently used ones."""
+        with self._lock:
+            self._frames[handle] = df
+            self._frames.move_to_end(handle)
+            while len(self._frames) > self.max_cached:
+                evicted, _ = self._frames.popitem(last=False)
+                if evicted not in self._sources:
+                    self._artifacts.pop(evicted, None)
+
+    def _remember_source(self, handle: str) -> None:
+        """Mark a streamed source as recently used so its artifacts stay cached."""
+        with self._lock:
+            self._sources[handle] = self._csv_path(handle)
+            self._sources.move_to_end(handle)
+            while len(self._sources) > self.max_cached:
+                evicted, _ = self._sources.popitem(last=False)
+                if evicted not in self._frames:
+                    self._artifacts.pop(evicted, None)
+
+    def _has_parsed_copy(self, handle: str) -> bool:
+        """Check whether a parsed copy of a dataset was written to disk, by this or another process."""
+        return os.path.exists(self._parquet_path(handle)) or os.path.exists(self._pickle_path(handle))
+
+    def contains(self, handle: Optional[str]) -> bool:
+        """Check whether a handle refers to a registered dataset."""
+        if not handle or not HANDLE_PATTERN.match(handle):
+            return False
+        return (handle in self._frames
+                or os.path.exists(self._parquet_path(handle))
+                or os.path.exists(self._pickle_path(handle))
+                or os.path.exists(self._csv_path(handle)))
+
+    def register(self, df: pd.DataFrame, content: Optional[bytes] = None, handle: Optional[str] = None) -> str:
+        """
+        Register a parsed dataset and return its handle.
+
+        Args:
+            df: The parsed pandas DataFrame
+            content: Raw bytes of the uploaded file, used to derive the handle
+            handle: Precomputed handle of the raw file (e.g. hashed while it was uploaded)
+
+        Returns:
+            str: Handle under which the dataset can be loaded again
+        """
+        if handle is None:
+            handle = self.compute_handle(content) if content is not None else self.fingerprint_frame(df)
+
+        # A raw CSV of the same content (kept as a streaming source) does not count: only a
+        # parsed copy lets other processes load the frame
+        if not self._has_parsed_copy(handle):
+            # Write to a temporary file first so a failed write never leaves a truncated dataset behind
+            tmp_path = os.path.join(self.storage_dir, f".{handle}.tmp")
+            try:
+                # Parquet stores column names as strings; labels such as Excel year headers (2020)
+                # must come back unchanged, or constraints and stored column names no longer match
+                if not all(isinstance(col, str) for col in df.columns):
+                    raise TypeError("column names that are not strings are not preserved by Parquet")
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, self._parquet_path(handle))
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                # Mixed-type object columns (or non-string column names) cannot be expressed in
+                # Arrow; keep a pickle instead
+                logger.warning(f"Falling back to pickle storage for dataset {handle[:12]}: {e}")
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._pickle_path(handle))
+            logger.info(f"Registered dataset {handle[:12]} with {df.shape[0]} rows and {df.shape[1]} columns")
+
+        self._remember(handle, df)
+        return handle
+
+    def register_source(self, content: bytes) -> str:
+        """
+        Register a raw CSV file for streaming analysis without parsing it.
+
+        Args:
+            content: Raw bytes of the uploaded file
+
+        Returns:
+            str: Handle under which the source path can be looked up
+        """
+        handle = self.compute_handle(content)
+        csv_path = self._csv_path(handle)
+
+        if not os.path.exists(csv_path):
+            tmp_path = os.path.join(self.storage_dir, f".{handle}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, csv_path)
+            logger.info(f"Registered streaming source {handle[:12]} of {len(content)} bytes")
+
+        self._remember_source(handle)
+        return handle
+
+    def register_source_file(self, path: str, handle: str) -> str:
+        """
+        Register a CSV file already on disk for streaming analysis, moving it into storage.
+
+        Args:
+            path: Path of the file; it is moved, not copied
+            handle: SHA-256 of the file content
+
+        Returns:
+            str: Handle under which the source path can be looked up
+        """
+        if not HANDLE_PATTERN.match(handle):
+            raise KeyError(f"Invalid dataset handle: {handle!r}")
+        csv_path = self._csv_path(handle)
+
+        if os.path.exists(csv_path):
+            os.remove(path)
+        else:
+            os.replace(path, csv_path)
+            logger.info(f"Registered streaming source {handle[:12]} of {os.path.getsize(csv_path)} bytes")
+
+        self._remember_source(handle)
+        return handle
+
+    def source_path(self, handle: Optional[str]) -> Optional[str]:
+        """
+        Return the path of a dataset registered as a streaming source.
+
+        Args:
+            handle: Dataset handle
+
+        Returns:
+            str: Path of the raw CSV file, or None if the dataset is not a streaming source
+            or a parsed copy of it exists (e.g. it was uploaded again under a higher threshold)
+        """
+        if not handle or not HANDLE_PATTERN.match(handle):
+            return None
+        csv_path = self._csv_path(handle)
+        if not os.path.exists(csv_path):
+            return None
+        if self._has_parsed_copy(handle):
+            return None
+        self._remember_source(handle)
+        return csv_path
+
+    def load(self, handle: str) -> pd.DataFrame:
+        """
+        Load a registered dataset by its handle.
+
+        Args:
+            handle: Handle returned by register()
+
+        Returns:
+            pd.DataFrame: The parsed dataset
+
+        Raises:
+            KeyError: If the handle is unknown
+        """
+        if not handle or not HANDLE_PATTERN.match(handle):
+            raise KeyError(f"Invalid dataset handle: {handle!r}")
+
+        with self._lock:
+            if handle in self._frames:
+                self._frames.move_to_end(handle)
+                return self._frames[handle]
+
+        parquet_path = self._parquet_path(handle)
+        pickle_path = self._pickle_path(handle)
+        if os.path.exists(parquet_path):
+            df = pq.read_table(parquet_path, memory_map=True).to_pandas()
+        elif os.path.exists(pickle_path):
+            with open(pickle_path, "rb") as f:
+                df = pickle.load(f)
+        elif os.path.exists(self._csv_path(handle)):
+            raise KeyError(f"Dataset {handle} is a streaming source and is never loaded as a whole")
+        else:
+            raise KeyError(f"Unknown dataset handle: {handle}")
+
+        self._remember(handle, df)
+        return df
+
+    def shared_path(self, handle: str) -> Optional[str]:
+        """
+        Return the path of an uncompressed Arrow IPC copy of a dataset, writing it on first use.
+
+        Worker processes memory-map this file and read columns straight from the
+        page cache, so the frame is never pickled to them.
+
+        Args:
+            handle: Handle returned by register()
+
+        Returns:
+            str: Path of the Arrow file, or None if the dataset cannot be expressed in Arrow
+        """
+        arrow_path = self._arrow_path(handle)
+        if os.path.exists(arrow_path):
+            return arrow_path
+
+        df = self.load(handle)
+        tmp_path = os.path.join(self.storage_dir, f".{handle}.arrow.tmp")
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, arrow_path)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.warning(f"Dataset {handle[:12]} has no shared Arrow copy: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        return arrow_path
+
+    def get_artifact(self, handle: str, name: str, builder: Callable[[], Any], persist: bool = False) -> Any:
+        """
+        Return an object derived from a dataset, building it on first use.
+
+        Artifacts such as column profiles live next to the cached frame and are
+        evicted together with it. Persisted artifacts are also pickled into the
+        storage directory, so another process (e.g. a background callback job)
+        loads them instead of building them again.
+
+        Args:
+            handle: Handle of the dataset the artifact belongs to
+            name: Name of the artifact
+            builder: Zero-argument callable that computes the artifact
+            persist: Whether to keep the artifact on disk as well
+
+        Returns:
+            The cached or freshly built artifact
+        """
+        with self._lock:
+            artifacts = self._artifacts.get(handle)
+            if artifacts is not None and name in artifacts:
+                return artifacts[name]
+
+        artifact = self._load_persisted_artifact(handle, name) if persist else None
+        if artifact is None:
+            artifact = builder()
+            if persist:
+                self._persist_artifact(handle, name, artifact)
+
+        with self._lock:
+            # Only keep artifacts for datasets that are still held in memory or streamed
+            if handle in self._frames or handle in self._sources:
+                artifact = self._artifacts.setdefault(handle, {}).setdefault(name, artifact)
+        return artifact
+
+    def load_artifact(self, handle: Optional[str], name: str) -> Optional[Any]:
+        """
+        Return an artifact persisted next to a dataset, or None if there is none.
+
+        Unlike get_artifact(), nothing is built or held in memory; callers that
+        keep their own cache (e.g. the constraint outcomes) use this with save_artifact().
+
+        Args:
+            handle: Handle of the dataset the artifact belongs to
+            name: Name of the artifact
+
+        Returns:
+            The persisted artifact, or None
+        """
+        if not handle or not HANDLE_PATTERN.match(handle):
+            return None
+        return self._load_persisted_artifact(handle, name)
+
+    def save_artifact(self, handle: Optional[str], name: str, artifact: Any) -> None:
+        """
+        Persist an artifact next to a dataset; anything but a dataset handle is ignored.
+
+        Args:
+            handle: Handle of the dataset the artifact belongs to
+            name: Name of the artifact
+            artifact: Picklable object to persist
+        """
+        if not handle or not HANDLE_PATTERN.match(handle):
+            return
+        self._persist_artifact(handle, name, artifact)
+
+
+# Shared registry used by the Dash callbacks
+dataset_registry = DatasetRegistry(
+    storage_dir=os.path.join(os.getenv("UPLOAD_FOLDER", "./uploads"), "datasets"),
+    max_cached=int(os.getenv("DATASET_CACHE_SIZE", "4")),
+)
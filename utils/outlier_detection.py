@@ -0,0 +1,447 @@
+"""
+Outlier detection service for the Data Privacy Assist application.
+Fits one outlier model per numeric column and caches its predictions, so the accuracy
+dimension, the legacy outlier metrics and repeated analysis runs share a single fit.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+from utils.analysis_executor import AnalysisProgress, analysis_executor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Engines of the accuracy dimension: a per-column IsolationForest, vectorized robust statistics,
+# or one IsolationForest over all numeric columns whose outlier rows are attributed to columns
+ACCURACY_ENGINES = ("isolation_forest", "iqr", "mad", "multivariate")
+DEFAULT_ACCURACY_ENGINE = "isolation_forest"
+
+# Parameters of the IsolationForest used by the quality analysis
+DEFAULT_CONTAMINATION = 0.1
+DEFAULT_RANDOM_STATE = 42
+DEFAULT_MAX_SAMPLES = "auto"
+
+# Tukey fences: values further than this many IQRs outside the quartiles are outliers
+IQR_FACTOR = 1.5
+
+# Modified z-score (Iglewicz & Hoaglin) above which a value is an outlier
+MAD_THRESHOLD = 3.5
+MAD_NORMAL_CONSISTENCY = 0.6745
+# Scale of the mean absolute deviation, used when more than half the values equal the median
+MEAN_AD_NORMAL_CONSISTENCY = 0.7979
+
+# Standard deviations per IQR of a normal distribution, used to compare deviations across columns
+IQR_NORMAL_CONSISTENCY = 1.349
+
+# Outlier rows listed individually, most anomalous first, in the multivariate results
+MULTIVARIATE_ROW_LIMIT = 1000
+
+# Elements partitioned at once by the robust engines, bounding their working memory
+QUANTILE_BLOCK_ELEMENTS = 2 ** 24
+
+
+def column_fingerprint(column: pd.Series) -> str:
+    """
+    Hash the values of a column, for callers that have no dataset handle to key the cache with.
+
+    Args:
+        column: The pandas Series to fingerprint
+
+    Returns:
+        str: Hex digest of the column's row hashes, in row order (cached per-row results
+        must not be reused for a reordered column)
+    """
+    row_hashes = np.ascontiguousarray(pd.util.hash_pandas_object(column, index=False).to_numpy())
+    return f"{len(row_hashes)}:{hashlib.sha256(row_hashes.tobytes()).hexdigest()}"
+
+
+def numeric_matrix(df: pd.DataFrame, columns: Sequence) -> np.ndarray:
+    """Stack numeric columns into a float64 matrix with NaN for missing values."""
+    return np.column_stack([
+        df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in columns
+    ]) if len(columns) else np.empty((len(df), 0))
+
+
+def _partition_quantiles(block: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Exact linear-interpolation quantiles of the columns of a NaN-free block, via np.partition."""
+    n_rows = block.shape[0]
+    positions = np.asarray(quantiles, dtype=np.float64) * (n_rows - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    partitioned = np.partition(block, np.unique(np.concatenate([lower, upper])), axis=0)
+    fraction = (positions - lower)[:, None]
+    return partitioned[lower] + (partitioned[upper] - partitioned[lower]) * fraction
+
+
+def column_quantiles(matrix: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Compute exact quantiles of every column of a matrix, ignoring missing values.
+
+    Columns without missing values are partitioned together in 2-D blocks; columns
+    with missing values are partitioned one by one over their non-null values.
+    Results equal np.nanquantile with the default linear interpolation.
+
+    Args:
+        matrix: Float matrix, one column per variable, NaN for missing values
+        quantiles: Quantiles to compute, between 0 and 1
+
+    Returns:
+        np.ndarray: Array of shape (len(quantiles), n_columns); NaN for empty columns
+    """
+    n_rows, n_columns = matrix.shape
+    result = np.full((len(quantiles), n_columns), np.nan)
+    has_nulls = np.isnan(matrix).any(axis=0)
+
+    complete = np.flatnonzero(~has_nulls)
+    if n_rows and len(complete):
+        block_columns = max(1, QUANTILE_BLOCK_ELEMENTS // n_rows)
+        for start in range(0, len(complete), block_columns):
+            indices = complete[start:start + block_columns]
+            result[:, indices] = _partition_quantiles(matrix[:, indices], quantiles)
+
+    for index in np.flatnonzero(has_nulls):
+        values = matrix[:, index]
+        values = values[~np.isnan(values)]
+        if len(values):
+            result[:, index] = _partition_quantiles(values[:, None], quantiles)[:, 0]
+    return result
+
+
+def robust_outlier_masks(matrix: np.ndarray, engine: str, iqr_factor: float = IQR_FACTOR,
+                         mad_threshold: float = MAD_THRESHOLD) -> np.ndarray:
+    """
+    Flag outliers in every column of a matrix with robust statistics.
+
+    "iqr" flags values outside the Tukey fences [Q1 - f*IQR, Q3 + f*IQR];
+    "mad" flags values whose modified z-score 0.6745 * |x - median| / MAD
+    exceeds the threshold. Missing values are never outliers.
+
+    Args:
+        matrix: Float matrix, one column per variable, NaN for missing values
+        engine: "iqr" or "mad"
+        iqr_factor: Width of the Tukey fences in IQRs
+        mad_threshold: Modified z-score above which a value is an outlier
+
+    Returns:
+        np.ndarray: Boolean matrix of the same shape, True for outliers
+    """
+    if engine == "iqr":
+        q1, q3 = column_quantiles(matrix, [0.25, 0.75])
+        spread = q3 - q1
+        with np.errstate(invalid="ignore"):
+            return (matrix < q1 - iqr_factor * spread) | (matrix > q3 + iqr_factor * spread)
+
+    if engine == "mad":
+        median = column_quantiles(matrix, [0.5])[0]
+        deviations = np.abs(matrix - median)
+        mad = column_quantiles(deviations, [0.5])[0]
+        scale = mad / MAD_NORMAL_CONSISTENCY
+        # With a zero MAD every value off the median would be an outlier; fall back to the mean deviation
+        degenerate = ~(mad > 0)
+        if degenerate.any():
+            degenerate_deviations = deviations[:, degenerate]
+            counts = (~np.isnan(degenerate_deviations)).sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean_deviation = np.nansum(degenerate_deviations, axis=0) / counts
+            scale[degenerate] = mean_deviation / MEAN_AD_NORMAL_CONSISTENCY
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (scale > 0) & (deviations / scale > mad_threshold)
+
+    raise ValueError(f"Unsupported accuracy engine: {engine}")
+
+
+def isolation_forest_mask(values: np.ndarray, contamination: float = DEFAULT_CONTAMINATION,
+                          random_state: int = DEFAULT_RANDOM_STATE, max_samples=DEFAULT_MAX_SAMPLES,
+                          n_jobs: Optional[int] = None) -> np.ndarray:
+    """
+    Flag the outliers of a single numeric variable with an IsolationForest.
+
+    Equivalent to IsolationForest(contamination=...).fit_predict(values) == -1,
+    but every distinct value is scored once and the rows are scored only once
+    (fit_predict scores them twice: to set the threshold and to predict).
+
+    Args:
+        values: 1-D float array without missing values
+        contamination: Expected proportion of outliers
+        random_state: Seed of the forest
+        max_samples: Rows drawn to build each tree
+        n_jobs: Parallel jobs for fitting and scoring
+
+    Returns:
+        np.ndarray: Boolean mask, True for outlier rows
+    """
+    X = values.reshape(-1, 1)
+    clf = IsolationForest(random_state=random_state, max_samples=max_samples, n_jobs=n_jobs).fit(X)
+    distinct_values, inverse = np.unique(values, return_inverse=True)
+    scores = clf.score_samples(distinct_values.reshape(-1, 1))[inverse.reshape(-1)]
+    return scores < np.percentile(scores, 100.0 * contamination)
+
+
+def multivariate_outliers(matrix: np.ndarray, contamination: float = DEFAULT_CONTAMINATION,
+                          random_state: int = DEFAULT_RANDOM_STATE, max_samples=DEFAULT_MAX_SAMPLES,
+                          n_jobs: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flag anomalous rows with a single IsolationForest over all columns of a matrix.
+
+    Missing and infinite values are filled with the column median. Each outlier
+    row is attributed to the column where it deviates most from the median, in
+    IQR-scaled units, so the per-column accuracy can still be reported.
+
+    Args:
+        matrix: Float matrix, one column per variable, NaN for missing values;
+            every column needs at least one finite value
+        contamination: Expected proportion of outliers
+        random_state: Seed of the forest
+        max_samples: Rows drawn to build each tree
+        n_jobs: Parallel jobs for fitting and scoring
+
+    Returns:
+        tuple: Outlier row positions, their scores (lower is more anomalous) and
+        the index of the column each one is attributed to
+    """
+    matrix = np.where(np.isfinite(matrix), matrix, np.nan)
+    q1, median, q3 = column_quantiles(matrix, [0.25, 0.5, 0.75])
+    filled = np.where(np.isnan(matrix), median, matrix)
+
+    clf = IsolationForest(random_state=random_state, max_samples=max_samples, n_jobs=n_jobs).fit(filled)
+    scores = clf.score_samples(filled)
+    rows = np.flatnonzero(scores < np.percentile(scores, 100.0 * contamination))
+
+    scale = (q3 - q1) / IQR_NORMAL_CONSISTENCY
+    scale[~(scale > 0)] = 1.0
+    top_columns = np.empty(len(rows), dtype=np.int32)
+    block_rows = max(1, QUANTILE_BLOCK_ELEMENTS // max(1, matrix.shape[1]))
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        top_columns[start:start + block_rows] = np.argmax(np.abs(filled[block] - median) / scale, axis=1)
+    return rows, scores[rows], top_columns
+
+
+def _packed_column_mask(column: pd.Series, contamination: float, random_state: int, max_samples,
+                        n_jobs: Optional[int]) -> Optional[Tuple[np.ndarray, int]]:
+    """Fit one column's IsolationForest and return its bit-packed mask, or None if the fit fails; runs in workers."""
+    try:
+        mask = OutlierDetector.fit_predict(column, contamination, random_state, max_samples, n_jobs)
+    except Exception as e:
+        logger.warning(f"Outlier detection failed for column {column.name!r}: {e}")
+        return None
+    return np.packbits(mask), len(mask)
+
+
+class OutlierDetector:
+    """
+    Outlier predictions per column, cached by (dataset, column, parameters).
+
+    Predictions are stored as bit-packed masks (one bit per row) in a small LRU,
+    so keeping many columns around costs an eighth of a byte per row each; the
+    multivariate model stores only its outlier rows. Cached predictions are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256, n_jobs: Optional[int] = None):
+        """
+        Initialize the outlier detector.
+
+        Args:
+            max_entries: Maximum number of column predictions kept in memory
+            n_jobs: Parallel jobs used by the IsolationForest engine
+        """
+        self.max_entries = max_entries
+        self.n_jobs = n_jobs
+        self._predictions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fit_predict(column: pd.Series, contamination: float = DEFAULT_CONTAMINATION,
+                    random_state: int = DEFAULT_RANDOM_STATE, max_samples=DEFAULT_MAX_SAMPLES,
+                    n_jobs: Optional[int] = None) -> np.ndarray:
+        """
+        Fit an IsolationForest on a numeric column and flag its outliers.
+
+        Missing values are filled with the column median before fitting.
+
+        Args:
+            column: Numeric pandas Series
+            contamination: Expected proportion of outliers
+            random_state: Seed of the forest
+            max_samples: Rows drawn to build each tree
+            n_jobs: Parallel jobs for fitting and scoring
+
+        Returns:
+            np.ndarray: Boolean mask, True for outlier rows
+        """
+        values = column.fillna(column.median()).to_numpy(dtype=np.float64)
+        return isolation_forest_mask(values, contamination, random_state, max_samples, n_jobs)
+
+    def _lookup(self, key: Tuple) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._predictions.get(key)
+            if entry is not None:
+                self._predictions.move_to_end(key)
+            return entry
+
+    def _store(self, key: Tuple, entry: Tuple) -> None:
+        with self._lock:
+            self._predictions[key] = entry
+            self._predictions.move_to_end(key)
+            while len(self._predictions) > self.max_entries:
+                self._predictions.popitem(last=False)
+
+    @staticmethod
+    def _engine_parameters(engine: str, contamination: float, random_state: int, max_samples) -> Tuple:
+        """Return the parameters that determine an engine's predictions, for the cache key."""
+        if engine == "isolation_forest":
+            return (contamination, random_state, max_samples)
+        if engine == "iqr":
+            return (IQR_FACTOR,)
+        if engine == "mad":
+            return (MAD_THRESHOLD,)
+        if engine == "multivariate":
+            return (contamination, random_state, max_samples)
+        raise ValueError(f"Unsupported accuracy engine: {engine}")
+
+    def outlier_masks(self, df: pd.DataFrame, columns: Sequence, dataset_key: Optional[Hashable] = None,
+                      engine: str = DEFAULT_ACCURACY_ENGINE, contamination: float = DEFAULT_CONTAMINATION,
+                      random_state: int = DEFAULT_RANDOM_STATE, max_samples=DEFAULT_MAX_SAMPLES,
+                      shared_path: Optional[str] = None,
+                      progress: Optional[AnalysisProgress] = None) -> Dict[Hashable, np.ndarray]:
+        """
+        Return the outlier masks of numeric columns, computing only the ones not cached yet.
+
+        The IsolationForest engine fits one model per column, spread over the
+        analysis executor's workers. The robust engines
+        handle every uncached column in one vectorized pass over a 2-D matrix.
+        The multivariate engine fits one model over all columns and gives each
+        column the outlier rows attributed to it, see row_outliers().
+
+        Args:
+            df: The pandas DataFrame holding the columns
+            columns: Numeric columns to analyze
+            dataset_key: Identifier of the dataset (e.g. its registry handle); a
+                content hash of each column is used when omitted
+            engine: One of ACCURACY_ENGINES
+            contamination: Expected proportion of outliers (IsolationForest)
+            random_state: Seed of the forest (IsolationForest)
+            max_samples: Rows drawn to build each tree (IsolationForest)
+            shared_path: Arrow copy of the frame that worker processes read columns from
+            progress: Progress advanced as each isolation forest is fitted
+
+        Returns:
+            dict: Mapping of column to boolean outlier mask; columns whose model
+            cannot be fitted (e.g. entirely missing) are left out
+        """
+        parameters = self._engine_parameters(engine, contamination, random_state, max_samples)
+        if engine == "multivariate":
+            return self._attributed_masks(df, columns, dataset_key, contamination, random_state, max_samples)
+
+        masks = {}
+        missing: List[Tuple[Hashable, Tuple]] = []
+        for col in columns:
+            column_key = dataset_key if dataset_key is not None else column_fingerprint(df[col])
+            key = (column_key, col, len(df), engine) + parameters
+            entry = self._lookup(key)
+            if entry is None:
+                missing.append((col, key))
+            else:
+                packed, n_rows = entry
+                masks[col] = np.unpackbits(packed, count=n_rows).astype(bool)
+
+        if not missing:
+            return masks
+
+        if engine == "isolation_forest":
+            fit_column = partial(_packed_column_mask, contamination=contamination, random_state=random_state,
+                                 max_samples=max_samples, n_jobs=self.n_jobs)
+            entries = analysis_executor.map_columns(fit_column, df, [col for col, _ in missing], shared_path,
+                                                    progress, step="Checked outliers in")
+            for col, key in missing:
+                entry = entries[col]
+                if entry is None:
+                    continue
+                self._store(key, entry)
+                packed, n_rows = entry
+                masks[col] = np.unpackbits(packed, count=n_rows).astype(bool)
+        else:
+            missing_columns = [col for col, _ in missing]
+            matrix_masks = robust_outlier_masks(numeric_matrix(df, missing_columns), engine)
+            for index, (col, key) in enumerate(missing):
+                mask = matrix_masks[:, index]
+                self._store(key, (np.packbits(mask), len(mask)))
+                masks[col] = mask
+        return masks
+
+    def row_outliers(self, df: pd.DataFrame, columns: Sequence, dataset_key: Optional[Hashable] = None,
+                     contamination: float = DEFAULT_CONTAMINATION, random_state: int = DEFAULT_RANDOM_STATE,
+                     max_samples=DEFAULT_MAX_SAMPLES) -> Dict:
+        """
+        Flag anomalous rows with one model over all numeric columns, fitting it only on a cache miss.
+
+        Args:
+            df: The pandas DataFrame holding the columns
+            columns: Numeric columns to model; entirely missing ones are left out
+            dataset_key: Identifier of the dataset (e.g. its registry handle); a
+                content hash of the columns is used when omitted
+            contamination: Expected proportion of outliers
+            random_state: Seed of the forest
+            max_samples: Rows drawn to build each tree
+
+        Returns:
+            dict: "columns" modeled, outlier "rows" (positions), their "scores"
+            (lower is more anomalous) and "top_columns" (index into "columns")
+        """
+        columns = [col for col in columns if df[col].notna().any()]
+        if dataset_key is None:
+            dataset_key = tuple(column_fingerprint(df[col]) for col in columns)
+        key = (dataset_key, tuple(columns), len(df), "multivariate", contamination, random_state, max_samples)
+
+        entry = self._lookup(key)
+        if entry is None:
+            if columns and len(df):
+                entry = multivariate_outliers(numeric_matrix(df, columns), contamination, random_state,
+                                              max_samples, self.n_jobs)
+            else:
+                entry = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int32))
+            self._store(key, entry)
+
+        rows, scores, top_columns = entry
+        return {"columns": columns, "rows": rows, "scores": scores, "top_columns": top_columns}
+
+    def _attributed_masks(self, df: pd.DataFrame, columns: Sequence, dataset_key: Optional[Hashable],
+                          contamination: float, random_state: int, max_samples) -> Dict[Hashable, np.ndarray]:
+        """Per-column outlier masks of the multivariate model: the outlier rows attributed to each column."""
+        result = self.row_outliers(df, columns, dataset_key, contamination, random_state, max_samples)
+        masks = {}
+        for index, col in enumerate(result["columns"]):
+            mask = np.zeros(len(df), dtype=bool)
+            mask[result["rows"][result["top_columns"] == index]] = True
+            masks[col] = mask
+        return masks
+
+    def outlier_counts(self, df: pd.DataFrame, columns: Sequence, dataset_key: Optional[Hashable] = None,
+                       engine: str = DEFAULT_ACCURACY_ENGINE, **parameters) -> Dict[Hashable, int]:
+        """Return the number of outliers per column, see outlier_masks()."""
+        masks = self.outlier_masks(df, columns, dataset_key, engine, **parameters)
+        return {col: int(mask.sum()) for col, mask in masks.items()}
+
+    def clear(self) -> None:
+        """Drop every cached prediction."""
+        with self._lock:
+            self._predictions.clear()
+
+
+# Shared detector used by the data quality analysis
+outlier_detector = OutlierDetector(
+    max_entries=int(os.getenv("OUTLIER_CACHE_SIZE", "256")),
+    n_jobs=int(os.environ["OUTLIER_N_JOBS"]) if os.getenv("OUTLIER_N_JOBS") else None,
+)
@@ -6,7 +6,9 @@ from dash import html, dcc
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 import re
+import json
 import math
+from functools import partial
 from typing import Dict, List, Any, Tuple, Optional
 
 # Helper function for tooltips
@@ -40,8 +42,14 @@ from utils.privacy_metrics import (
     calculate_privacy_factor,
     calculate_shannon_entropy,
     calculate_hartley_measure,
-    calculate_cumulative_privacy_factor
+    calculate_cumulative_privacy_factor,
+    find_risky_combinations
 )
+from utils.column_profile import ColumnProfile, as_profile, build_column_profiles
+from utils.analysis_executor import analysis_executor
+from utils.pii_scanner import PatternScanner
+from utils.privacy_sketches import ColumnSketch
+from utils.render_cache import figure_cache, render_cache, result_fingerprint
 
 # Regular expressions for detecting sensitive data patterns
 PATTERNS = {
@@ -54,12 +62,37 @@ PATTERNS = {
     "ip_address": r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b',
 }
 
+# Number of risky column combinations listed in the technical view
+RISKY_COMBINATIONS_DISPLAY_LIMIT = 10
+
+# Columns drawn individually in the per-column charts; the rest share one "others" bar
+CHART_COLUMN_LIMIT = 25
+
+# Color of the "others" bar
+OTHERS_BAR_COLOR = "#9ca3af"
+
+# All detectors compiled into one automaton so each value is scanned once
+PII_SCANNER = PatternScanner(PATTERNS)
+
+# PII scan modes: "distinct" scans each distinct value once and weights hits by its count,
+# "rows" scans every row, "auto" picks per column based on its cardinality
+PII_SCAN_MODES = ("auto", "distinct", "rows")
+
+# Above this ratio of distinct values to non-null rows deduplication saves little, so "auto" scans rows
+DISTINCT_SCAN_MAX_CARDINALITY = 0.8
+
+# Number of rows used to estimate cardinality when no column profile is available
+CARDINALITY_SAMPLE_SIZE = 10000
+
 def uniqueness_score(column):
-    """Calculate the uniqueness score for a column.
+    """Calculate the uniqueness score for a column (a Series, its ColumnProfile or a ColumnSketch).
     A higher uniqueness score indicates higher re-identification risk."""
-    if column.nunique() == 0:
+    if isinstance(column, ColumnSketch):
+        return column.uniqueness_score()["value"]
+    profile = as_profile(column)
+    if profile.n_unique == 0:
         return 0
-    return min(1.0, column.nunique() / len(column))
+    return min(1.0, profile.n_unique / profile.length)
 
 def count_pattern_matches(column, pattern):
     """Count the number of pattern matches in a column."""
@@ -69,64 +102,137 @@ def count_pattern_matches(column, pattern):
     matches = column.str.contains(pattern, regex=True, na=False)
     return matches.sum()
 
-def calculate_privacy_risk(df):
-    """Calculate privacy risk scores for each column in the dataframe."""
-    column_scores = {}
-    
-    for col in df.columns:
-        # Skip columns with too many missing values
-        if df[col].isna().mean() > 0.5:
-            column_scores[col] = {
-                "privacy_risk_score": 0,
-                "uniqueness_score": 0,
-                "sensitive_data_score": 0,
-                "sensitivity_type": "None",
-                "samples": [],
-            }
-            continue
-        
-        uniqueness = uniqueness_score(df[col])
-        
-        # Check for sensitive data patterns
-        sensitive_count = 0
-        sensitivity_type = "None"
-        
-        for pattern_name, pattern in PATTERNS.items():
-            if pd.api.types.is_string_dtype(df[col]):
-                matches = count_pattern_matches(df[col], pattern)
-                if matches > 0:
-                    sensitive_count += matches
-                    if sensitivity_type == "None":
-                        sensitivity_type = pattern_name
-                    else:
-                        sensitivity_type += f", {pattern_name}"
-        
-        sensitive_data_score = min(1.0, sensitive_count / (len(df) or 1))
-        
-        # Calculate the overall privacy risk score (weighted average)
-        privacy_risk_score = 0.7 * uniqueness + 0.3 * sensitive_data_score
-        
-        # Get some sample values (up to 5)
-        samples = df[col].dropna().sample(min(5, len(df))).tolist() if len(df) > 0 else []
-        
-        column_scores[col] = {
-            "privacy_risk_score": privacy_risk_score,
-            "uniqueness_score": uniqueness,
-            "sensitive_data_score": sensitive_data_score,
-            "sensitivity_type": sensitivity_type,
-            "samples": samples,
-        }
+def scan_sensitive_patterns(column, profile=None, scan_mode="auto"):
+    """Count the rows of a column matching each sensitive data pattern.
+    
+    In "distinct" mode the detectors only run over the distinct values from the column's
+    factorization and the hits are multiplied by the value counts. In "auto" mode columns whose
+    cardinality is close to their row count are scanned row by row instead; without a profile
+    the cardinality is estimated from a sample so near-unique columns are never factorized.
+    """
+    if scan_mode not in PII_SCAN_MODES:
+        raise ValueError(f"Unsupported PII scan mode: {scan_mode}")
+    
+    if scan_mode == "auto":
+        if profile is not None:
+            cardinality = profile.n_unique / profile.non_null_count if profile.non_null_count else 0
+        else:
+            sample = column.dropna()
+            if len(sample) > CARDINALITY_SAMPLE_SIZE:
+                sample = sample.sample(CARDINALITY_SAMPLE_SIZE, random_state=0)
+            cardinality = sample.nunique() / len(sample) if len(sample) else 0
+        scan_mode = "distinct" if cardinality <= DISTINCT_SCAN_MAX_CARDINALITY else "rows"
+    
+    if scan_mode == "distinct":
+        profile = as_profile(profile if profile is not None else column)
+        return PII_SCANNER.scan(profile.uniques, profile.counts)
+    
+    # Missing values are not strings and never match
+    return PII_SCANNER.scan(column.to_numpy(dtype=object))
+
+def score_column_privacy(uniqueness, pattern_counts, n_rows, samples):
+    """Combine the uniqueness and sensitive pattern counts of a column into its privacy risk scores."""
+    sensitive_count = 0
+    sensitivity_type = "None"
+    
+    for pattern_name, matches in (pattern_counts or {}).items():
+        if matches > 0:
+            sensitive_count += matches
+            if sensitivity_type == "None":
+                sensitivity_type = pattern_name
+            else:
+                sensitivity_type += f", {pattern_name}"
+    
+    sensitive_data_score = min(1.0, sensitive_count / (n_rows or 1))
+    
+    # Calculate the overall privacy risk score (weighted average)
+    privacy_risk_score = 0.7 * uniqueness + 0.3 * sensitive_data_score
+    
+    return {
+        "privacy_risk_score": privacy_risk_score,
+        "uniqueness_score": uniqueness,
+        "sensitive_data_score": sensitive_data_score,
+        "sensitivity_type": sensitivity_type,
+        "samples": samples,
+    }
+
+def sparse_column_privacy():
+    """Privacy risk scores of a column skipped for having too many missing values."""
+    return {
+        "privacy_risk_score": 0,
+        "uniqueness_score": 0,
+        "sensitive_data_score": 0,
+        "sensitivity_type": "None",
+        "samples": [],
+    }
+
+def column_privacy_risk(column, profile=None, scan_mode="auto"):
+    """Calculate the privacy risk scores of one column; builds its profile when not given (e.g. in a worker process)."""
+    profile = profile if profile is not None else ColumnProfile(column)
+    
+    # Skip columns with too many missing values
+    if profile.missing_ratio > 0.5:
+        return sparse_column_privacy()
+    
+    uniqueness = uniqueness_score(profile)
+    
+    # Check for sensitive data patterns in a single pass over the column
+    pattern_counts = scan_sensitive_patterns(column, profile, scan_mode) if profile.is_string else None
+    
+    # Get some sample values (up to 5)
+    samples = column.dropna().sample(min(5, len(column))).tolist() if len(column) > 0 else []
     
-    return column_scores
+    return score_column_privacy(uniqueness, pattern_counts, len(column), samples)
 
-def analyze_privacy_risks(df):
-    """Perform privacy risk analysis on the dataset."""
-    # Calculate traditional privacy risk scores
-    column_scores = calculate_privacy_risk(df)
+def calculate_privacy_risk(df, profiles=None, scan_mode="auto", shared_path=None, progress=None):
+    """Calculate privacy risk scores for each column in the dataframe.
     
-    # Calculate information theory-based privacy metrics
-    entropy_metrics = analyze_dataset_privacy(df)
+    With shared_path (the dataset's Arrow copy) and a process pool, the PII scans run in
+    worker processes that read their column from that file; otherwise they use the shared profiles.
+    Each scanned column advances progress, if given.
+    """
+    if shared_path and analysis_executor.kind == "process":
+        return analysis_executor.map_columns(partial(column_privacy_risk, scan_mode=scan_mode), df, df.columns, shared_path,
+                                             progress, step="Scanned")
     
+    profiles = build_column_profiles(df, profiles)
+    return analysis_executor.map_columns(
+        lambda column: column_privacy_risk(column, profiles[column.name], scan_mode), df, df.columns,
+        progress=progress, step="Scanned"
+    )
+
+def analyze_privacy_risks(df, profiles=None, scan_mode="auto", shared_path=None, progress=None):
+    """Perform privacy risk analysis on the dataset, reusing precomputed column profiles if given.
+    
+    scan_mode selects how PII detectors run over string columns (see scan_sensitive_patterns).
+    The column scores, entropy metrics and combination search are independent and run
+    concurrently on the analysis executor; shared_path is passed to calculate_privacy_risk.
+    progress (an AnalysisProgress) is advanced per scanned column and per finished step.
+    """
+    # Profile every column once for both the traditional and entropy-based metrics
+    profiles = build_column_profiles(df, profiles)
+    
+    metrics = analysis_executor.run({
+        # Calculate traditional privacy risk scores
+        "column_scores": lambda: calculate_privacy_risk(df, profiles, scan_mode, shared_path, progress),
+        # Calculate information theory-based privacy metrics
+        "entropy_metrics": lambda: analyze_dataset_privacy(df, profiles),
+        # Find the column combinations that make records unique
+        "risky_combinations": lambda: find_risky_combinations(df, profiles),
+    }, progress)
+    column_scores = metrics["column_scores"]
+    entropy_metrics = metrics["entropy_metrics"]
+    risky_combinations = metrics["risky_combinations"]
+    
+    overall_risk = summarize_privacy_risks(column_scores, entropy_metrics, risky_combinations)
+    
+    # Create visualizations
+    visualizations = create_privacy_visualizations(column_scores, overall_risk)
+    
+    return overall_risk, visualizations
+
+def summarize_privacy_risks(column_scores, entropy_metrics, risky_combinations=None):
+    """Merge column risk scores with the entropy-based metrics into the overall risk summary."""
     # Merge traditional and entropy-based metrics
     for col in column_scores:
         if col in entropy_metrics["column_metrics"]:
@@ -148,30 +254,32 @@ def analyze_privacy_risks(df):
         "low_risk_columns": [col for col, scores in column_scores.items() if scores["privacy_risk_score"] <= 0.3],
         "total_columns": len(column_scores),
         "column_scores": column_scores,
+        "k_anonymity": entropy_metrics.get("k_anonymity"),
+        "risky_combinations": risky_combinations,
     }
     
-    # Create visualizations
-    visualizations = create_privacy_visualizations(column_scores, overall_risk)
-    
-    return overall_risk, visualizations
+    return overall_risk
 
 def create_privacy_visualizations(column_scores, overall_risk):
-    """Create visualizations for privacy risk analysis with separate simple and technical views."""
+    """Create the simple view of the privacy analysis for non-technical users.
     
-    # Create both simple and technical visualizations
+    The technical view is only built when it is opened, see render_technical_privacy_view.
+    """
     simple_view = create_simple_privacy_view(column_scores, overall_risk)
-    technical_view = create_technical_privacy_view(column_scores, overall_risk)
+    return html.Div(simple_view, id="simple-privacy-results")
+
+def render_technical_privacy_view(privacy_data):
+    """Build the technical view from the privacy results kept in privacy-scores-store.
     
-    # Return both views in containers for the appropriate tabs
-    return html.Div(
-        [
-            # Simple view for non-technical users
-            html.Div(simple_view, id="simple-privacy-results"),
-            
-            # Technical view for advanced users
-            html.Div(technical_view, id="technical-privacy-results"),
-        ]
-    )
+    The view is cached per result fingerprint, so opening it again for the same results
+    does not rebuild its figures.
+    """
+    def build():
+        overall_risk = json.loads(privacy_data) if isinstance(privacy_data, str) else privacy_data
+        technical_view = create_technical_privacy_view(overall_risk["column_scores"], overall_risk)
+        return html.Div(technical_view, id="technical-privacy-results")
+    
+    return render_cache.get_or_render(("technical_privacy_view", result_fingerprint(privacy_data)), build)
 
 def create_technical_privacy_view(column_scores, overall_risk):
     """Create detailed technical privacy visualizations for advanced users."""
@@ -367,6 +475,9 @@ def create_technical_privacy_view(column_scores, overall_risk):
                         style={"border": "none"}
                     ),
                     
+                    # Column combinations that single out records
+                    create_risky_combinations_card(overall_risk.get("risky_combinations")),
+                    
                     # Toggle for advanced entropy metrics
                     dbc.Button(
                         [
@@ -426,17 +537,122 @@ def create_technical_privacy_view(column_scores, overall_risk):
         ]
     )
 
+def create_risky_combinations_card(lattice_results):
+    """Create a card listing the minimal column combinations that make records unique."""
+    if not lattice_results:
+        return html.Div()
+    
+    combinations = lattice_results["risky_combinations"]
+    if combinations:
+        table_data = [
+            {
+                "Columns": " + ".join(map(str, combination["columns"])),
+                "Unique Records": f"{combination['unique_records']:,}",
+                "Unique Ratio": f"{combination['unique_ratio'] * 100:.1f}%",
+                "Smallest Class (k)": combination["k"],
+            }
+            for combination in combinations[:RISKY_COMBINATIONS_DISPLAY_LIMIT]
+        ]
+        content = dbc.Table.from_dataframe(
+            pd.DataFrame(table_data),
+            striped=True,
+            bordered=False,
+            hover=True,
+            responsive=True,
+            size="sm",
+            className="mb-0",
+        )
+    else:
+        content = html.P(
+            f"No combination of up to {lattice_results['max_size']} columns makes records unique.",
+            className="text-muted small mb-0",
+        )
+    
+    notes = [
+        f"{lattice_results['combinations_evaluated']} combinations evaluated, "
+        f"{lattice_results['combinations_pruned']} pruned"
+    ]
+    if len(combinations) > RISKY_COMBINATIONS_DISPLAY_LIMIT:
+        notes.append(f"showing {RISKY_COMBINATIONS_DISPLAY_LIMIT} of {len(combinations)}")
+    if not lattice_results["complete"]:
+        notes.append(f"time budget reached after combinations of {lattice_results['searched_size']} columns")
+    
+    return dbc.Card(
+        [
+            dbc.CardBody(
+                [
+                    html.Div(
+                        [
+                            html.H6(
+                                "Risky Column Combinations",
+                                className="mb-1",
+                                style={"fontWeight": "500", "fontSize": "0.9rem", "color": "#3a0ca3"}
+                            ),
+                            html.Span(
+                                DashIconify(
+                                    icon="mdi:information-outline",
+                                    width=14,
+                                    height=14,
+                                    style={"cursor": "help", "color": "#6b7280"}
+                                ),
+                                id="risky-combinations-info",
+                            ),
+                            dbc.Tooltip(
+                                "Smallest sets of columns whose combined values single out individual records, "
+                                "e.g. date of birth + postcode + gender. Any larger set containing them is risky too.",
+                                target="risky-combinations-info",
+                                placement="top"
+                            ),
+                        ],
+                        className="d-flex align-items-center mb-2 justify-content-between"
+                    ),
+                    content,
+                    html.Div("; ".join(notes), className="text-muted small mt-2"),
+                ]
+            )
+        ],
+        className="mb-4 shadow-sm",
+        style={"border": "none"}
+    )
+
 # Helper functions for technical charts
+def limit_chart_columns(column_names, values, keep="highest", limit=CHART_COLUMN_LIMIT):
+    """Sort columns by value for a bar chart, folding all but `limit` of them into one "others" bar.
+    
+    keep selects the end of the ranking drawn individually ("highest" or "lowest"); the others
+    bar comes last and shows the mean of the folded columns, so a chart never has more than
+    limit + 1 bars however many columns the dataset has.
+    """
+    sorted_data = sorted(zip(column_names, values), key=lambda x: x[1], reverse=True)
+    if len(sorted_data) <= limit:
+        shown, rest = sorted_data, []
+    elif keep == "highest":
+        shown, rest = sorted_data[:limit], sorted_data[limit:]
+    else:
+        shown, rest = sorted_data[-limit:], sorted_data[:-limit]
+    
+    names = [name for name, _ in shown]
+    bar_values = [value for _, value in shown]
+    if rest:
+        names.append(f"Others (mean of {len(rest):,})")
+        bar_values.append(sum(value for _, value in rest) / len(rest))
+    return names, bar_values
+
+def chart_bar_colors(column_count, color, limit=CHART_COLUMN_LIMIT):
+    """Return the bar colors of a chart built with limit_chart_columns, with the others bar in grey."""
+    return [color] * min(column_count, limit) + [OTHERS_BAR_COLOR] * (column_count > limit)
+
 def get_column_risk_chart(column_names, privacy_scores):
     """Create a column risk bar chart with improved aesthetics."""
-    # Sort data for better visualization
-    sorted_data = sorted(zip(column_names, privacy_scores), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_privacy_scores = zip(*sorted_data)
+    # Riskiest columns first; the rest are summarized by one bar
+    sorted_column_names, sorted_privacy_scores = limit_chart_columns(column_names, privacy_scores, keep="highest")
     
     # Create risk categories after sorting
     sorted_risk_categories = []
-    for score in sorted_privacy_scores:
-        if score > 0.7:
+    for position, score in enumerate(sorted_privacy_scores):
+        if position >= CHART_COLUMN_LIMIT:
+            sorted_risk_categories.append("Other Fields")
+        elif score > 0.7:
             sorted_risk_categories.append("High Risk")
         elif score > 0.3:
             sorted_risk_categories.append("Medium Risk")
@@ -448,6 +664,7 @@ def get_column_risk_chart(column_names, privacy_scores):
         "High Risk": "#EF4444",    # Red
         "Medium Risk": "#F59E0B", # Amber
         "Low Risk": "#10B981",    # Green that matches theme
+        "Other Fields": OTHERS_BAR_COLOR,
     }
     
     # Create the bar chart
@@ -509,26 +726,26 @@ def get_column_risk_chart(column_names, privacy_scores):
     return fig
 
 def get_privacy_factors_chart(column_names, privacy_factors):
-    """Create a privacy factors bar chart."""
-    # Sort data
-    sorted_data = sorted(zip(column_names, privacy_factors), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_privacy_factors = zip(*sorted_data)
+    """Create a privacy factors bar chart with the application's design theme."""
+    # Least private columns are drawn individually; the rest are summarized by one bar
+    sorted_column_names, sorted_privacy_factors = limit_chart_columns(column_names, privacy_factors, keep="lowest")
     
-    # Create the chart
+    # Create the chart with the application's purple color theme
     fig = px.bar(
         x=sorted_column_names, 
         y=sorted_privacy_factors,
         labels={
             "x": "", 
-            "y": "Privacy Factor", 
+            "y": "Privacy Factor",
         },
         color_discrete_sequence=["#4361ee"],
+        text=[f"{s:.2f}" for s in sorted_privacy_factors] if sorted_privacy_factors else [],
     )
     
-    # Clean styling
+    # Apply clean, minimal styling
     fig.update_layout(
         xaxis_tickangle=-30,
-        margin=dict(l=30, r=20, t=20, b=50),
+        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
         plot_bgcolor="#f8f9fa",
         paper_bgcolor="rgba(255,255,255,0)",
         font=dict(family="Roboto", size=11, color="#555b6e"),
@@ -536,19 +753,26 @@ def get_privacy_factors_chart(column_names, privacy_factors):
         yaxis=dict(
             showgrid=True,
             gridcolor="#f3f4f6",
-            range=[0, max(sorted_privacy_factors) * 1.2],
+            range=[0, max(sorted_privacy_factors) * 1.1 if sorted_privacy_factors else 1],
         ),
     )
     
+    # Improve text positioning and hover info
+    fig.update_traces(
+        marker=dict(line=dict(width=0), color=chart_bar_colors(len(column_names), "#4361ee")),
+        textposition="outside",
+        textfont=dict(size=10, color="#4b5563"),
+        hovertemplate="<b>%{x}</b><br>Privacy Factor: <b>%{y:.2f}</b><extra></extra>"
+    )
+    
     return fig
 
 def get_shannon_entropy_chart(column_names, shannon_entropy):
-    """Create a shannon entropy bar chart."""
-    # Sort data
-    sorted_data = sorted(zip(column_names, shannon_entropy), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_entropy = zip(*sorted_data)
+    """Create a shannon entropy bar chart with the application's design theme."""
+    # Least private columns are drawn individually; the rest are summarized by one bar
+    sorted_column_names, sorted_entropy = limit_chart_columns(column_names, shannon_entropy, keep="lowest")
     
-    # Create the chart
+    # Create the chart with the application's green color theme
     fig = px.bar(
         x=sorted_column_names, 
         y=sorted_entropy,
@@ -556,13 +780,14 @@ def get_shannon_entropy_chart(column_names, shannon_entropy):
             "x": "", 
             "y": "Shannon Entropy (bits)", 
         },
-        color_discrete_sequence=["#10b981"],
+        color_discrete_sequence=["#10b981"],  # Green from the theme
+        text=[f"{s:.2f}" for s in sorted_entropy] if sorted_entropy else [],
     )
     
-    # Clean styling
+    # Apply clean, minimal styling
     fig.update_layout(
         xaxis_tickangle=-30,
-        margin=dict(l=30, r=20, t=20, b=50),
+        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
         plot_bgcolor="#f8f9fa",
         paper_bgcolor="rgba(255,255,255,0)",
         font=dict(family="Roboto", size=11, color="#555b6e"),
@@ -573,15 +798,22 @@ def get_shannon_entropy_chart(column_names, shannon_entropy):
         ),
     )
     
+    # Improve text positioning and hover info
+    fig.update_traces(
+        marker=dict(line=dict(width=0), color=chart_bar_colors(len(column_names), "#10b981")),
+        textposition="outside",
+        textfont=dict(size=10, color="#4b5563"),
+        hovertemplate="<b>%{x}</b><br>Shannon Entropy: <b>%{y:.2f}</b> bits<extra></extra>"
+    )
+    
     return fig
 
 def get_hartley_measure_chart(column_names, hartley_measure):
-    """Create a hartley measure bar chart."""
-    # Sort data
-    sorted_data = sorted(zip(column_names, hartley_measure), key=lambda x: x[1], reverse=True)
-    sorted_column_names, sorted_hartley = zip(*sorted_data)
+    """Create a hartley measure bar chart with the application's design theme."""
+    # Least private columns are drawn individually; the rest are summarized by one bar
+    sorted_column_names, sorted_hartley = limit_chart_columns(column_names, hartley_measure, keep="lowest")
     
-    # Create the chart
+    # Create the chart with the application's purple color theme (darker shade)
     fig = px.bar(
         x=sorted_column_names, 
         y=sorted_hartley,
@@ -589,13 +821,14 @@ def get_hartley_measure_chart(column_names, hartley_measure):
             "x": "", 
             "y": "Hartley Measure (dits)", 
         },
-        color_discrete_sequence=["#3a0ca3"],
+        color_discrete_sequence=["#3a0ca3"],  # Darker purple from the theme
+        text=[f"{s:.2f}" for s in sorted_hartley] if sorted_hartley else [],
     )
     
-    # Clean styling
+    # Apply clean, minimal styling
     fig.update_layout(
         xaxis_tickangle=-30,
-        margin=dict(l=30, r=20, t=20, b=50),
+        margin=dict(l=20, r=10, t=10, b=40),  # Tight margins
         plot_bgcolor="#f8f9fa",
         paper_bgcolor="rgba(255,255,255,0)",
         font=dict(family="Roboto", size=11, color="#555b6e"),
@@ -606,8 +839,38 @@ def get_hartley_measure_chart(column_names, hartley_measure):
         ),
     )
     
+    # Improve text positioning and hover info
+    fig.update_traces(
+        marker=dict(line=dict(width=0), color=chart_bar_colors(len(column_names), "#3a0ca3")),
+        textposition="outside",
+        textfont=dict(size=10, color="#4b5563"),
+        hovertemplate="<b>%{x}</b><br>Hartley Measure: <b>%{y:.2f}</b> dits<extra></extra>"
+    )
+    
     return fig
 
+# Per-column entropy metric charts of the technical view's tabs, by metric
+PRIVACY_METRIC_CHARTS = {
+    "privacy_factor": get_privacy_factors_chart,
+    "shannon_entropy": get_shannon_entropy_chart,
+    "hartley_measure": get_hartley_measure_chart,
+}
+
+def privacy_metric_figure(privacy_data, metric):
+    """Return the per-column chart of an entropy metric as a figure dictionary.
+    
+    privacy_data is the JSON kept in privacy-scores-store. Charts are cached per result
+    fingerprint and metric, and the results are only parsed to build a missing chart.
+    Raises KeyError if the results have no column scores.
+    """
+    def build():
+        results = json.loads(privacy_data) if isinstance(privacy_data, str) else privacy_data
+        column_scores = results["column_scores"]
+        values = [scores.get(metric, 0) for scores in column_scores.values()]
+        return PRIVACY_METRIC_CHARTS[metric](list(column_scores.keys()), values)
+    
+    return figure_cache.get_or_build(result_fingerprint(privacy_data), metric, build)
+
 # Now define the simple view for non-technical users
 def create_simple_privacy_view(column_scores, overall_risk):
     """Create simplified privacy visualizations for non-technical users focusing on clarity and actionability."""
@@ -877,8 +1140,16 @@ def create_simple_privacy_view(column_scores, overall_risk):
                                                         ),
                                                         md=4
                                                     )
-                                                    for col in overall_risk["high_risk_columns"]
-                                                ],
+                                                    for col in overall_risk["high_risk_columns"][:CHART_COLUMN_LIMIT]
+                                                ] + (
+                                                    [dbc.Col(
+                                                        html.Div(
+                                                            f"and {high_risk_count - CHART_COLUMN_LIMIT:,} more",
+                                                            className="text-muted small mb-1 p-1"
+                                                        ),
+                                                        md=4
+                                                    )] if high_risk_count > CHART_COLUMN_LIMIT else []
+                                                ),
                                                 className="g-2"
                                             )
                                             if overall_risk["high_risk_columns"] else
@@ -6,49 +6,104 @@ Implements Shannon entropy and other privacy measures to quantify data privacy r
 import pandas as pd
 import numpy as np
 import math
+import time
 import logging
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Union
+
+from utils.column_profile import ColumnProfile, as_profile, build_column_profiles, combine_column_codes
+from utils.privacy_sketches import ColumnSketch
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def calculate_privacy_factor(column: pd.Series) -> float:
+# Packed keys are counted with a dense bincount when the key space is at most this multiple of the row count
+DENSE_KEY_SPACE_FACTOR = 4
+
+# Lower edges of the equivalence class size buckets reported in the histogram
+CLASS_SIZE_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100]
+
+# Defaults for the quasi-identifier lattice search
+LATTICE_MAX_COMBINATION_SIZE = 3
+LATTICE_TIME_BUDGET_SECONDS = 5.0
+LATTICE_UNIQUENESS_THRESHOLD = 0.01
+
+# Memory allowed for the group codes of one lattice level kept for extending the next level
+LATTICE_CODE_CACHE_BYTES = 256 * 1024 * 1024
+
+def _value_counts(profile: ColumnProfile) -> np.ndarray:
     """
-    Calculate the Privacy Factor (probability of uniquely identifying an individual) for a column.
+    Return the value frequencies used by the privacy factor and entropy metrics.
+    
+    Numeric and datetime columns have always been counted after a string cast, which
+    turns missing values into a "nan"/"NaT" value of their own; that category is kept.
+    """
+    counts = profile.counts
+    if (profile.is_numeric or profile.is_naive_datetime) and profile.null_count > 0:
+        counts = np.append(counts, profile.null_count)
+    return counts
+
+def privacy_factor_from_counts(counts: np.ndarray) -> float:
+    """
+    Vectorized Privacy Factor kernel over a vector of value frequencies.
     
     Args:
-        column: The pandas Series to analyze
+        counts: Integer array with the number of occurrences of each distinct value
         
     Returns:
-        float: Privacy Factor between 0 and 1, where higher values indicate better privacy
+        float: Mean of (1 - 1/frequency) over all distinct values, 1.0 if there are none
     """
-    # Handle empty or null column
-    if column.empty or column.isna().all():
+    counts = np.asarray(counts, dtype=np.float64)
+    counts = counts[counts > 0]
+    if counts.size == 0:
         return 1.0
+    return float(np.mean(1.0 - 1.0 / counts))
+
+def shannon_entropy_from_counts(counts: np.ndarray, total: Optional[int] = None) -> float:
+    """
+    Vectorized Shannon Entropy kernel over a vector of value frequencies.
     
-    # For numeric or datetime data, convert to string for counting
-    if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_dtype(column):
-        column = column.astype(str)
+    Args:
+        counts: Integer array with the number of occurrences of each distinct value
+        total: Number of rows the probabilities are relative to (defaults to counts.sum())
+        
+    Returns:
+        float: Shannon Entropy in bits
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    counts = counts[counts > 0]
+    if total is None:
+        total = counts.sum()
+    if counts.size == 0 or total <= 0:
+        return 0.0
+    probabilities = counts / total
+    return float(-np.sum(probabilities * np.log2(probabilities)))
+
+def calculate_privacy_factor(column: Union[pd.Series, ColumnProfile, ColumnSketch]) -> float:
+    """
+    Calculate the Privacy Factor (probability of uniquely identifying an individual) for a column.
     
-    # Count occurrences of each value
-    value_counts = column.value_counts()
-    total_values = len(column)
+    Args:
+        column: The pandas Series, its ColumnProfile or a ColumnSketch (approximate;
+            use ColumnSketch.privacy_factor() for the error bounds)
+        
+    Returns:
+        float: Privacy Factor between 0 and 1, where higher values indicate better privacy
+    """
+    if isinstance(column, ColumnSketch):
+        return column.privacy_factor()["value"]
     
-    # Calculate the probability of identifying an individual for each value
-    # For each value, the probability of identification is 1/frequency
-    # Privacy Factor = 1 - probability of identification
-    privacy_factors = []
+    profile = as_profile(column)
     
-    for frequency in value_counts:
-        identification_probability = 1 / frequency
-        privacy_factor = 1 - identification_probability
-        privacy_factors.append(privacy_factor)
+    # Handle empty or null column
+    if profile.length == 0 or profile.non_null_count == 0:
+        return 1.0
     
-    # Return the average privacy factor across all values
-    return sum(privacy_factors) / len(privacy_factors) if privacy_factors else 1.0
+    # For each value, the probability of identification is 1/frequency
+    # Privacy Factor = average of (1 - probability of identification) across all values
+    return privacy_factor_from_counts(_value_counts(profile))
 
-def calculate_shannon_entropy(column: pd.Series) -> float:
+def calculate_shannon_entropy(column: Union[pd.Series, ColumnProfile]) -> float:
     """
     Calculate the Shannon Entropy for a column.
     
@@ -56,34 +111,21 @@ def calculate_shannon_entropy(column: pd.Series) -> float:
     Higher entropy means better privacy (more unpredictable values).
     
     Args:
-        column: The pandas Series to analyze
+        column: The pandas Series or its ColumnProfile
         
     Returns:
         float: Shannon Entropy value
     """
+    profile = as_profile(column)
+    
     # Handle empty or null column
-    if column.empty or column.isna().all():
+    if profile.length == 0 or profile.non_null_count == 0:
         return 0.0
     
-    # For numeric or datetime data, convert to string for counting
-    if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_dtype(column):
-        column = column.astype(str)
-    
-    # Count occurrences of each value
-    value_counts = column.value_counts()
-    total_values = len(column)
-    
-    # Calculate Shannon Entropy: -Σ p(x) log₂ p(x)
-    entropy = 0
-    for frequency in value_counts:
-        probability = frequency / total_values
-        # Avoid log(0) which is undefined
-        if probability > 0:
-            entropy -= probability * math.log2(probability)
-    
-    return entropy
+    # Calculate Shannon Entropy: -Σ p(x) log₂ p(x), with probabilities relative to all rows
+    return shannon_entropy_from_counts(_value_counts(profile), total=profile.length)
 
-def calculate_hartley_measure(column: pd.Series, log_base: float = 10) -> float:
+def calculate_hartley_measure(column: Union[pd.Series, ColumnProfile, ColumnSketch], log_base: float = 10) -> float:
     """
     Calculate the Hartley Measure for a column.
     
@@ -92,18 +134,24 @@ def calculate_hartley_measure(column: pd.Series, log_base: float = 10) -> float:
     all possible values in the column.
     
     Args:
-        column: The pandas Series to analyze
+        column: The pandas Series, its ColumnProfile or a ColumnSketch (approximate;
+            use ColumnSketch.hartley_measure() for the error bounds)
         log_base: The base of the logarithm to use (default is 10)
         
     Returns:
         float: Hartley Measure value
     """
+    if isinstance(column, ColumnSketch):
+        return column.hartley_measure(log_base)["value"]
+    
+    profile = as_profile(column)
+    
     # Handle empty or null column
-    if column.empty or column.isna().all():
+    if profile.length == 0 or profile.non_null_count == 0:
         return 0.0
     
     # Count the number of unique non-null values
-    unique_values_count = column.dropna().nunique()
+    unique_values_count = profile.n_unique
     
     # Handle case where there are no unique values
     if unique_values_count <= 1:
@@ -114,21 +162,26 @@ def calculate_hartley_measure(column: pd.Series, log_base: float = 10) -> float:
     
     return hartley_measure
 
-def calculate_column_metrics(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+def calculate_column_metrics(df: pd.DataFrame,
+                             profiles: Optional[Dict[str, ColumnProfile]] = None) -> Dict[str, Dict[str, Any]]:
     """
     Calculate privacy metrics for each column in the dataframe.
     
     Args:
         df: The pandas DataFrame to analyze
+        profiles: Optional precomputed column profiles
         
     Returns:
         dict: Dictionary of column metrics
     """
+    profiles = build_column_profiles(df, profiles)
     column_metrics = {}
     
     for col in df.columns:
+        profile = profiles[col]
+        
         # Skip columns with too many missing values
-        if df[col].isna().mean() > 0.5:
+        if profile.missing_ratio > 0.5:
             column_metrics[col] = {
                 "privacy_factor": 1.0,
                 "shannon_entropy": 0.0,
@@ -138,9 +191,9 @@ def calculate_column_metrics(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
             continue
         
         # Calculate privacy metrics
-        privacy_factor = calculate_privacy_factor(df[col])
-        shannon_entropy = calculate_shannon_entropy(df[col])
-        hartley_measure = calculate_hartley_measure(df[col])
+        privacy_factor = calculate_privacy_factor(profile)
+        shannon_entropy = calculate_shannon_entropy(profile)
+        hartley_measure = calculate_hartley_measure(profile)
         
         # Get some sample values (up to 5)
         samples = df[col].dropna().sample(min(5, len(df))).tolist() if len(df) > 0 else []
@@ -182,6 +235,247 @@ def calculate_cumulative_privacy_factor(column_metrics: Dict[str, Dict[str, Any]
     
     return cumulative_factor
 
+def equivalence_class_sizes(profiles: List[ColumnProfile]) -> np.ndarray:
+    """
+    Compute the size of every equivalence class of a set of quasi-identifiers.
+    
+    Args:
+        profiles: Profiles of the quasi-identifier columns
+        
+    Returns:
+        np.ndarray: Number of records in each equivalence class
+    """
+    keys, key_space = combine_column_codes(profiles)
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    if key_space <= DENSE_KEY_SPACE_FACTOR * len(keys):
+        sizes = np.bincount(keys, minlength=key_space)
+        return sizes[sizes > 0]
+    
+    # Sparse key space: densify the keys with a hash table instead of sorting them
+    codes, _ = pd.factorize(keys)
+    return np.bincount(codes)
+
+def class_size_histogram(sizes: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Bucket equivalence class sizes into a histogram.
+    
+    Args:
+        sizes: Number of records in each equivalence class
+        
+    Returns:
+        list: One entry per bucket with its size range and the number of classes and records in it
+    """
+    edges = np.asarray(CLASS_SIZE_BUCKETS)
+    buckets = np.searchsorted(edges, sizes, side="right") - 1
+    classes = np.bincount(buckets, minlength=len(edges))
+    records = np.bincount(buckets, weights=sizes, minlength=len(edges))
+    
+    histogram = []
+    for i, lower in enumerate(CLASS_SIZE_BUCKETS):
+        if i + 1 < len(CLASS_SIZE_BUCKETS):
+            upper = CLASS_SIZE_BUCKETS[i + 1] - 1
+            label = str(lower) if upper == lower else f"{lower}-{upper}"
+        else:
+            label = f"{lower}+"
+        histogram.append({
+            "class_size": label,
+            "classes": int(classes[i]),
+            "records": int(records[i])
+        })
+    return histogram
+
+def calculate_k_anonymity(df: pd.DataFrame,
+                          quasi_identifiers: Optional[List[str]] = None,
+                          profiles: Optional[Dict[str, ColumnProfile]] = None,
+                          k_threshold: int = 5) -> Dict[str, Any]:
+    """
+    Measure the joint re-identification risk of a set of quasi-identifiers.
+    
+    Records are grouped into equivalence classes of identical quasi-identifier
+    values; the dataset is k-anonymous for the size of its smallest class.
+    
+    Args:
+        df: The pandas DataFrame to analyze
+        quasi_identifiers: Columns to combine (defaults to all columns)
+        profiles: Optional precomputed column profiles
+        k_threshold: Classes smaller than this are counted as at risk
+        
+    Returns:
+        dict: k, class counts, singleton and at-risk records and the class size histogram
+    """
+    if quasi_identifiers is None:
+        quasi_identifiers = list(df.columns)
+    quasi_identifiers = [col for col in quasi_identifiers if col in df.columns]
+    
+    total_records = len(df)
+    if not quasi_identifiers or total_records == 0:
+        return {
+            "quasi_identifiers": quasi_identifiers,
+            "k": total_records,
+            "n_classes": 1 if total_records else 0,
+            "singleton_records": 0,
+            "records_at_risk": 0,
+            "records_at_risk_ratio": 0.0,
+            "avg_class_size": float(total_records),
+            "class_size_histogram": []
+        }
+    
+    profiles = build_column_profiles(df[quasi_identifiers], profiles)
+    sizes = equivalence_class_sizes([profiles[col] for col in quasi_identifiers])
+    records_at_risk = int(sizes[sizes < k_threshold].sum())
+    
+    return {
+        "quasi_identifiers": quasi_identifiers,
+        "k": int(sizes.min()),
+        "n_classes": int(len(sizes)),
+        "singleton_records": int((sizes == 1).sum()),
+        "records_at_risk": records_at_risk,
+        "records_at_risk_ratio": records_at_risk / total_records,
+        "avg_class_size": total_records / len(sizes),
+        "class_size_histogram": class_size_histogram(sizes)
+    }
+
+def _refine_group_codes(codes: np.ndarray, n_groups: int,
+                        profile: ColumnProfile) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Split existing groups of records by the values of one more column.
+    
+    Args:
+        codes: Group code of every record, in [0, n_groups)
+        n_groups: Upper bound of the group codes
+        profile: Profile of the column to split by
+        
+    Returns:
+        tuple: (dense group codes, number of groups, size of each group)
+    """
+    radix = profile.n_unique + 1
+    keys = codes * radix + (profile.codes + 1)
+    key_space = n_groups * radix
+    
+    if key_space <= DENSE_KEY_SPACE_FACTOR * len(keys):
+        sizes = np.bincount(keys, minlength=key_space)
+        present = sizes > 0
+        dense_ids = np.cumsum(present) - 1
+        return dense_ids[keys], int(present.sum()), sizes[present]
+    
+    codes, uniques = pd.factorize(keys)
+    return codes.astype(np.int64, copy=False), len(uniques), np.bincount(codes)
+
+def find_risky_combinations(df: pd.DataFrame,
+                            profiles: Optional[Dict[str, ColumnProfile]] = None,
+                            columns: Optional[List[str]] = None,
+                            max_size: int = LATTICE_MAX_COMBINATION_SIZE,
+                            time_budget: float = LATTICE_TIME_BUDGET_SECONDS,
+                            uniqueness_threshold: float = LATTICE_UNIQUENESS_THRESHOLD) -> Dict[str, Any]:
+    """
+    Search the column lattice for minimal combinations that make records unique.
+    
+    A combination is risky when at least uniqueness_threshold of the records are
+    alone in their equivalence class. Adding columns can only split classes, so
+    every superset of a risky combination is risky too; like apriori/Incognito the
+    search runs level by level and only extends combinations whose subsets are all
+    safe. Group codes of each level are reused to build the next one.
+    
+    Args:
+        df: The pandas DataFrame to analyze
+        profiles: Optional precomputed column profiles
+        columns: Columns to search (defaults to all columns)
+        max_size: Largest combination size to evaluate
+        time_budget: Seconds after which the search stops with partial results
+        uniqueness_threshold: Minimal fraction of unique records for a combination to be risky
+        
+    Returns:
+        dict: Minimal risky combinations and search statistics
+    """
+    start_time = time.perf_counter()
+    columns = list(df.columns) if columns is None else [col for col in columns if col in df.columns]
+    profiles = build_column_profiles(df, profiles)
+    total_records = len(df)
+    
+    risky_combinations = []
+    evaluated = 0
+    pruned = 0
+    complete = True
+    searched_size = 0
+    
+    def group_codes(combination):
+        """Compute the group codes of a combination from scratch."""
+        codes, n_groups = np.zeros(total_records, dtype=np.int64), 1
+        for index in combination:
+            codes, n_groups, _ = _refine_group_codes(codes, n_groups, profiles[columns[index]])
+        return codes, n_groups
+    
+    # Safe combinations of the current level, mapped to their group codes when cached
+    frontier = {(): (np.zeros(total_records, dtype=np.int64), 1)} if total_records else {}
+    
+    for size in range(1, max_size + 1):
+        next_frontier = {}
+        cache_bytes = 0
+        evaluated_before = evaluated
+        
+        for prefix in sorted(frontier):
+            prefix_codes = None
+            for index in range(prefix[-1] + 1 if prefix else 0, len(columns)):
+                candidate = prefix + (index,)
+                
+                # Monotonicity: a candidate with a risky (or already pruned) subset is risky itself
+                if any(candidate[:i] + candidate[i + 1:] not in frontier for i in range(size)):
+                    continue
+                
+                if time.perf_counter() - start_time > time_budget:
+                    complete = False
+                    break
+                
+                if prefix_codes is None:
+                    prefix_codes = frontier[prefix] or group_codes(prefix)
+                codes, n_groups, sizes = _refine_group_codes(*prefix_codes, profiles[columns[index]])
+                evaluated += 1
+                
+                unique_records = int((sizes == 1).sum())
+                if unique_records > 0 and unique_records / total_records >= uniqueness_threshold:
+                    risky_combinations.append({
+                        "columns": [columns[i] for i in candidate],
+                        "size": size,
+                        "unique_records": unique_records,
+                        "unique_ratio": unique_records / total_records,
+                        "k": int(sizes.min()),
+                        "n_classes": n_groups
+                    })
+                elif size < max_size and cache_bytes + codes.nbytes <= LATTICE_CODE_CACHE_BYTES:
+                    next_frontier[candidate] = (codes, n_groups)
+                    cache_bytes += codes.nbytes
+                else:
+                    next_frontier[candidate] = None
+            
+            if not complete:
+                break
+        
+        if not complete:
+            break
+        # Every combination of this size that was not evaluated has a risky subset
+        pruned += math.comb(len(columns), size) - (evaluated - evaluated_before)
+        searched_size = size
+        frontier = next_frontier
+        if not frontier:
+            break
+    
+    risky_combinations.sort(key=lambda item: (item["size"], -item["unique_ratio"]))
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"Lattice search evaluated {evaluated} combinations and pruned {pruned} in {elapsed:.2f}s")
+    
+    return {
+        "risky_combinations": risky_combinations,
+        "combinations_evaluated": evaluated,
+        "combinations_pruned": pruned,
+        "max_size": max_size,
+        "searched_size": searched_size,
+        "uniqueness_threshold": uniqueness_threshold,
+        "complete": complete,
+        "elapsed_seconds": elapsed
+    }
+
 def format_privacy_metrics(column_metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Format the privacy metrics for display.
@@ -216,23 +510,30 @@ def format_privacy_metrics(column_metrics: Dict[str, Dict[str, Any]]) -> Dict[st
         "column_metrics": column_metrics
     }
 
-def analyze_dataset_privacy(df: pd.DataFrame) -> Dict[str, Any]:
+def analyze_dataset_privacy(df: pd.DataFrame,
+                            profiles: Optional[Dict[str, ColumnProfile]] = None) -> Dict[str, Any]:
     """
     Analyze privacy of a dataset using information theory-based metrics.
     
     Args:
         df: The pandas DataFrame to analyze
+        profiles: Optional precomputed column profiles
         
     Returns:
         dict: Complete privacy analysis results
     """
     try:
+        profiles = build_column_profiles(df, profiles)
+        
         # Calculate column-level metrics
-        column_metrics = calculate_column_metrics(df)
+        column_metrics = calculate_column_metrics(df, profiles)
         
         # Format results for display
         results = format_privacy_metrics(column_metrics)
         
+        # Joint re-identification risk of the full records
+        results["k_anonymity"] = calculate_k_anonymity(df, profiles=profiles)
+        
         logger.info(f"Completed privacy metrics analysis on dataset with {len(df.columns)} columns")
         
         return results
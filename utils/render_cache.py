@@ -0,0 +1,147 @@
+"""
+Server-side cache of rendered result views for the Data Privacy Assist application.
+Views that only some users open (e.g. the technical privacy view) are built on demand
+from the stored analysis results and kept per result fingerprint, so switching back
+to them returns the already built components instead of rebuilding their figures.
+Individual charts are kept as serialized figure JSON per (result fingerprint, chart kind).
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def result_fingerprint(results: Union[str, bytes, Dict[str, Any]]) -> str:
+    """
+    Hash analysis results as stored in a dcc.Store.
+
+    Args:
+        results: The JSON string kept in the store, or the parsed results
+
+    Returns:
+        str: Hex SHA-256 digest of the results
+    """
+    if isinstance(results, dict):
+        results = json.dumps(results, sort_keys=True, default=str)
+    if isinstance(results, str):
+        results = results.encode("utf-8")
+    return hashlib.sha256(results).hexdigest()
+
+
+class RenderCache:
+    """
+    Bounded LRU of rendered views keyed by (view name, result fingerprint).
+
+    Cached components are shared between callbacks and sessions and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of rendered views kept in memory
+        """
+        self.max_entries = max_entries
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Tuple[Hashable, ...], builder: Callable[[], Any]) -> Any:
+        """
+        Return a cached view, building it on first use.
+
+        Args:
+            key: Cache key, usually (view name, result fingerprint)
+            builder: Zero-argument callable that renders the view
+
+        Returns:
+            The cached or freshly rendered view
+        """
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+
+        view = builder()
+
+        with self._lock:
+            view = self._views.setdefault(key, view)
+            self._views.move_to_end(key)
+            while len(self._views) > self.max_entries:
+                self._views.popitem(last=False)
+        return view
+
+    def clear(self) -> None:
+        """Drop every cached view."""
+        with self._lock:
+            self._views.clear()
+
+
+class FigureCache:
+    """
+    Bounded LRU of Plotly figures keyed by (result fingerprint, chart kind).
+
+    Figures are stored as their serialized JSON, so an entry is immutable and
+    costs exactly its payload size. Callers get a fresh figure dictionary that
+    dcc.Graph accepts as is; building a go.Figure (and validating every
+    property) only happens on a miss.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of figures kept in memory
+        """
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, fingerprint: str, kind: str, builder: Callable[[], Any]) -> Dict[str, Any]:
+        """
+        Return a cached figure, building it on first use.
+
+        Args:
+            fingerprint: Fingerprint of the results the chart is drawn from, see result_fingerprint()
+            kind: Name of the chart
+            builder: Zero-argument callable returning a plotly Figure
+
+        Returns:
+            dict: The figure as a dictionary of plain JSON values
+        """
+        key = (fingerprint, kind)
+        with self._lock:
+            payload = self._figures.get(key)
+            if payload is not None:
+                self._figures.move_to_end(key)
+
+        if payload is None:
+            payload = builder().to_json()
+            with self._lock:
+                self._figures[key] = payload
+                self._figures.move_to_end(key)
+                while len(self._figures) > self.max_entries:
+                    self._figures.popitem(last=False)
+        return json.loads(payload)
+
+    def clear(self) -> None:
+        """Drop every cached figure."""
+        with self._lock:
+            self._figures.clear()
+
+
+# Shared cache of the views rendered on demand
+render_cache = RenderCache(max_entries=int(os.getenv("RENDER_CACHE_SIZE", "32")))
+
+# Shared cache of the serialized privacy and quality charts
+figure_cache = FigureCache(max_entries=int(os.getenv("FIGURE_CACHE_SIZE", "256")))
@@ -0,0 +1,617 @@
+"""
+Out-of-core analysis pipeline for the Data Privacy Assist application.
+Reads CSV files chunk by chunk and folds every chunk into mergeable per-column
+accumulators, producing the same privacy and quality result dictionaries as the
+in-memory analyzers without ever materializing the full frame.
+"""
+
+import io
+import os
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis_executor import AnalysisProgress
+from utils.column_profile import ColumnProfile
+from utils.privacy_sketches import ColumnSketch
+from utils.row_hashes import hash_rows
+from utils.privacy_metrics import format_privacy_metrics
+from utils.outlier_detection import DEFAULT_ACCURACY_ENGINE, OutlierDetector, robust_outlier_masks
+from utils.privacy_analyzer import (
+    PII_SCANNER,
+    scan_sensitive_patterns,
+    score_column_privacy,
+    sparse_column_privacy,
+    summarize_privacy_risks,
+    create_privacy_visualizations
+)
+from utils.data_quality_analyzer import (
+    assemble_quality_results,
+    overall_integrity_score,
+    create_quality_visualizations
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Rows parsed per chunk
+STREAMING_CHUNK_ROWS = int(os.getenv("STREAMING_CHUNK_ROWS", "200000"))
+
+# Non-null values per column kept in the uniform sample used for outlier detection and examples
+VALUE_SAMPLE_SIZE = 100000
+
+# Terms in column names that mark potential ID columns (same as calculate_integrity)
+ID_TERMS = ['id', 'key', 'code', 'num', 'uuid']
+
+CsvSource = Union[str, bytes, bytearray]
+
+
+def _open_source(source: CsvSource) -> Union[str, BinaryIO]:
+    """Return something pd.read_csv can read from a path or raw bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+def read_csv_columns(source: CsvSource) -> List[str]:
+    """
+    Read only the column names of a CSV file.
+
+    Args:
+        source: Path of the file or its raw bytes
+
+    Returns:
+        list: Column names as pd.read_csv would parse them
+    """
+    return pd.read_csv(_open_source(source), nrows=0).columns.tolist()
+
+
+def read_csv_chunks(source: CsvSource, chunksize: int = STREAMING_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV file in chunks with stable column types.
+
+    Columns parsed as text in the first chunk are read as text in every chunk,
+    so a later chunk that happens to hold only digits does not turn into numbers.
+
+    Args:
+        source: Path of the file or its raw bytes
+        chunksize: Number of rows per chunk
+
+    Returns:
+        Iterator over the chunks as DataFrames
+    """
+    head = pd.read_csv(_open_source(source), nrows=chunksize)
+    text_columns = {col: str for col in head.columns if head[col].dtype == object}
+    del head
+    yield from pd.read_csv(_open_source(source), chunksize=chunksize, dtype=text_columns)
+
+
+class ValueSample:
+    """
+    Uniform sample of the non-null values of a column, mergeable across chunks.
+
+    Every value gets a random priority and the values with the smallest
+    priorities are kept, which is a uniform sample of everything added.
+    """
+
+    def __init__(self, size: int = VALUE_SAMPLE_SIZE, seed: int = 42):
+        """
+        Initialize an empty sample.
+
+        Args:
+            size: Number of values kept
+            seed: Seed of the priority generator
+        """
+        self.size = size
+        self.values = np.zeros(0, dtype=object)
+        self.priorities = np.zeros(0)
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values: np.ndarray) -> None:
+        """Add values to the sample."""
+        if len(values) == 0:
+            return
+        self._keep(np.concatenate([self.values, np.asarray(values, dtype=object)]),
+                   np.concatenate([self.priorities, self._rng.random(len(values))]))
+
+    def merge(self, other: "ValueSample") -> "ValueSample":
+        """Merge a sample of another part of the same column into this one."""
+        self._keep(np.concatenate([self.values, other.values]),
+                   np.concatenate([self.priorities, other.priorities]))
+        return self
+
+    def _keep(self, values: np.ndarray, priorities: np.ndarray) -> None:
+        """Keep the values with the smallest priorities."""
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        self.values, self.priorities = values, priorities
+
+
+class ColumnAccumulator:
+    """
+    Mergeable per-column state of the streaming analysis.
+
+    Holds the counters behind the completeness, validity, consistency and
+    sensitive-pattern metrics, a ColumnSketch for distinct counts, frequencies
+    and entropy, and a uniform value sample for outlier detection.
+
+    The column type is fixed by the first chunk holding values. Later chunks
+    parsed as text for a numeric column are converted to numbers and values
+    that do not convert are counted as invalid (and missing).
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the accumulator.
+
+        Args:
+            name: Column name
+        """
+        self.name = name
+        self.dtype = None
+        self.is_numeric = False
+        self.is_datetime = False
+        self.is_string = False
+
+        self.length = 0
+        self.null_count = 0
+        self.unparsable_count = 0
+        self.non_finite_count = 0
+        self.empty_string_count = 0
+        self.lowercase_count = 0
+        self.uppercase_count = 0
+        self.integer_count = 0
+        self.pattern_counts = dict.fromkeys(PII_SCANNER.pattern_names, 0)
+
+        self.sketch = ColumnSketch()
+        self.sample = ValueSample()
+
+    @property
+    def non_null_count(self) -> int:
+        return self.length - self.null_count
+
+    @property
+    def missing_ratio(self) -> float:
+        return self.null_count / self.length if self.length > 0 else 0.0
+
+    @property
+    def inferred_type(self) -> str:
+        """Logical type of the column, as ColumnProfile infers it."""
+        if self.is_numeric:
+            return "integer" if self.integer_count == self.non_null_count else "float"
+        if self.is_datetime:
+            return "datetime"
+        return "string"
+
+    def _conform(self, column: pd.Series) -> pd.Series:
+        """Convert a chunk to the type the column was first seen with."""
+        if self.dtype is None:
+            return column
+        if self.is_numeric and not pd.api.types.is_numeric_dtype(column):
+            converted = pd.to_numeric(column, errors="coerce")
+            self.unparsable_count += int((column.notna() & converted.isna()).sum())
+            return converted
+        if self.is_string and not pd.api.types.is_string_dtype(column):
+            return column.astype(str).where(column.notna())
+        return column
+
+    def update(self, column: pd.Series, scan_mode: str = "auto") -> ColumnProfile:
+        """
+        Fold a chunk of the column into the accumulator.
+
+        Args:
+            column: The chunk of the column
+            scan_mode: PII scan mode, see scan_sensitive_patterns
+
+        Returns:
+            ColumnProfile: Profile of the chunk, as conformed to the column's type
+        """
+        column = self._conform(column)
+        profile = ColumnProfile(column)
+
+        if self.dtype is None and profile.non_null_count > 0:
+            self.dtype = str(profile.dtype)
+            self.is_numeric = profile.is_numeric
+            self.is_datetime = profile.is_datetime
+            self.is_string = profile.is_string
+
+        self.length += profile.length
+        self.null_count += profile.null_count
+        self.sketch.update(column, profile)
+        self.sample.add(column.dropna().to_numpy(dtype=object))
+
+        if profile.non_null_count == 0:
+            return profile
+
+        # Same per-distinct-value checks as the in-memory quality dimensions
+        if self.is_numeric:
+            self.non_finite_count += profile.weighted_count(~np.isfinite(profile.numeric_uniques()))
+            self.integer_count += profile.weighted_count(profile.integral_mask())
+        elif self.is_string:
+            self.empty_string_count += profile.weighted_count(profile.string_mask(lambda v: v == ''))
+            self.lowercase_count += profile.weighted_count(profile.string_mask(str.islower))
+            self.uppercase_count += profile.weighted_count(profile.string_mask(str.isupper))
+            for pattern_name, matches in scan_sensitive_patterns(column, profile, scan_mode).items():
+                self.pattern_counts[pattern_name] += matches
+        return profile
+
+    def merge(self, other: "ColumnAccumulator") -> "ColumnAccumulator":
+        """Merge the accumulator of another part of the same column into this one."""
+        if self.dtype is None:
+            self.dtype = other.dtype
+            self.is_numeric = other.is_numeric
+            self.is_datetime = other.is_datetime
+            self.is_string = other.is_string
+
+        for counter in ("length", "null_count", "unparsable_count", "non_finite_count",
+                        "empty_string_count", "lowercase_count", "uppercase_count", "integer_count"):
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        for pattern_name, matches in other.pattern_counts.items():
+            self.pattern_counts[pattern_name] += matches
+
+        self.sketch.merge(other.sketch)
+        self.sample.merge(other.sample)
+        return self
+
+    def examples(self, count: int = 5) -> list:
+        """Return a few sample values of the column."""
+        return pd.Series(self.sample.values[:count]).tolist()
+
+    def outlier_ratio(self, engine: str = DEFAULT_ACCURACY_ENGINE) -> float:
+        """Estimate the fraction of outliers among the values with the accuracy dimension's engine."""
+        values = pd.to_numeric(pd.Series(self.sample.values), errors="coerce").dropna()
+        if len(values) == 0:
+            return 0.0
+        # Column samples are not row-aligned, so the multivariate engine falls back to per-column forests
+        if engine in ("isolation_forest", "multivariate"):
+            return float(OutlierDetector.fit_predict(values.astype(np.float64)).mean())
+        return float(robust_outlier_masks(values.to_numpy(dtype=np.float64)[:, None], engine).mean())
+
+
+class StreamingDatasetAnalyzer:
+    """
+    Streaming counterpart of analyze_privacy_risks and analyze_data_quality.
+
+    Chunks are folded into per-column accumulators and a row-hash sketch for
+    duplicate rows. Analyzers of different parts of a file can be merged, so
+    chunks may be processed in separate workers.
+    """
+
+    def __init__(self, scan_mode: str = "auto"):
+        """
+        Initialize an empty analyzer.
+
+        Args:
+            scan_mode: PII scan mode, see scan_sensitive_patterns
+        """
+        self.scan_mode = scan_mode
+        self.columns = {}
+        self.rows = ColumnSketch()
+        self.chunk_count = 0
+
+    @property
+    def row_count(self) -> int:
+        return self.rows.length
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingDatasetAnalyzer":
+        """
+        Fold a chunk of the dataset into the analyzer.
+
+        Args:
+            chunk: The next rows of the dataset
+
+        Returns:
+            StreamingDatasetAnalyzer: This analyzer
+        """
+        profiles = {}
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnAccumulator(col)
+            profiles[col] = self.columns[col].update(chunk[col], self.scan_mode)
+
+        # Same row hashes as the in-memory RowHashIndex; numbers hash as floats so
+        # chunks parsed as integers and floats agree
+        self.rows.update_hashed(hash_rows(chunk, profiles))
+        self.chunk_count += 1
+        return self
+
+    def merge(self, other: "StreamingDatasetAnalyzer") -> "StreamingDatasetAnalyzer":
+        """Merge the analyzer of another part of the same dataset into this one."""
+        for col, accumulator in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(accumulator)
+            else:
+                self.columns[col] = accumulator
+        self.rows.merge(other.rows)
+        self.chunk_count += other.chunk_count
+        return self
+
+    def privacy_results(self) -> Dict[str, Any]:
+        """
+        Build the overall privacy risk results, as returned by analyze_privacy_risks.
+
+        Approximate metrics are reported with their error bounds under
+        "approximate_metrics". The k-anonymity and column lattice searches
+        need the full records and are not available in streaming mode.
+        """
+        column_scores = {}
+        column_metrics = {}
+
+        for col, accumulator in self.columns.items():
+            # Skip columns with too many missing values
+            if accumulator.missing_ratio > 0.5:
+                column_scores[col] = sparse_column_privacy()
+                column_metrics[col] = {
+                    "privacy_factor": 1.0,
+                    "shannon_entropy": 0.0,
+                    "hartley_measure": 0.0,
+                    "examples": []
+                }
+                continue
+
+            sketch = accumulator.sketch
+            examples = accumulator.examples()
+            column_scores[col] = score_column_privacy(
+                sketch.uniqueness_score()["value"],
+                accumulator.pattern_counts if accumulator.is_string else None,
+                accumulator.length,
+                examples
+            )
+            column_metrics[col] = {
+                "privacy_factor": sketch.privacy_factor()["value"],
+                "shannon_entropy": sketch.shannon_entropy()["value"],
+                "hartley_measure": sketch.hartley_measure()["value"],
+                "examples": examples
+            }
+
+        overall_risk = summarize_privacy_risks(column_scores, format_privacy_metrics(column_metrics))
+        overall_risk["analysis_mode"] = "streaming"
+        overall_risk["approximate_metrics"] = {
+            col: accumulator.sketch.approximate_metrics() for col, accumulator in self.columns.items()
+        }
+        return overall_risk
+
+    def quality_results(self, custom_constraints: Optional[List[Dict[str, Any]]] = None,
+                        accuracy_engine: str = DEFAULT_ACCURACY_ENGINE) -> Dict[str, Any]:
+        """
+        Build the data quality results, as returned by analyze_data_quality.
+
+        Args:
+            custom_constraints: Custom constraints; they need the full column and are
+                reported as skipped (passed None) in streaming mode, outside the
+                pass/fail counts and the constraints score
+            accuracy_engine: Outlier engine of the accuracy dimension, see ACCURACY_ENGINES
+
+        Returns:
+            dict: Quality results with the six dimensions and legacy fields
+        """
+        n_rows = self.row_count
+        completeness, accuracy, validity, uniqueness, integrity, consistency = {}, {}, {}, {}, {}, {}
+        missing_values, outliers, data_types = {}, {}, {}
+
+        for col, acc in self.columns.items():
+            missing_percentage = acc.null_count / n_rows if n_rows > 0 else 0
+            completeness[col] = {
+                "missing_count": int(acc.null_count),
+                "missing_percentage": float(missing_percentage),
+                "completeness_score": float(1 - missing_percentage)
+            }
+            missing_values[col] = {
+                "missing_count": int(acc.null_count),
+                "missing_percentage": float(missing_percentage),
+            }
+
+            # Accuracy: outliers found in the value sample, scaled to the whole column
+            outlier_count = 0
+            if acc.is_numeric:
+                try:
+                    outlier_count = int(round(acc.outlier_ratio(accuracy_engine) * acc.non_null_count))
+                except Exception as e:
+                    logger.warning(f"Outlier detection failed for column {col}: {e}")
+            outlier_percentage = outlier_count / n_rows if n_rows > 0 else 0
+            accuracy[col] = {
+                "outlier_count": outlier_count,
+                "outlier_percentage": float(outlier_percentage),
+                "accuracy_score": float(1 - outlier_percentage)
+            }
+            outliers[col] = {
+                "outlier_count": outlier_count,
+                "outlier_percentage": float(outlier_percentage),
+            }
+
+            invalid_count = 0
+            validity_score = 1.0
+            if acc.is_numeric:
+                invalid_count = acc.non_finite_count + acc.unparsable_count
+                if acc.non_null_count > 0:
+                    validity_score = 1 - (invalid_count / (acc.non_null_count + acc.unparsable_count))
+            elif acc.is_string:
+                invalid_count = acc.null_count + acc.empty_string_count
+                if n_rows > 0:
+                    validity_score = 1 - (invalid_count / n_rows)
+            validity[col] = {
+                "invalid_count": int(invalid_count),
+                "validity_score": float(validity_score)
+            }
+
+            n_unique = acc.sketch.n_unique()["value"]
+            duplicate_count = acc.sketch.duplicate_count()["value"]
+            uniqueness[col] = {
+                "duplicate_count": int(round(duplicate_count)),
+                "unique_percentage": float(n_unique / acc.non_null_count if acc.non_null_count > 0 else 1.0),
+                "uniqueness_score": float(1 - duplicate_count / acc.non_null_count if acc.non_null_count > 0 else 1.0)
+            }
+
+            unique_ratio = n_unique / acc.non_null_count if acc.non_null_count > 0 else 0
+            integrity[col] = {
+                "is_potential_id": any(id_term in str(col).lower() for id_term in ID_TERMS),
+                "unique_ratio": float(unique_ratio),
+                "null_count": int(acc.null_count),
+                "integrity_score": float(1 - (acc.null_count / n_rows if n_rows > 0 else 0))
+            }
+
+            if acc.is_string:
+                mixed_case_count = acc.non_null_count - acc.lowercase_count - acc.uppercase_count
+                consistency[col] = {
+                    "case_consistency_score": float(max(acc.lowercase_count, acc.uppercase_count, mixed_case_count) / acc.non_null_count
+                                                    if acc.non_null_count > 0 else 1.0),
+                    "lowercase_count": int(acc.lowercase_count),
+                    "uppercase_count": int(acc.uppercase_count),
+                    "mixed_case_count": int(mixed_case_count),
+                    "format_consistency_score": 1.0
+                }
+            elif acc.is_numeric:
+                float_count = acc.non_null_count - acc.integer_count
+                consistency[col] = {
+                    "case_consistency_score": 1.0,
+                    "format_consistency_score": float(max(acc.integer_count, float_count) / acc.non_null_count
+                                                      if acc.non_null_count > 0 else 1.0),
+                    "integer_count": int(acc.integer_count),
+                    "float_count": int(float_count)
+                }
+            else:
+                consistency[col] = {
+                    "case_consistency_score": 1.0,
+                    "format_consistency_score": 1.0
+                }
+
+            data_types[col] = {
+                "dtype": acc.dtype or "object",
+                "inferred_type": acc.inferred_type,
+                "unique_values": int(round(n_unique)),
+                "unique_percentage": float(n_unique / n_rows if n_rows > 0 else 0),
+            }
+
+        def average(details, key):
+            return sum(v[key] for v in details.values()) / len(details) if details else 1.0
+
+        total_cells = n_rows * len(self.columns)
+        missing_cells = sum(acc.null_count for acc in self.columns.values())
+        duplicate_rows = int(round(self.rows.duplicate_count()["value"]))
+        row_uniqueness_score = 1 - (duplicate_rows / n_rows if n_rows > 0 else 0)
+        potential_id_columns = [col for col, details in integrity.items()
+                                if details["is_potential_id"] or details["unique_ratio"] > 0.9]
+
+        dimensions = {
+            "completeness": {
+                "overall_score": float((total_cells - missing_cells) / total_cells if total_cells > 0 else 1.0),
+                "total_cells": int(total_cells),
+                "non_missing_cells": int(total_cells - missing_cells),
+                "missing_cells": int(missing_cells),
+                "column_details": completeness
+            },
+            "accuracy": {
+                "overall_score": float(average(accuracy, "accuracy_score")),
+                "column_details": accuracy
+            },
+            "validity": {
+                "overall_score": float(average(validity, "validity_score")),
+                "column_details": validity
+            },
+            "uniqueness": {
+                "overall_score": float((sum(v["uniqueness_score"] for v in uniqueness.values()) + row_uniqueness_score)
+                                       / (len(uniqueness) + 1) if uniqueness else 1.0),
+                "duplicate_rows": duplicate_rows,
+                "row_uniqueness_score": float(row_uniqueness_score),
+                "column_details": uniqueness
+            },
+            "integrity": {
+                "overall_score": float(overall_integrity_score(integrity, potential_id_columns)),
+                "potential_id_columns": potential_id_columns,
+                "column_details": integrity
+            },
+            "consistency": {
+                "overall_score": float((sum(v["case_consistency_score"] for v in consistency.values())
+                                        + sum(v["format_consistency_score"] for v in consistency.values()))
+                                       / (2 * len(consistency)) if consistency else 1.0),
+                "column_details": consistency
+            }
+        }
+
+        custom_constraints_results = {}
+        if custom_constraints:
+            custom_constraints_results = {
+                "constraints": [
+                    {
+                        "column": constraint.get("column"),
+                        "type": constraint.get("type"),
+                        "value": constraint.get("value"),
+                        "passed": None,
+                        "error": "Not checked for datasets analyzed in streaming mode",
+                        "pass_rate": None
+                    }
+                    for constraint in custom_constraints
+                ],
+                "overall_score": None,
+                "pass_count": 0,
+                "fail_count": 0,
+                "skipped_count": len(custom_constraints),
+                "total_count": len(custom_constraints)
+            }
+
+        quality_results = assemble_quality_results(dimensions, custom_constraints_results,
+                                                   missing_values, outliers, data_types)
+        quality_results["analysis_mode"] = "streaming"
+        return quality_results
+
+    def analyze_privacy_risks(self):
+        """Return the privacy results and their visualizations, like analyze_privacy_risks."""
+        overall_risk = self.privacy_results()
+        return overall_risk, create_privacy_visualizations(overall_risk["column_scores"], overall_risk)
+
+    def analyze_data_quality(self, custom_constraints=None, accuracy_engine=DEFAULT_ACCURACY_ENGINE):
+        """Return the quality results and their visualizations, like analyze_data_quality."""
+        quality_results = self.quality_results(custom_constraints, accuracy_engine)
+        # The visualizations only need the column names of the dataset
+        return quality_results, create_quality_visualizations(quality_results, pd.DataFrame(columns=self.column_names))
+
+
+class DatasetSummary:
+    """
+    Shape of a dataset that is not held in memory.
+
+    Stands in for the DataFrame where only its length and column names are
+    used, such as the report generator.
+    """
+
+    def __init__(self, columns: List[str], rows: int):
+        self.columns = pd.Index(columns)
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def shape(self):
+        return (self.rows, len(self.columns))
+
+
+def analyze_csv_stream(source: CsvSource, chunksize: int = STREAMING_CHUNK_ROWS, scan_mode: str = "auto",
+                       progress: Optional[AnalysisProgress] = None) -> StreamingDatasetAnalyzer:
+    """
+    Analyze a CSV file chunk by chunk.
+
+    Args:
+        source: Path of the file or its raw bytes
+        chunksize: Number of rows per chunk
+        scan_mode: PII scan mode, see scan_sensitive_patterns
+        progress: Progress advanced after every chunk with the number of rows read so far
+
+    Returns:
+        StreamingDatasetAnalyzer: Analyzer holding the accumulated state of the whole file
+    """
+    analyzer = StreamingDatasetAnalyzer(scan_mode)
+    for chunk in read_csv_chunks(source, chunksize):
+        analyzer.update(chunk)
+        if progress is not None:
+            progress.advance(f"Read {analyzer.row_count:,} rows")
+    logger.info(f"Streamed {analyzer.row_count} rows in {analyzer.chunk_count} chunks")
+    return analyzer